@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the log parser.
+
+Generates synthetic container logs (as returned by kubelet with timestamps)
+and measures how fast LogController parses them into records, and how fast
+the records are converted to log schemas.
+
+Usage: python benchmarks/logs.py --size 16 --repeat 3
+"""
+import argparse
+import datetime
+import random
+import sys
+import time
+
+from projects.controllers.logs import LogController
+
+
+def generate_logs(size):
+    """
+    Generates synthetic raw logs.
+
+    Parameters
+    ----------
+    size : int
+        Approximate size in bytes.
+
+    Returns
+    -------
+    str
+    """
+    rand = random.Random(0)
+    start = datetime.datetime(2021, 1, 1)
+    lines = []
+    total = 0
+    i = 0
+
+    while total < size:
+        timestamp = start + datetime.timedelta(microseconds=i * 1537)
+        # kubelet uses RFC3339Nano, which drops trailing zeros of the fraction
+        kubelet_timestamp = f"{timestamp:%Y-%m-%dT%H:%M:%S}.{timestamp.microsecond:06d}123".rstrip("0") + "Z"
+
+        kind = rand.random()
+        if kind < 0.30:
+            line = f"{kubelet_timestamp} INFO epoch {i} - loss: {rand.random():.4f} - accuracy: {rand.random():.4f}"
+        elif kind < 0.35:
+            line = f"{kubelet_timestamp} {timestamp:%Y-%m-%d %H:%M:%S},123 WARNING sklearn: FutureWarning: deprecated parameter"
+        elif kind < 0.37:
+            line = f"{kubelet_timestamp} ERROR Traceback (most recent call last):"
+        elif kind < 0.45:
+            line = f"{kubelet_timestamp}   File \"/opt/conda/lib/python3.7/site-packages/pandas/core/frame.py\", line {i % 9000}"
+        else:
+            line = f"{kubelet_timestamp} {i % 100:3d}%|{'#' * (i % 40):<40}| {i}/100000 [00:{i % 60:02d}<00:00, 1234.56it/s]"
+
+        lines.append(line)
+        total += len(line) + 1
+        i += 1
+
+    return "\n".join(lines) + "\n"
+
+
+def run(size, repeat):
+    """
+    Runs the benchmark and prints its results.
+
+    Parameters
+    ----------
+    size : int
+        Size of the synthetic logs in MB.
+    repeat : int
+        Number of measurements. The best one is reported.
+    """
+    raw_logs = generate_logs(size * 1024 * 1024)
+    megabytes = len(raw_logs.encode()) / 1024 / 1024
+    lines = raw_logs.count("\n")
+
+    controller = LogController()
+    created_at = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+
+    parse_times = []
+    convert_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        records = controller.split_messages(raw_logs, "benchmark", created_at)
+        parse_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        [controller.to_log(record) for record in records]
+        convert_times.append(time.perf_counter() - start)
+
+    parse_time = min(parse_times)
+    convert_time = min(convert_times)
+
+    sys.stdout.write(
+        f"input:   {megabytes:.1f} MB, {lines} lines, {len(records)} messages\n"
+        f"parse:   {parse_time:.3f} s ({megabytes / parse_time:.1f} MB/s, {lines / parse_time:,.0f} lines/s)\n"
+        f"convert: {convert_time:.3f} s ({len(records) / convert_time:,.0f} logs/s)\n"
+    )
+
+
+def parse_args(args):
+    """Takes argv and parses benchmark options."""
+    parser = argparse.ArgumentParser(
+        description="Log parser benchmark"
+    )
+    parser.add_argument(
+        "--size", type=int, default=16, help="Size of the synthetic logs in MB (default: 16)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of measurements (default: 3)"
+    )
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    run(size=args.size, repeat=args.repeat)
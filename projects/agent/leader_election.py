@@ -0,0 +1,152 @@
+"""
+Lease based leader election of persistence agent replicas.
+
+Only the replica that holds the Lease watches and saves events. The others
+are hot standbys: they retry to acquire the Lease every AGENT_RETRY_PERIOD
+seconds, and take over once the leader did not renew it for
+AGENT_LEASE_DURATION seconds.
+"""
+import logging
+import socket
+import time
+import uuid
+from datetime import datetime, timezone
+from os import getenv
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+AGENT_LEADER_ELECTION = getenv("AGENT_LEADER_ELECTION", "false").lower() == "true"
+AGENT_LEASE_NAME = getenv("AGENT_LEASE_NAME", "projects-persistence-agent")
+AGENT_LEASE_NAMESPACE = getenv("AGENT_LEASE_NAMESPACE", "platiagro")
+AGENT_LEASE_DURATION = int(getenv("AGENT_LEASE_DURATION", "15"))
+AGENT_RENEW_DEADLINE = int(getenv("AGENT_RENEW_DEADLINE", "10"))
+AGENT_RETRY_PERIOD = int(getenv("AGENT_RETRY_PERIOD", "2"))
+
+
+class LeaderElector:
+    def __init__(self, api, identity=None):
+        self.api = api
+        # the pod name, and a suffix so that a restarted agent is a new holder
+        self.identity = identity or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        # the last Lease record seen, and when it was seen (in monotonic time)
+        self.observed_record = None
+        self.observed_at = None
+
+    def run(self, on_started_leading):
+        """
+        Waits until the Lease is acquired, calls on_started_leading, then keeps
+        renewing the Lease. Returns once it could not be renewed within
+        AGENT_RENEW_DEADLINE seconds.
+
+        Parameters
+        ----------
+        on_started_leading : callable
+        """
+        while not self.try_acquire_or_renew():
+            time.sleep(AGENT_RETRY_PERIOD)
+
+        logging.info("Acquired lease %s as %s" % (AGENT_LEASE_NAME, self.identity))
+        on_started_leading()
+
+        renewed_at = time.monotonic()
+        while time.monotonic() - renewed_at < AGENT_RENEW_DEADLINE:
+            time.sleep(AGENT_RETRY_PERIOD)
+            if self.try_acquire_or_renew():
+                renewed_at = time.monotonic()
+
+        logging.error("Lost lease %s" % AGENT_LEASE_NAME)
+
+    def try_acquire_or_renew(self):
+        """
+        Acquires the Lease if it is free or expired, or renews it if it is held.
+
+        Returns
+        -------
+        bool
+            Whether this replica holds the Lease.
+        """
+        try:
+            return self._try_acquire_or_renew()
+        except ApiException as e:
+            # 409 Conflict: another replica updated the Lease meanwhile
+            if e.status != 409:
+                logging.warning("Failed to acquire lease %s: %s" % (AGENT_LEASE_NAME, e.reason))
+            return False
+        except Exception as e:
+            logging.warning("Failed to acquire lease %s: %s" % (AGENT_LEASE_NAME, e))
+            return False
+
+    def _try_acquire_or_renew(self):
+        now = datetime.now(timezone.utc)
+
+        try:
+            lease = self.api.read_namespaced_lease(name=AGENT_LEASE_NAME, namespace=AGENT_LEASE_NAMESPACE)
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            lease = client.V1Lease(
+                metadata=client.V1ObjectMeta(name=AGENT_LEASE_NAME, namespace=AGENT_LEASE_NAMESPACE),
+                spec=self.build_spec(now, transitions=0),
+            )
+            self.api.create_namespaced_lease(namespace=AGENT_LEASE_NAMESPACE, body=lease)
+            return True
+
+        spec = lease.spec
+        if spec.holder_identity == self.identity:
+            spec.renew_time = now
+        elif self.is_held(spec):
+            return False
+        else:
+            spec = self.build_spec(now, transitions=(spec.lease_transitions or 0) + 1)
+
+        # the resourceVersion of the Lease makes concurrent updates conflict
+        lease.spec = spec
+        self.api.replace_namespaced_lease(name=AGENT_LEASE_NAME, namespace=AGENT_LEASE_NAMESPACE, body=lease)
+        return True
+
+    def is_held(self, spec):
+        """
+        Checks whether another replica renewed the Lease recently. The renew
+        time is compared to the local clock of when it changed, so that the
+        clocks of replicas do not need to be in sync.
+
+        Parameters
+        ----------
+        spec : kubernetes.client.V1LeaseSpec
+
+        Returns
+        -------
+        bool
+        """
+        if not spec.holder_identity:
+            return False
+
+        record = (spec.holder_identity, spec.renew_time)
+        if record != self.observed_record:
+            self.observed_record = record
+            self.observed_at = time.monotonic()
+
+        lease_duration = spec.lease_duration_seconds or AGENT_LEASE_DURATION
+        return time.monotonic() - self.observed_at < lease_duration
+
+    def build_spec(self, now, transitions):
+        """
+        Builds the spec of a Lease held by this replica.
+
+        Parameters
+        ----------
+        now : datetime.datetime
+        transitions : int
+
+        Returns
+        -------
+        kubernetes.client.V1LeaseSpec
+        """
+        return client.V1LeaseSpec(
+            holder_identity=self.identity,
+            lease_duration_seconds=AGENT_LEASE_DURATION,
+            acquire_time=now,
+            renew_time=now,
+            lease_transitions=transitions,
+        )
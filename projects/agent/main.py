@@ -1,15 +1,20 @@
 # -*- coding: utf-8 -*-
 """Persistence agent."""
 import argparse
+import logging
 import os
 import sys
-import threading
+import time
 
 from kubernetes import client
 from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
 
+from projects.agent.leader_election import AGENT_LEADER_ELECTION, \
+    LeaderElector
 from projects.agent.logger import DEFAULT_LOG_LEVEL
+from projects.agent.metrics import AGENT_METRICS_PORT, start_metrics_server
+from projects.agent.utils import start_supervised_thread
 from projects.agent.watchers.deployment import watch_seldon_deployments
 from projects.agent.watchers.workflow import watch_workflows
 from projects.kubernetes.kube_config import load_kube_config
@@ -33,17 +38,32 @@ session = scoped_session(sessionmaker(autocommit=False,
 def run(**kwargs):
     """
     Watches kubernetes events and saves relevant data.
+    With AGENT_LEADER_ELECTION, only the replica that holds the Lease does.
     """
     load_kube_config()
     api = client.CustomObjectsApi()
 
     log_level = kwargs.get("log_level", DEFAULT_LOG_LEVEL)
+    logging.basicConfig(level=log_level)
 
-    workflows_thread = threading.Thread(target=watch_workflows, args=(api, session), kwargs={"log_level": log_level})
-    sdeps_thread = threading.Thread(target=watch_seldon_deployments, args=(api, session), kwargs={"log_level": log_level})
+    # standbys serve metrics too, so that every replica can be probed
+    if AGENT_METRICS_PORT:
+        start_metrics_server(AGENT_METRICS_PORT)
 
-    workflows_thread.start()
-    sdeps_thread.start()
+    def start_watchers():
+        start_supervised_thread(watch_workflows, api, session, log_level=log_level)
+        start_supervised_thread(watch_seldon_deployments, api, session, log_level=log_level)
+
+    if not AGENT_LEADER_ELECTION:
+        start_watchers()
+        while True:
+            time.sleep(60)
+
+    leader_elector = LeaderElector(client.CoordinationV1Api())
+    leader_elector.run(on_started_leading=start_watchers)
+
+    # watchers can not be interrupted, so the agent exits and restarts as a standby
+    os._exit(1)
 
 
 def parse_args(args):
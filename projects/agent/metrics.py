@@ -0,0 +1,314 @@
+"""
+Metrics of the persistence agent, served in the Prometheus text format
+at http://0.0.0.0:AGENT_METRICS_PORT/metrics.
+"""
+import bisect
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import getenv
+
+import dateutil.parser
+
+AGENT_METRICS_PORT = int(getenv("AGENT_METRICS_PORT", "9090"))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LAG_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+
+REGISTRY = []
+
+
+class Metric:
+    type_ = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        # values by tuple of label values
+        self.values = {}
+        REGISTRY.append(self)
+
+    def format_labels(self, labelvalues, extra=()):
+        """
+        Formats label pairs, eg. '{resource="workflows"}'.
+
+        Parameters
+        ----------
+        labelvalues : tuple
+        extra : list
+            Additional (name, value) pairs.
+
+        Returns
+        -------
+        str
+        """
+        pairs = list(zip(self.labelnames, labelvalues)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+    def expose(self):
+        """
+        Formats the metric in the Prometheus text format.
+
+        Returns
+        -------
+        list
+            The lines.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_}"]
+        with self.lock:
+            for labelvalues, value in sorted(self.values.items()):
+                lines.extend(self.expose_value(labelvalues, value))
+        return lines
+
+    def expose_value(self, labelvalues, value):
+        return [f"{self.name}{self.format_labels(labelvalues)} {value}"]
+
+
+class Counter(Metric):
+    type_ = "counter"
+
+    def inc(self, *labelvalues, amount=1):
+        with self.lock:
+            self.values[labelvalues] = self.values.get(labelvalues, 0) + amount
+
+
+class Gauge(Metric):
+    type_ = "gauge"
+
+    def set(self, value, *labelvalues):
+        with self.lock:
+            self.values[labelvalues] = value
+
+
+class Histogram(Metric):
+    type_ = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labelvalues):
+        with self.lock:
+            # the last count is of values greater than every bucket
+            counts, total = self.values.get(labelvalues, ([0] * (len(self.buckets) + 1), 0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.values[labelvalues] = (counts, total + value)
+
+    def time(self, *labelvalues):
+        """
+        Observes the duration of a with block.
+
+        Parameters
+        ----------
+        *labelvalues
+
+        Returns
+        -------
+        Timer
+        """
+        return Timer(self, labelvalues)
+
+    def expose_value(self, labelvalues, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bucket, count in zip(self.buckets + ("+Inf",), counts):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{self.format_labels(labelvalues, [('le', bucket)])} {cumulative}")
+        lines.append(f"{self.name}_count{self.format_labels(labelvalues)} {cumulative}")
+        lines.append(f"{self.name}_sum{self.format_labels(labelvalues)} {total}")
+        return lines
+
+
+class Timer:
+    def __init__(self, histogram, labelvalues):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+
+    def __enter__(self):
+        self.started_at = time.monotonic()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.monotonic() - self.started_at, *self.labelvalues)
+
+
+EVENTS = Counter(
+    "agent_events_total",
+    "Watch events received, by resource and event type.",
+    ["resource", "type"],
+)
+FLUSHED_EVENTS = Counter(
+    "agent_flushed_events_total",
+    "Watch events saved in database, after the events of each object are coalesced.",
+    ["resource"],
+)
+EVENT_LAG = Histogram(
+    "agent_event_lag_seconds",
+    "Time from the latest change of an object to when its status is saved in database.",
+    ["resource"],
+    buckets=LAG_BUCKETS,
+)
+DB_FLUSH_LATENCY = Histogram(
+    "agent_db_flush_seconds",
+    "Duration of the database writes of a flush.",
+    ["resource"],
+)
+WATCH_RECONNECTS = Counter(
+    "agent_watch_reconnects_total",
+    "Watch streams that were restarted after an error.",
+    ["resource"],
+)
+WATCH_GONE = Counter(
+    "agent_watch_gone_total",
+    "Watch streams that expired (410 Gone), so the resource was listed again.",
+    ["resource"],
+)
+RESOURCE_VERSION = Gauge(
+    "agent_resource_version",
+    "The resourceVersion of the latest event received.",
+    ["resource"],
+)
+LAST_EVENT_TIMESTAMP = Gauge(
+    "agent_last_event_timestamp_seconds",
+    "When the latest event was received, in seconds since the epoch.",
+    ["resource"],
+)
+
+
+def escape(value):
+    """
+    Escapes a label value.
+
+    Parameters
+    ----------
+    value : object
+
+    Returns
+    -------
+    str
+    """
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def observe_event(resource, event_type, resource_version):
+    """
+    Counts an event received by a watcher.
+
+    Parameters
+    ----------
+    resource : str
+    event_type : str
+    resource_version : str or None
+    """
+    EVENTS.inc(resource, event_type)
+    LAST_EVENT_TIMESTAMP.set(time.time(), resource)
+    # resource versions are opaque, but etcd revisions are integers
+    if resource_version is not None and str(resource_version).isdigit():
+        RESOURCE_VERSION.set(int(resource_version), resource)
+
+
+def observe_lag(resource, obj):
+    """
+    Observes the time from the latest change of an object until now.
+
+    Parameters
+    ----------
+    resource : str
+    obj : dict
+    """
+    changed_at = get_last_change_time(obj)
+    if changed_at is not None:
+        lag = (datetime.now(timezone.utc) - changed_at).total_seconds()
+        EVENT_LAG.observe(max(lag, 0), resource)
+
+
+def get_last_change_time(obj):
+    """
+    Finds the latest timestamp of a kubernetes object: its creation, deletion,
+    managed fields, and the start and finish of the workflow and its nodes.
+
+    Parameters
+    ----------
+    obj : dict
+
+    Returns
+    -------
+    datetime.datetime or None
+    """
+    metadata = obj.get("metadata", {})
+    status = obj.get("status") or {}
+
+    timestamps = [metadata.get("creationTimestamp"), metadata.get("deletionTimestamp")]
+    timestamps.extend(field.get("time") for field in metadata.get("managedFields") or [])
+    for item in [status, *(status.get("nodes") or {}).values()]:
+        timestamps.extend([item.get("startedAt"), item.get("finishedAt")])
+
+    parsed = []
+    for timestamp in timestamps:
+        if not timestamp:
+            continue
+        try:
+            parsed_timestamp = dateutil.parser.isoparse(timestamp)
+        except ValueError:
+            continue
+        if parsed_timestamp.tzinfo is None:
+            parsed_timestamp = parsed_timestamp.replace(tzinfo=timezone.utc)
+        parsed.append(parsed_timestamp)
+
+    return max(parsed, default=None)
+
+
+def generate_latest():
+    """
+    Formats every metric in the Prometheus text format.
+
+    Returns
+    -------
+    str
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = generate_latest().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug("Metrics: " + format % args)
+
+
+def start_metrics_server(port=AGENT_METRICS_PORT):
+    """
+    Serves the metrics on a background thread.
+
+    Parameters
+    ----------
+    port : int
+
+    Returns
+    -------
+    http.server.ThreadingHTTPServer
+    """
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics", daemon=True)
+    thread.start()
+    return server
@@ -1,11 +1,22 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from os import getenv
+
 from kubernetes import client
 
+from projects import models
 from projects.kubernetes.kube_config import load_kube_config
 
+# Time (in seconds) status changes are kept for the status streams of the API
+STATUS_CHANGES_RETENTION = int(getenv("STATUS_CHANGES_RETENTION", "3600"))
+
 
-def list_resource_version(group, version, namespace, plural):
+def list_resources(group, version, namespace, plural):
     """
-    Determines the resource version the watcher should list from.
+    Lists the objects of a resource, and the resource version the watcher
+    should watch from.
 
     Parameters
     ----------
@@ -16,7 +27,8 @@ def list_resource_version(group, version, namespace, plural):
 
     Returns
     -------
-    str
+    tuple
+        The objects, and the resource version of the list.
     """
     load_kube_config()
     api = client.CustomObjectsApi()
@@ -27,4 +39,114 @@ def list_resource_version(group, version, namespace, plural):
         namespace=namespace,
         plural=plural,
     )
-    return r["metadata"]["resourceVersion"]
+    return r["items"], r["metadata"]["resourceVersion"]
+
+
+def load_resource_version(plural, session):
+    """
+    Reads the resource version of the latest event saved for a resource.
+
+    Parameters
+    ----------
+    plural : str
+    session : sqlalchemy.orm.session.Session
+
+    Returns
+    -------
+    str or None
+        None if the resource was never watched.
+    """
+    watch_state = session.query(models.WatchState).get(plural)
+    if watch_state is None:
+        return None
+    return watch_state.resource_version
+
+
+def save_resource_version(plural, resource_version, session):
+    """
+    Saves the resource version of the latest event saved for a resource,
+    so that the watch resumes from it after the agent restarts.
+
+    Parameters
+    ----------
+    plural : str
+    resource_version : str
+    session : sqlalchemy.orm.session.Session
+    """
+    session.merge(models.WatchState(resource=plural, resource_version=resource_version))
+    session.commit()
+
+
+def save_status_changes(changes, session):
+    """
+    Records status changes of operators and deployments, which are pushed
+    to clients by the API. Does not commit, so that changes are recorded
+    in the same transaction as the statuses.
+
+    Parameters
+    ----------
+    changes : list
+        Dicts with (some of) experiment_id, deployment_id, operator_id,
+        status and status_message.
+    session : sqlalchemy.orm.session.Session
+    """
+    if not changes:
+        return
+
+    keys = ["experiment_id", "deployment_id", "operator_id", "status", "status_message"]
+    session.execute(
+        models.StatusChange.__table__.insert(),
+        [{key: change.get(key) for key in keys} for change in changes],
+    )
+
+
+def prune_status_changes(session):
+    """
+    Deletes the status changes older than STATUS_CHANGES_RETENTION seconds.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.session.Session
+    """
+    expired_at = datetime.utcnow() - timedelta(seconds=STATUS_CHANGES_RETENTION)
+    session.query(models.StatusChange) \
+        .filter(models.StatusChange.created_at < expired_at) \
+        .delete(synchronize_session=False)
+    session.commit()
+
+
+def start_supervised_thread(target, *args, max_backoff=60, **kwargs):
+    """
+    Starts a thread that calls target again whenever it returns or raises,
+    waiting longer after each consecutive failure, up to max_backoff seconds.
+
+    Parameters
+    ----------
+    target : callable
+    *args
+    max_backoff : int
+    **kwargs
+
+    Returns
+    -------
+    threading.Thread
+    """
+    def supervise():
+        backoff = 1
+        while True:
+            started_at = time.monotonic()
+            try:
+                target(*args, **kwargs)
+                logging.warning("%s returned, restarting" % target.__name__)
+            except Exception:
+                logging.exception("%s failed, restarting" % target.__name__)
+
+            # a target that ran for a while is not failing repeatedly
+            if time.monotonic() - started_at > max_backoff:
+                backoff = 1
+            time.sleep(backoff)
+            backoff = min(backoff * 2, max_backoff)
+
+    thread = threading.Thread(target=supervise, name=target.__name__, daemon=True)
+    thread.start()
+    return thread
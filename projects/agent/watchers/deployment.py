@@ -1,12 +1,16 @@
 import http
 import logging
+from datetime import datetime
 
 from kubernetes import watch
 from kubernetes.client.rest import ApiException
 
 from projects import models
 from projects.agent.logger import DEFAULT_LOG_LEVEL
-from projects.agent.utils import list_resource_version
+from projects.agent.metrics import DB_FLUSH_LATENCY, FLUSHED_EVENTS, \
+    WATCH_GONE, WATCH_RECONNECTS, observe_event, observe_lag
+from projects.agent.utils import list_resources, load_resource_version, \
+    save_resource_version, save_status_changes
 from projects.kfp import KF_PIPELINES_NAMESPACE
 
 GROUP = "machinelearning.seldon.io"
@@ -28,45 +32,80 @@ def watch_seldon_deployments(api, session, **kwargs):
     log_level = kwargs.get("log_level", DEFAULT_LOG_LEVEL)
     logging.basicConfig(level=log_level)
 
-    # When retrieving a collection of resources the response from the server
-    # will contain a resourceVersion value that can be used to initiate a watch
-    # against the server.
-    resource_version = list_resource_version(
+    try:
+        # Resumes from the latest event saved, so that the events that happened
+        # while the agent was stopped are received
+        resource_version = load_resource_version(PLURAL, session)
+        if resource_version is None:
+            resource_version = reconcile_seldon_deployments(session)
+
+        while True:
+            stream = w.stream(
+                api.list_namespaced_custom_object,
+                group=GROUP,
+                version=VERSION,
+                namespace=KF_PIPELINES_NAMESPACE,
+                plural=PLURAL,
+                resource_version=resource_version,
+            )
+
+            try:
+                for sdep_manifest in stream:
+                    observe_event(PLURAL, sdep_manifest["type"], w.resource_version)
+
+                    # bookmarks only advance the resource version
+                    if sdep_manifest["type"] != "BOOKMARK":
+                        logging.info("Event: %s %s " % (sdep_manifest["type"],
+                                     sdep_manifest["object"]["metadata"]["name"]))
+
+                        with DB_FLUSH_LATENCY.time(PLURAL):
+                            update_seldon_deployment(sdep_manifest, session)
+                        FLUSHED_EVENTS.inc(PLURAL)
+                        observe_lag(PLURAL, sdep_manifest["object"])
+
+                    save_resource_version(PLURAL, w.resource_version, session)
+            except ApiException as e:
+                # When the requested watch operations fail because the historical version
+                # of that resource is not available, clients must handle the case by
+                # recognizing the status code 410 Gone, clearing their local cache,
+                # performing a list operation, and starting the watch from the resourceVersion returned by that new list operation.
+                # See: https://kubernetes.io/docs/reference/using-api/api-concepts/#efficient-detection-of-changes
+                WATCH_RECONNECTS.inc(PLURAL)
+                if e.status == http.HTTPStatus.GONE:
+                    WATCH_GONE.inc(PLURAL)
+                    resource_version = reconcile_seldon_deployments(session)
+                else:
+                    resource_version = w.resource_version
+    finally:
+        # a failed transaction must not be reused when the watch is restarted
+        session.rollback()
+
+
+def reconcile_seldon_deployments(session):
+    """
+    Lists seldon deployments and saves their status in database.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.session.Session
+
+    Returns
+    -------
+    str
+        The resource version the watcher should watch from.
+    """
+    sdeps, resource_version = list_resources(
         group=GROUP,
         version=VERSION,
         namespace=KF_PIPELINES_NAMESPACE,
         plural=PLURAL,
     )
 
-    while True:
-        stream = w.stream(
-            api.list_namespaced_custom_object,
-            group=GROUP,
-            version=VERSION,
-            namespace=KF_PIPELINES_NAMESPACE,
-            plural=PLURAL,
-            resource_version=resource_version,
-        )
-
-        try:
-            for sdep_manifest in stream:
-                logging.info("Event: %s %s " % (sdep_manifest["type"],
-                             sdep_manifest["object"]["metadata"]["name"]))
-
-                update_seldon_deployment(sdep_manifest, session)
-        except ApiException as e:
-            # When the requested watch operations fail because the historical version
-            # of that resource is not available, clients must handle the case by
-            # recognizing the status code 410 Gone, clearing their local cache,
-            # performing a list operation, and starting the watch from the resourceVersion returned by that new list operation.
-            # See: https://kubernetes.io/docs/reference/using-api/api-concepts/#efficient-detection-of-changes
-            if e.status == http.HTTPStatus.GONE:
-                resource_version = list_resource_version(
-                    group=GROUP,
-                    version=VERSION,
-                    namespace=KF_PIPELINES_NAMESPACE,
-                    plural=PLURAL,
-                )
+    for sdep in sdeps:
+        update_seldon_deployment({"type": "ADDED", "object": sdep}, session)
+
+    save_resource_version(PLURAL, resource_version, session)
+    return resource_version
 
 
 def update_seldon_deployment(seldon_deployment_manifest, session):
@@ -89,8 +128,14 @@ def update_seldon_deployment(seldon_deployment_manifest, session):
         elif state == "Creating":
             state = "Pending"
 
-        session.query(models.Deployment) \
+        deployment = session.query(models.Deployment.status) \
             .filter_by(uuid=deployment_id) \
-            .update({"status": state})
+            .first()
+
+        if deployment is not None and deployment.status != state:
+            session.query(models.Deployment) \
+                .filter_by(uuid=deployment_id) \
+                .update({"status": state, "updated_at": datetime.utcnow()})
+            save_status_changes([{"deployment_id": deployment_id, "status": state}], session)
 
     session.commit()
@@ -1,22 +1,42 @@
 import http
 import logging
 import re
+import threading
+import time
 import uuid
+from datetime import datetime, timezone
+from os import getenv
 
 import dateutil.parser
 from kubernetes import watch
 from kubernetes.client.rest import ApiException
+from sqlalchemy import case, or_
 
 from projects import models
 from projects.agent.logger import DEFAULT_LOG_LEVEL
-from projects.agent.utils import list_resource_version
+from projects.agent.metrics import DB_FLUSH_LATENCY, FLUSHED_EVENTS, \
+    WATCH_GONE, WATCH_RECONNECTS, observe_event, observe_lag
+from projects.agent.utils import list_resources, load_resource_version, \
+    prune_status_changes, save_resource_version, save_status_changes
+from projects.controllers.experiments.runs.scheduler import SchedulerController
+from projects.controllers.logs import LogController
+from projects.controllers.logs.archive import load_operator_index, \
+    load_run_index, save_operator_logs, save_run_index
 from projects.kfp import KF_PIPELINES_NAMESPACE
+from projects.kfp.cache import get_cached_operators
+from projects.kubernetes.utils import get_container_logs, get_pod
 
 GROUP = "argoproj.io"
 VERSION = "v1alpha1"
 PLURAL = "workflows"
 
 RECURRENT_MESSAGES = ["ContainerCreating", ]
+TERMINAL_PHASES = {"Succeeded", "Failed", "Error"}
+
+# Events of a workflow are coalesced for this many seconds before being saved
+WORKFLOW_FLUSH_INTERVAL = float(getenv("WORKFLOW_FLUSH_INTERVAL", "1"))
+# Interval (in seconds) between deletions of expired status changes
+PRUNE_INTERVAL = 60
 
 
 def watch_workflows(api, session, **kwargs):
@@ -33,46 +53,233 @@ def watch_workflows(api, session, **kwargs):
     log_level = kwargs.get("log_level", DEFAULT_LOG_LEVEL)
     logging.basicConfig(level=log_level)
 
-    # When retrieving a collection of resources the response from the server
-    # will contain a resourceVersion value that can be used to initiate a watch
-    # against the server.
-    resource_version = list_resource_version(
+    # The latest event of each workflow, and the resource version of the
+    # latest event, until they are flushed to the database
+    pending = {"events": {}, "resource_version": None}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    flusher_thread = threading.Thread(target=flush_events, args=(pending, lock, stop, session), daemon=True)
+    flusher_thread.start()
+
+    try:
+        # Resumes from the latest event saved, so that the events that happened
+        # while the agent was stopped are received
+        resource_version = load_resource_version(PLURAL, session)
+        if resource_version is None:
+            resource_version = reconcile_workflows(pending, lock, session)
+
+        while True:
+
+            stream = w.stream(
+                api.list_namespaced_custom_object,
+                group=GROUP,
+                version=VERSION,
+                namespace=KF_PIPELINES_NAMESPACE,
+                plural=PLURAL,
+                resource_version=resource_version,
+            )
+
+            try:
+                for workflow_manifest in stream:
+                    observe_event(PLURAL, workflow_manifest["type"], w.resource_version)
+
+                    # bookmarks only advance the resource version
+                    if workflow_manifest["type"] == "BOOKMARK":
+                        with lock:
+                            pending["resource_version"] = w.resource_version
+                        continue
+
+                    logging.info("Event: %s %s " % (workflow_manifest["type"],
+                                 workflow_manifest["object"]["metadata"]["name"]))
+
+                    # the manifest of an event holds the whole workflow status,
+                    # so older events of the same workflow can be discarded
+                    with lock:
+                        pending["events"][workflow_manifest["object"]["metadata"]["name"]] = workflow_manifest
+                        pending["resource_version"] = w.resource_version
+            except ApiException as e:
+                # When the requested watch operations fail because the historical version
+                # of that resource is not available, clients must handle the case by
+                # recognizing the status code 410 Gone, clearing their local cache,
+                # performing a list operation, and starting the watch from the resourceVersion returned by that new list operation.
+                # See: https://kubernetes.io/docs/reference/using-api/api-concepts/#efficient-detection-of-changes
+                WATCH_RECONNECTS.inc(PLURAL)
+                if e.status == http.HTTPStatus.GONE:
+                    WATCH_GONE.inc(PLURAL)
+                    resource_version = reconcile_workflows(pending, lock, session)
+                else:
+                    resource_version = w.resource_version
+    finally:
+        # the events received so far are flushed before the watch is restarted
+        stop.set()
+        flusher_thread.join()
+        # a failed transaction must not be reused when the watch is restarted
+        session.rollback()
+
+
+def reconcile_workflows(pending, lock, session):
+    """
+    Lists workflows, and queues their current status to be saved in database.
+    Releases the slots of runs whose workflows were deleted meanwhile.
+
+    Parameters
+    ----------
+    pending : dict
+        The latest event of each workflow, and the resource version of the latest event.
+    lock : threading.Lock
+        Guards pending.
+    session : sqlalchemy.orm.session.Session
+
+    Returns
+    -------
+    str
+        The resource version the watcher should watch from.
+    """
+    listed_at = datetime.utcnow()
+    workflows, resource_version = list_resources(
         group=GROUP,
         version=VERSION,
         namespace=KF_PIPELINES_NAMESPACE,
         plural=PLURAL,
     )
 
-    while True:
+    with lock:
+        for workflow in workflows:
+            # listed workflows may not have changed for long, so their lag is not observed
+            pending["events"][workflow["metadata"]["name"]] = {"type": "ADDED", "object": workflow, "listed": True}
+        pending["resource_version"] = resource_version
 
-        stream = w.stream(
-            api.list_namespaced_custom_object,
-            group=GROUP,
-            version=VERSION,
-            namespace=KF_PIPELINES_NAMESPACE,
-            plural=PLURAL,
-            resource_version=resource_version,
-        )
+    run_ids = {workflow["metadata"].get("labels", {}).get("pipeline/runid") for workflow in workflows}
+    release_deleted_runs(run_ids, listed_at, session)
+
+    return resource_version
+
+
+def release_deleted_runs(run_ids, listed_at, session):
+    """
+    Releases the slots of runs whose workflows do not exist anymore,
+    and starts the queued runs that were waiting for them.
+
+    Parameters
+    ----------
+    run_ids : set
+        The run ids of the existing workflows.
+    listed_at : datetime.datetime
+        When the workflows were listed. Runs started later are kept.
+    session : sqlalchemy.orm.session.Session
+    """
+    queued_runs = session.query(models.QueuedRun) \
+        .filter_by(status="Running") \
+        .filter(models.QueuedRun.run_id.isnot(None)) \
+        .filter(models.QueuedRun.updated_at < listed_at) \
+        .all()
+
+    scheduler_controller = SchedulerController(session)
+    released = False
+    for queued_run in queued_runs:
+        if queued_run.run_id not in run_ids:
+            released = scheduler_controller.finish_run(queued_run.run_id) or released
+
+    if released:
+        scheduler_controller.dispatch_runs()
+    else:
+        session.commit()
+
+
+def flush_events(pending, lock, stop, session):
+    """
+    Saves the coalesced workflow events every WORKFLOW_FLUSH_INTERVAL seconds,
+    then the resource version of the latest event, until stop is set.
+    Events that could not be saved are queued again, unless a newer event of
+    their workflow was received, and the resource version is not saved until
+    they are, so that a restart replays them.
+
+    Parameters
+    ----------
+    pending : dict
+        The latest event of each workflow, and the resource version of the latest event.
+    lock : threading.Lock
+        Guards pending.
+    stop : threading.Event
+    session : sqlalchemy.orm.session.Session
+    """
+    saved_resource_version = None
+    next_prune = 0
+
+    stopped = False
+    while not stopped:
+        stopped = stop.wait(WORKFLOW_FLUSH_INTERVAL)
+
+        with lock:
+            workflow_manifests = list(pending["events"].values())
+            pending["events"].clear()
+            resource_version = pending["resource_version"]
 
+        if workflow_manifests and not process_events(workflow_manifests, session):
+            # a newer event of a workflow holds its whole status, so it replaces the failed one
+            with lock:
+                for workflow_manifest in workflow_manifests:
+                    pending["events"].setdefault(workflow_manifest["object"]["metadata"]["name"], workflow_manifest)
+            continue
+
+        if resource_version is not None and resource_version != saved_resource_version:
+            try:
+                save_resource_version(PLURAL, resource_version, session)
+                saved_resource_version = resource_version
+            except Exception as e:
+                session.rollback()
+                logging.warning("Failed to save resource version: %s" % e)
+
+        if time.monotonic() >= next_prune:
+            next_prune = time.monotonic() + PRUNE_INTERVAL
+            try:
+                prune_status_changes(session)
+            except Exception as e:
+                session.rollback()
+                logging.warning("Failed to prune status changes: %s" % e)
+
+
+def process_events(workflow_manifests, session):
+    """
+    Saves the status of workflows, dispatches queued runs and queues
+    the workflows to have their logs archived. When the status could not be
+    saved, runs are neither dispatched nor archived, as they are retried
+    with the events.
+
+    Parameters
+    ----------
+    workflow_manifests : list
+    session : sqlalchemy.orm.session.Session
+
+    Returns
+    -------
+    bool
+        Whether the status of the workflows was saved.
+    """
+    try:
+        with DB_FLUSH_LATENCY.time(PLURAL):
+            update_statuses(workflow_manifests, session)
+    except Exception as e:
+        session.rollback()
+        logging.warning("Failed to update status: %s" % e)
+        return False
+
+    FLUSHED_EVENTS.inc(PLURAL, amount=len(workflow_manifests))
+    for workflow_manifest in workflow_manifests:
+        if not workflow_manifest.get("listed"):
+            observe_lag(PLURAL, workflow_manifest["object"])
+
+    for workflow_manifest in workflow_manifests:
         try:
-            for workflow_manifest in stream:
-                logging.info("Event: %s %s " % (workflow_manifest["type"],
-                             workflow_manifest["object"]["metadata"]["name"]))
-
-                update_status(workflow_manifest, session)
-        except ApiException as e:
-            # When the requested watch operations fail because the historical version
-            # of that resource is not available, clients must handle the case by
-            # recognizing the status code 410 Gone, clearing their local cache,
-            # performing a list operation, and starting the watch from the resourceVersion returned by that new list operation.
-            # See: https://kubernetes.io/docs/reference/using-api/api-concepts/#efficient-detection-of-changes
-            if e.status == http.HTTPStatus.GONE:
-                resource_version = list_resource_version(
-                    group=GROUP,
-                    version=VERSION,
-                    namespace=KF_PIPELINES_NAMESPACE,
-                    plural=PLURAL,
-                )
+            dispatch_queued_runs(workflow_manifest, session)
+        except Exception as e:
+            session.rollback()
+            logging.warning("Failed to dispatch queued runs: %s" % e)
+
+        ARCHIVER.submit(workflow_manifest)
+
+    return True
 
 
 def update_status(workflow_manifest, session):
@@ -85,38 +292,142 @@ def update_status(workflow_manifest, session):
     workflow_manifest : dict
     session : sqlalchemy.orm.session.Session
     """
-    # First, we set the status for operators that are unlisted in object.status.nodes.
-    # Obs: the workflow manifest contains only the nodes that are ready to run (whose dependencies succeeded)
+    update_statuses([workflow_manifest], session)
 
-    # if the workflow is pending/running, then unlisted_operators_status = "Pending"
-    # if the workflow succeeded/failed, then unlisted_operators_status = "Unset/Setted Up"
-    workflow_status = workflow_manifest["object"]["status"].get("phase")
-    if workflow_status in {"Pending", "Running"}:
-        unlisted_operators_status = "Pending"
-    else:
-        unlisted_operators_status = "Unset"
 
-    match = re.search(r"(experiment|deployment)-(.*)-\w+", workflow_manifest["object"]["metadata"]["name"])
-    if match:
-        key = match.group(1)
-        id_ = match.group(2)
+def update_statuses(workflow_manifests, session):
+    """
+    Parses workflow manifests, in order, and sets operators status in database.
+    Only operators whose status or status message changed are updated, by a
+    single statement, and changes are committed once.
+
+    Parameters
+    ----------
+    workflow_manifests : list
+    session : sqlalchemy.orm.session.Session
+    """
+    workflows = []
+    for workflow_manifest in workflow_manifests:
+        match = re.search(r"(experiment|deployment)-(.*)-\w+", workflow_manifest["object"]["metadata"]["name"])
+        node_statuses = get_node_statuses(workflow_manifest["object"])
+        workflows.append((workflow_manifest["object"], match, node_statuses))
+
+    # reads the current status of every operator that may change
+    criteria = []
+    for key in ["experiment", "deployment"]:
+        ids = {match.group(2) for _, match, _ in workflows if match and match.group(1) == key}
+        if ids:
+            criteria.append(getattr(models.Operator, f"{key}_id").in_(ids))
+    node_operator_ids = {operator_id for _, _, node_statuses in workflows for operator_id in node_statuses}
+    if node_operator_ids:
+        criteria.append(models.Operator.uuid.in_(node_operator_ids))
+
+    if not criteria:
+        return
+
+    operators = session.query(models.Operator.uuid,
+                              models.Operator.experiment_id,
+                              models.Operator.deployment_id,
+                              models.Operator.status,
+                              models.Operator.status_message) \
+        .filter(or_(*criteria)) \
+        .all()
+
+    current_statuses = {operator.uuid: (operator.status, operator.status_message) for operator in operators}
+    statuses = dict(current_statuses)
+
+    for workflow, match, node_statuses in workflows:
+        # First, we set the status for operators that are unlisted in object.status.nodes.
+        # Obs: the workflow manifest contains only the nodes that are ready to run (whose dependencies succeeded)
+
+        # if the workflow is pending/running, then unlisted_operators_status = "Pending"
+        # if the workflow succeeded/failed, then unlisted_operators_status = "Unset/Setted Up"
+        workflow_status = workflow["status"].get("phase")
+        if workflow_status in {"Pending", "Running"}:
+            unlisted_operators_status = "Pending"
+        else:
+            unlisted_operators_status = "Unset"
+
+        if match:
+            key = match.group(1)
+            id_ = match.group(2)
+            for operator in operators:
+                if getattr(operator, f"{key}_id") == id_:
+                    statuses[operator.uuid] = (unlisted_operators_status, statuses[operator.uuid][1])
+
+            # operators whose results were reused from a previous run are not scheduled
+            for operator_id in get_cached_operators(workflow):
+                if operator_id in statuses:
+                    statuses[operator_id] = ("Cached", None)
+
+            # check if this workflow is a deployment
+            if key == "deployment":
+                update_seldon_deployment(
+                    deployment_id=id_,
+                    status=workflow_status,
+                    created_at_str=workflow["status"].get("startedAt"),
+                    session=session
+                )
+
+        # Then, we set the status for operators that are listed in object.status.nodes
+        for operator_id, status in node_statuses.items():
+            if operator_id in statuses:
+                statuses[operator_id] = status
+
+    changed_statuses = {
+        operator_id: status for operator_id, status in statuses.items()
+        if status != current_statuses[operator_id]
+    }
+
+    if changed_statuses:
         session.query(models.Operator) \
-            .filter_by(**{f"{key}_id": id_}) \
-            .update({"status": unlisted_operators_status})
-
-        # check if this workflow is a deployment
-        if key == "deployment":
-            update_seldon_deployment(
-                deployment_id=id_,
-                status=workflow_status,
-                created_at_str=workflow_manifest["object"]["status"].get("startedAt"),
-                session=session
-            )
+            .filter(models.Operator.uuid.in_(changed_statuses)) \
+            .update({
+                "status": case(
+                    {operator_id: status for operator_id, (status, _) in changed_statuses.items()},
+                    value=models.Operator.uuid,
+                ),
+                "status_message": case(
+                    {operator_id: status_message for operator_id, (_, status_message) in changed_statuses.items()},
+                    value=models.Operator.uuid,
+                ),
+                # so that the operators are listed by ?updatedSince
+                "updated_at": datetime.utcnow(),
+            }, synchronize_session=False)
 
-    # Then, we set the status for operators that are listed in object.status.nodes
-    for node in workflow_manifest["object"]["status"].get("nodes", {}).values():
+        owners = {operator.uuid: operator for operator in operators}
+        save_status_changes([
+            {
+                "experiment_id": owners[operator_id].experiment_id,
+                "deployment_id": owners[operator_id].deployment_id,
+                "operator_id": operator_id,
+                "status": status,
+                "status_message": status_message,
+            }
+            for operator_id, (status, status_message) in changed_statuses.items()
+        ], session)
+
+    session.commit()
+
+
+def get_node_statuses(workflow):
+    """
+    Lists the status of the operators that are listed in the nodes of a workflow.
+
+    Parameters
+    ----------
+    workflow : dict
+
+    Returns
+    -------
+    dict
+        Tuples of (status, status_message) by operator id.
+    """
+    node_statuses = {}
+
+    for node in workflow["status"].get("nodes", {}).values():
         try:
-            operator_id = uuid.UUID(node["displayName"])
+            operator_id = str(uuid.UUID(node["displayName"]))
         except ValueError:
             continue
 
@@ -129,11 +440,9 @@ def update_status(workflow_manifest, session):
             status = str(node["phase"])
 
         if status_message not in RECURRENT_MESSAGES:
-            session.query(models.Operator) \
-                .filter_by(uuid=operator_id) \
-                .update({"status": status, "status_message": status_message})
+            node_statuses[operator_id] = (status, status_message)
 
-    session.commit()
+    return node_statuses
 
 
 def update_seldon_deployment(deployment_id, status, created_at_str, session):
@@ -148,14 +457,225 @@ def update_seldon_deployment(deployment_id, status, created_at_str, session):
     """
     if created_at_str is not None:
         deployed_at = dateutil.parser.isoparse(created_at_str)
+        # stored in UTC, without timezone, as the other timestamps
+        if deployed_at.tzinfo is not None:
+            deployed_at = deployed_at.astimezone(timezone.utc).replace(tzinfo=None)
     else:
         deployed_at = created_at_str
 
     if status in (None, "Running"):
         status = "Pending"
 
-    session.query(models.Deployment) \
+    deployment = session.query(models.Deployment.status, models.Deployment.deployed_at) \
         .filter_by(uuid=deployment_id) \
-        .update({"status": status, "deployed_at": deployed_at})
+        .first()
+    if deployment is None:
+        return
 
-    session.commit()
+    if (deployment.status, deployment.deployed_at) != (status, deployed_at):
+        session.query(models.Deployment) \
+            .filter_by(uuid=deployment_id) \
+            .update({"status": status, "deployed_at": deployed_at, "updated_at": datetime.utcnow()})
+
+    if deployment.status != status:
+        save_status_changes([{"deployment_id": deployment_id, "status": status}], session)
+
+
+def dispatch_queued_runs(workflow_manifest, session):
+    """
+    Releases the slot of a run whose workflow finished (or was deleted),
+    and starts the queued runs that were waiting for it.
+
+    Parameters
+    ----------
+    workflow_manifest : dict
+    session : sqlalchemy.orm.session.Session
+    """
+    workflow_status = workflow_manifest["object"]["status"].get("phase")
+    if workflow_manifest["type"] != "DELETED" and workflow_status not in TERMINAL_PHASES:
+        return
+
+    labels = workflow_manifest["object"]["metadata"].get("labels", {})
+    run_id = labels.get("pipeline/runid")
+    if run_id is None:
+        return
+
+    scheduler_controller = SchedulerController(session)
+    if scheduler_controller.finish_run(run_id):
+        scheduler_controller.dispatch_runs()
+
+
+class LogArchiver:
+    """
+    Archives the logs of workflows in its own thread, one workflow at a time,
+    so that reading the logs of pods does not hold the status updates.
+    The events of a workflow that wait to be archived are coalesced, so at
+    most one event per workflow is kept.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # the latest event of each workflow, in the order they were first submitted
+        self.pending = {}
+        self.submitted = threading.Event()
+        # the operator indexes archived so far, by workflow name
+        self.archived_runs = {}
+        self.thread = None
+
+    def submit(self, workflow_manifest):
+        """
+        Queues a workflow to have its logs archived.
+
+        Parameters
+        ----------
+        workflow_manifest : dict
+        """
+        workflow_name = workflow_manifest["object"]["metadata"]["name"]
+
+        with self.lock:
+            # a workflow that is already queued keeps its place
+            self.pending[workflow_name] = workflow_manifest
+
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+        self.submitted.set()
+
+    def run(self):
+        while True:
+            self.submitted.wait()
+
+            with self.lock:
+                if not self.pending:
+                    self.submitted.clear()
+                    continue
+                workflow_name = next(iter(self.pending))
+                workflow_manifest = self.pending.pop(workflow_name)
+
+            try:
+                if workflow_manifest["type"] == "DELETED":
+                    # the last MODIFIED event may have been coalesced into this one,
+                    # and the object of a DELETED event holds the final status
+                    archive_logs({**workflow_manifest, "type": "MODIFIED"}, self.archived_runs)
+                archive_logs(workflow_manifest, self.archived_runs)
+            except Exception as e:
+                # operators not archived yet are retried at the next event
+                logging.warning("Failed to archive logs: %s" % e)
+
+
+ARCHIVER = LogArchiver()
+
+
+def archive_logs(workflow_manifest, archived_runs):
+    """
+    Archives the logs of operators whose pods finished.
+    Once the workflow finishes, saves the run index so that its logs
+    are served from the archive, even after the workflow is deleted.
+
+    Parameters
+    ----------
+    workflow_manifest : dict
+    archived_runs : dict
+        The operator indexes archived so far, by workflow name.
+    """
+    workflow_name = workflow_manifest["object"]["metadata"]["name"]
+
+    if workflow_manifest["type"] == "DELETED":
+        archived_runs.pop(workflow_name, None)
+        return
+
+    labels = workflow_manifest["object"]["metadata"].get("labels", {})
+    run_id = labels.get("pipeline/runid")
+    if run_id is None:
+        return
+
+    if workflow_name not in archived_runs:
+        # the run may have been archived before the agent restarted
+        archived_runs[workflow_name] = {
+            "operators": {},
+            "finished": load_run_index(run_id) is not None,
+        }
+
+    archived_run = archived_runs[workflow_name]
+    if archived_run["finished"]:
+        return
+
+    workflow_status = workflow_manifest["object"]["status"].get("phase")
+    workflow_finished = workflow_status in TERMINAL_PHASES
+
+    for node in workflow_manifest["object"]["status"].get("nodes", {}).values():
+        if node.get("type") != "Pod" or node["id"] in archived_run["operators"]:
+            continue
+
+        try:
+            operator_id = str(uuid.UUID(node["displayName"]))
+        except ValueError:
+            continue
+
+        if node.get("phase") not in TERMINAL_PHASES and not workflow_finished:
+            continue
+
+        archived_run["operators"][node["id"]] = archive_operator_logs(
+            run_id=run_id,
+            operator_id=operator_id,
+            pod_name=node["id"],
+        )
+
+    if workflow_finished:
+        operator_indexes = [i for i in archived_run["operators"].values() if i is not None]
+        # the pods that were not found are recorded, so that their logs
+        # are read from the pods in case they still exist
+        missing_pods = [pod_name for pod_name, i in archived_run["operators"].items() if i is None]
+        save_run_index(run_id, operator_indexes, missing_pods)
+        archived_run["finished"] = True
+
+
+def archive_operator_logs(run_id, operator_id, pod_name):
+    """
+    Reads all logs of an operator pod and saves them in the logs archive.
+
+    Parameters
+    ----------
+    run_id : str
+    operator_id : str
+    pod_name : str
+
+    Returns
+    -------
+    dict or None
+        The operator index. None if the pod was already deleted.
+    """
+    index = load_operator_index(run_id, operator_id)
+    if index is not None:
+        return index
+
+    pod = get_pod(pod_name)
+    if pod is None:
+        return None
+
+    log_controller = LogController()
+    records = []
+    title = None
+    cursor_key = None
+    last_time = None
+
+    for pod, container in log_controller.iter_containers([pod]):
+        raw_logs = get_container_logs(pod, container, tail_lines=None)
+        if raw_logs is not None:
+            raw_logs, last_time = log_controller.skip_read_lines(raw_logs)
+
+        title = log_controller.get_task_name(pod, container)
+        cursor_key = f"{pod.metadata.name}/{container.name}"
+        records.extend(
+            log_controller.split_messages(raw_logs, title, pod.metadata.creation_timestamp),
+        )
+
+    logging.info("Archiving %d logs of %s" % (len(records), pod_name))
+
+    return save_operator_logs(run_id=run_id,
+                              operator_id=operator_id,
+                              title=title or pod_name,
+                              records=records,
+                              cursor_key=cursor_key,
+                              last_time=last_time)
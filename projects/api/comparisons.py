@@ -4,11 +4,13 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 import projects.schemas.comparison
-from projects.controllers import ComparisonController, ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import ComparisonController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/comparisons",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -27,9 +29,6 @@ async def handle_list_comparisons(project_id: str,
     -------
     projects.schemas.comparison.ComparisonList
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     comparison_controller = ComparisonController(session)
     comparisons = comparison_controller.list_comparisons(project_id=project_id)
     return comparisons
@@ -50,9 +49,6 @@ async def handle_post_comparisons(project_id: str,
     -------
     projects.schemas.comparison.Comparison
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     comparison_controller = ComparisonController(session)
     comparison = comparison_controller.create_comparison(project_id=project_id)
     return comparison
@@ -77,9 +73,6 @@ async def handle_patch_comparisons(project_id: str,
     -------
     projects.schemas.comparison.Comparison
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     comparison_controller = ComparisonController(session)
     comparison = comparison_controller.update_comparison(
         comparison_id=comparison_id,
@@ -106,9 +99,6 @@ async def handle_delete_comparisons(project_id: str,
     -------
     projects.schemas.message.Message
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     comparison_controller = ComparisonController(session)
     comparison = comparison_controller.delete_comparison(
         comparison_id=comparison_id,
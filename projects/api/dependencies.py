@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Dependencies shared by API Routers."""
+from fastapi import Depends, Request
+from sqlalchemy.orm import Session
+
+from projects.controllers import PathController
+from projects.database import session_scope
+
+# Path parameters of the resources that PathController checks
+PATH_IDS = ["project_id", "experiment_id", "deployment_id", "operator_id", "monitoring_id"]
+
+
+def validate_path(request: Request, session: Session = Depends(session_scope)):
+    """
+    Checks that the resources of the request path exist, and belong to each other.
+    FastAPI calls it once per request, with the session of the handler.
+
+    Parameters
+    ----------
+    request : fastapi.Request
+    session : sqlalchemy.orm.session.Session
+
+    Raises
+    ------
+    NotFound
+    """
+    path_ids = {name: request.path_params[name] for name in PATH_IDS if name in request.path_params}
+
+    path_controller = PathController(session)
+    path_controller.raise_if_path_does_not_exist(**path_ids)
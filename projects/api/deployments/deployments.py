@@ -1,19 +1,27 @@
 # -*- coding: utf-8 -*-
 """Deployments API Router."""
-from fastapi import APIRouter, BackgroundTasks, Depends
+from datetime import datetime
+from typing import Optional, Union
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from sqlalchemy.orm import Session
 
 import projects.schemas.deployment
-from projects.controllers import DeploymentController, ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import DeploymentController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/deployments",
+    dependencies=[Depends(validate_path)],
 )
 
 
-@router.get("", response_model=projects.schemas.deployment.DeploymentList)
+@router.get("", response_model=Union[projects.schemas.deployment.DeploymentList,
+                                     projects.schemas.deployment.DeploymentSummaryList])
 async def handle_list_deployments(project_id: str,
+                                  updated_since: Optional[datetime] = Query(None, alias="updatedSince"),
+                                  view: Optional[str] = "full",
                                   session: Session = Depends(session_scope)):
     """
     Handles GET requests to /.
@@ -21,17 +29,18 @@ async def handle_list_deployments(project_id: str,
     Parameters
     ----------
     project_id : str
+    updated_since : datetime.datetime or None
+    view : str
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
-    projects.schemas.deployment.DeploymentList
+    projects.schemas.deployment.DeploymentList or projects.schemas.deployment.DeploymentSummaryList
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     deployment_controller = DeploymentController(session)
-    deployments = deployment_controller.list_deployments(project_id=project_id)
+    deployments = deployment_controller.list_deployments(project_id=project_id,
+                                                         updated_since=updated_since,
+                                                         view=view)
     return deployments
 
 
@@ -51,9 +60,6 @@ async def handle_post_deployments(project_id: str,
     -------
     projects.schemas.deployment.Deployment
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     deployment_controller = DeploymentController(session)
     deployments = deployment_controller.create_deployment(project_id=project_id,
                                                           deployment=deployment)
@@ -77,9 +83,6 @@ async def handle_get_deployment(project_id: str,
     -------
     projects.schemas.deployment.Deployment
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     deployment_controller = DeploymentController(session)
     deployment = deployment_controller.get_deployment(deployment_id=deployment_id,
                                                       project_id=project_id)
@@ -104,9 +107,6 @@ async def handle_patch_deployment(project_id: str,
     -------
     projects.schemas.deployment.Deployment
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     deployment_controller = DeploymentController(session)
     deployment = deployment_controller.update_deployment(deployment_id=deployment_id,
                                                          project_id=project_id,
@@ -132,9 +132,6 @@ async def handle_delete_deployment(project_id: str,
     -------
     projects.schemas.message.Message
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     deployment_controller = DeploymentController(session, background_tasks)
     deployment = deployment_controller.delete_deployment(deployment_id=deployment_id,
                                                          project_id=project_id)
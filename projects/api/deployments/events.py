@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Deployment Events API Router."""
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from projects.api.dependencies import validate_path
+from projects.controllers.status_stream import StatusStreamController
+from projects.database import session_scope
+
+router = APIRouter(
+    prefix="/projects/{project_id}/deployments/{deployment_id}/events",
+    dependencies=[Depends(validate_path)],
+)
+
+
+@router.get("")
+async def handle_stream_events(project_id: str,
+                               deployment_id: str,
+                               session: Session = Depends(session_scope)):
+    """
+    Handles GET requests to /.
+
+    Parameters
+    ----------
+    project_id : str
+    deployment_id : str
+    session : sqlalchemy.orm.session.Session
+
+    Returns
+    -------
+    starlette.responses.StreamingResponse
+        Server-sent events with the status of the deployment and its operators, then their changes.
+    """
+    status_stream_controller = StatusStreamController(session)
+    events = status_stream_controller.stream_status_changes(deployment_id=deployment_id)
+    response = StreamingResponse(events, media_type="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    return response
@@ -1,21 +1,26 @@
 # -*- coding: utf-8 -*-
 """Deployments API Router."""
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 import projects.schemas.operator
-from projects.controllers import DeploymentController, OperatorController, \
-    ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import OperatorController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/deployments/{deployment_id}/operators",
+    dependencies=[Depends(validate_path)],
 )
 
 
 @router.get("", response_model=projects.schemas.operator.OperatorList)
 async def handle_list_operators(project_id: str,
                                 deployment_id: str,
+                                updated_since: Optional[datetime] = Query(None, alias="updatedSince"),
                                 session: Session = Depends(session_scope)):
     """
     Handles GET requests to /.
@@ -24,21 +29,17 @@ async def handle_list_operators(project_id: str,
     ----------
     project_id : str
     deployment_id : str
+    updated_since : datetime.datetime or None
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
     projects.schemas.operator.OperatorList
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     operator_controller = OperatorController(session)
     operators = operator_controller.list_operators(project_id=project_id,
-                                                   deployment_id=deployment_id)
+                                                   deployment_id=deployment_id,
+                                                   updated_since=updated_since)
     return operators
 
 
@@ -62,12 +63,6 @@ async def handle_patch_operator(project_id: str,
     -------
     projects.schemas.operator.Operator
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     operator_controller = OperatorController(session)
     operator = operator_controller.update_operator(operator_id=operator_id,
                                                    project_id=project_id,
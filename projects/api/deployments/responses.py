@@ -4,12 +4,13 @@ from fastapi import APIRouter, Body, Depends
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
-from projects.controllers import DeploymentController, ProjectController, \
-    ResponseController
+from projects.api.dependencies import validate_path
+from projects.controllers import ResponseController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/deployments/{deployment_id}/responses",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -32,12 +33,6 @@ async def handle_post_responses(project_id: str,
     -------
     fastapi.responses.JSONResponse
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     response_controller = ResponseController(session)
     response_controller.create_response(project_id=project_id,
                                         deployment_id=deployment_id,
@@ -1,14 +1,19 @@
 # -*- coding: utf-8 -*-
 """Logs API Router."""
+from datetime import datetime
+from typing import Optional
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from projects.controllers import DeploymentController, ProjectController
+from projects.api.dependencies import validate_path
 from projects.controllers.logs import LogController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/deployments/{deployment_id}/runs/{run_id}/logs",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -16,6 +21,15 @@ router = APIRouter(
 async def handle_list_logs(project_id: str,
                            deployment_id: str,
                            run_id: str,
+                           follow: Optional[bool] = False,
+                           since: Optional[str] = None,
+                           level: Optional[str] = None,
+                           start: Optional[datetime] = None,
+                           end: Optional[datetime] = None,
+                           title: Optional[str] = None,
+                           q: Optional[str] = None,
+                           regex: Optional[bool] = False,
+                           limit: Optional[int] = None,
                            session: Session = Depends(session_scope)):
     """
     Handles GET requests to /.
@@ -25,20 +39,53 @@ async def handle_list_logs(project_id: str,
     project_id : str
     deployment_id : str
     run_id : str
+    follow : bool
+        Whether to follow the logs as a stream of server-sent events.
+    since : str
+        The cursor returned by a previous request. Only newer logs are returned.
+    level : str
+        Comma-separated levels. Only logs of these levels are returned.
+    start : datetime.datetime
+        Only logs created at or after this date are returned.
+    end : datetime.datetime
+        Only logs created at or before this date are returned.
+    title : str
+        Comma-separated task names. Only logs of these tasks are returned.
+    q : str
+        Only logs whose message contains this text are returned.
+    regex : bool
+        Whether q is a regular expression.
+    limit : int
+        Only the newest `limit` logs are returned.
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
-    str
+    projects.schemas.log.LogList or starlette.responses.StreamingResponse
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
+    log_controller = LogController()
 
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
+    if follow:
+        # the stream may stay open for a long time, so the database
+        # connection is returned to the pool before it starts
+        session.close()
+
+        logs = log_controller.stream_logs(project_id=project_id,
+                                          deployment_id=deployment_id,
+                                          run_id=run_id)
+        response = StreamingResponse(logs, media_type="text/event-stream")
+        response.headers["Cache-Control"] = "no-cache"
+        return response
 
-    log_controller = LogController()
     logs = log_controller.list_logs(project_id=project_id,
                                     deployment_id=deployment_id,
-                                    run_id=run_id)
+                                    run_id=run_id,
+                                    since=since,
+                                    level=level,
+                                    start=start,
+                                    end=end,
+                                    title=title,
+                                    q=q,
+                                    regex=regex,
+                                    limit=limit)
     return logs
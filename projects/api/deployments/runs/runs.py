@@ -3,12 +3,13 @@
 from fastapi import APIRouter, BackgroundTasks, Depends
 from sqlalchemy.orm import Session
 
-from projects.controllers import DeploymentController, ProjectController
+from projects.api.dependencies import validate_path
 from projects.controllers.deployments.runs import RunController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/deployments/{deployment_id}/runs",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -29,12 +30,6 @@ async def handle_list_runs(project_id: str,
     -------
     str
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     run_controller = RunController(session)
     runs = run_controller.list_runs(project_id=project_id,
                                     deployment_id=deployment_id)
@@ -59,12 +54,6 @@ async def handle_post_runs(project_id: str,
     -------
     str
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     run_controller = RunController(session, background_tasks)
     run = run_controller.create_run(project_id=project_id,
                                     deployment_id=deployment_id)
@@ -90,12 +79,6 @@ async def handle_get_run(project_id: str,
     -------
     str
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     run_controller = RunController(session)
     run = run_controller.get_run(project_id=project_id,
                                  deployment_id=deployment_id,
@@ -122,12 +105,6 @@ async def handle_delete_runs(project_id: str,
     -------
     str
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     run_controller = RunController(session)
     run = run_controller.terminate_run(project_id=project_id,
                                        deployment_id=deployment_id,
@@ -1,19 +1,26 @@
 # -*- coding: utf-8 -*-
 """Experiments API Router."""
-from fastapi import APIRouter, Depends
+from typing import Optional, Union
+
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
 import projects.schemas.experiment
-from projects.controllers import ExperimentController, ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import ExperimentController
 from projects.database import session_scope
+from projects.utils import REVALIDATE_CACHE_CONTROL, not_modified_response
 
 router = APIRouter(
     prefix="/projects/{project_id}/experiments",
+    dependencies=[Depends(validate_path)],
 )
 
 
-@router.get("", response_model=projects.schemas.experiment.ExperimentList)
+@router.get("", response_model=Union[projects.schemas.experiment.ExperimentList,
+                                     projects.schemas.experiment.ExperimentSummaryList])
 async def handle_list_experiments(project_id: str,
+                                  view: Optional[str] = "full",
                                   session: Session = Depends(session_scope)):
     """
     Handles GET requests to /.
@@ -21,17 +28,15 @@ async def handle_list_experiments(project_id: str,
     Parameters
     ----------
     project_id : str
+    view : str
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
-    projects.schemas.experiment.ExperimentList
+    projects.schemas.experiment.ExperimentList or projects.schemas.experiment.ExperimentSummaryList
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     experiment_controller = ExperimentController(session)
-    experiments = experiment_controller.list_experiments(project_id=project_id)
+    experiments = experiment_controller.list_experiments(project_id=project_id, view=view)
     return experiments
 
 
@@ -52,9 +57,6 @@ async def handle_post_experiments(project_id: str,
     -------
     projects.schemas.experiment.Experiment
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     experiment_controller = ExperimentController(session)
     experiment = experiment_controller.create_experiment(project_id=project_id,
                                                          experiment=experiment)
@@ -64,6 +66,8 @@ async def handle_post_experiments(project_id: str,
 @router.get("/{experiment_id}", response_model=projects.schemas.experiment.Experiment)
 async def handle_get_experiment(project_id: str,
                                 experiment_id: str,
+                                request: Request,
+                                response: Response,
                                 session: Session = Depends(session_scope)):
     """
     Handles GET requests to /<experiment_id>.
@@ -72,16 +76,21 @@ async def handle_get_experiment(project_id: str,
     ----------
     project_id : str
     experiment_id : str
+    request : fastapi.Request
+    response : fastapi.Response
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
-    projects.schemas.experiment.Experiment
+    projects.schemas.experiment.Experiment or starlette.responses.Response
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     experiment_controller = ExperimentController(session)
+    etag = experiment_controller.get_experiment_etag(project_id=project_id,
+                                                     experiment_id=experiment_id)
+    not_modified = not_modified_response(request, response, etag, REVALIDATE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     experiment = experiment_controller.get_experiment(experiment_id=experiment_id,
                                                       project_id=project_id)
     return experiment
@@ -106,9 +115,6 @@ async def handle_patch_experiment(project_id: str,
     -------
     projects.schemas.experiment.Experiment
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     experiment_controller = ExperimentController(session)
     experiment = experiment_controller.update_experiment(experiment_id=experiment_id,
                                                          project_id=project_id,
@@ -133,9 +139,6 @@ async def handle_delete_experiment(project_id: str,
     -------
     projects.schemas.message.Message
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
     experiment_controller = ExperimentController(session)
     experiment = experiment_controller.delete_experiment(experiment_id=experiment_id,
                                                          project_id=project_id)
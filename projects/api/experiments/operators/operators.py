@@ -1,21 +1,26 @@
 # -*- coding: utf-8 -*-
 """Operators API Router."""
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 import projects.schemas.operator
-from projects.controllers import ExperimentController, OperatorController, \
-    ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import OperatorController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/experiments/{experiment_id}/operators",
+    dependencies=[Depends(validate_path)],
 )
 
 
 @router.get("", response_model=projects.schemas.operator.OperatorList)
 async def handle_list_operators(project_id: str,
                                 experiment_id: str,
+                                updated_since: Optional[datetime] = Query(None, alias="updatedSince"),
                                 session: Session = Depends(session_scope)):
     """
     Handles GET requests to /.
@@ -24,21 +29,17 @@ async def handle_list_operators(project_id: str,
     ----------
     project_id : str
     experiment_id : str
+    updated_since : datetime.datetime or None
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
     projects.schemas.operator.OperatorList
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     operator_controller = OperatorController(session)
     operators = operator_controller.list_operators(project_id=project_id,
-                                                   experiment_id=experiment_id)
+                                                   experiment_id=experiment_id,
+                                                   updated_since=updated_since)
     return operators
 
 
@@ -61,12 +62,6 @@ async def handle_post_operator(project_id: str,
     -------
     projects.schemas.operator.Operator
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     operator_controller = OperatorController(session)
     operator = operator_controller.create_operator(project_id=project_id,
                                                    experiment_id=experiment_id,
@@ -95,12 +90,6 @@ async def handle_patch_operator(project_id: str,
     -------
     projects.schemas.operator.Operator
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     operator_controller = OperatorController(session)
     operator = operator_controller.update_operator(operator_id=operator_id,
                                                    project_id=project_id,
@@ -127,12 +116,6 @@ async def handle_delete_operator(project_id: str,
     -------
     projects.schemas.message.Message
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     operator_controller = OperatorController(session)
     operator = operator_controller.delete_operator(operator_id=operator_id,
                                                    project_id=project_id,
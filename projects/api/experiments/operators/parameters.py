@@ -4,12 +4,13 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 import projects.schemas.operator
-from projects.controllers import ExperimentController, OperatorController, \
-    OperatorParameterController, ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import OperatorParameterController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/experiments/{experiment_id}/operators/{operator_id}/parameters",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -36,15 +37,6 @@ async def handle_patch_parameter(project_id: str,
     -------
     returns the updated value.
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
-    operator_controller = OperatorController(session)
-    operator_controller.raise_if_operator_does_not_exist(operator_id)
-
     parameter_controller = OperatorParameterController(session)
     operator = parameter_controller.update_parameter(name=name,
                                                      operator_id=operator_id,
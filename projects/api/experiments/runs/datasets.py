@@ -5,13 +5,14 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Header
 from sqlalchemy.orm import Session
 
-from projects.controllers import DatasetController, ExperimentController, \
-    OperatorController, ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import DatasetController
 from projects.controllers.experiments.runs import RunController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/experiments/{experiment_id}/runs/{run_id}/operators/{operator_id}/datasets",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -39,15 +40,6 @@ async def handle_get_dataset(project_id: str,
     -------
     List
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
-    operator_controller = OperatorController(session)
-    operator_controller.raise_if_operator_does_not_exist(operator_id)
-
     run_controller = RunController(session)
     run_controller.raise_if_run_does_not_exist(run_id, experiment_id)
 
@@ -3,13 +3,14 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from projects.controllers import ExperimentController, FigureController, \
-    ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import FigureController
 from projects.controllers.experiments.runs import RunController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/experiments/{experiment_id}/runs/{run_id}/operators/{operator_id}/figures",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -34,12 +35,6 @@ async def handle_list_figures(project_id: str,
     -------
     list
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     run_controller = RunController(session)
     run_controller.raise_if_run_does_not_exist(run_id, experiment_id)
 
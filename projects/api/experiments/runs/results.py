@@ -4,13 +4,14 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from projects.controllers import ExperimentController, ProjectController, \
-    OperatorController, ResultController
+from projects.api.dependencies import validate_path
+from projects.controllers import ResultController
 from projects.controllers.experiments.runs import RunController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/experiments/{experiment_id}/runs/{run_id}",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -34,12 +35,6 @@ async def handle_get_results(project_id: str,
     starlette.responses.StreamingResponse
         ZipFile of the run results
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     run_controller = RunController(session)
     run_controller.raise_if_run_does_not_exist(run_id, experiment_id)
 
@@ -74,15 +69,6 @@ async def handle_get_operator_results(project_id: str,
     starlette.responses.StreamingResponse]
         ZipFile of the operator_results
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
-    operator_controller = OperatorController(session)
-    operator_controller.raise_if_operator_does_not_exist(operator_id)
-
     run_controller = RunController(session)
     run_controller.raise_if_run_does_not_exist(run_id, experiment_id)
 
@@ -1,15 +1,18 @@
 # -*- coding: utf-8 -*-
 """Runs API Router."""
+from typing import Optional
+
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 import projects.schemas.run
-from projects.controllers import ExperimentController, ProjectController
+from projects.api.dependencies import validate_path
 from projects.controllers.experiments.runs import RunController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/experiments/{experiment_id}/runs",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -30,12 +33,6 @@ async def handle_list_runs(project_id: str,
     -------
     projects.schemas.run.RunList
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     run_controller = RunController(session)
     runs = run_controller.list_runs(project_id=project_id,
                                     experiment_id=experiment_id)
@@ -45,6 +42,7 @@ async def handle_list_runs(project_id: str,
 @router.post("", response_model=projects.schemas.run.Run)
 async def handle_post_run(project_id: str,
                           experiment_id: str,
+                          run: Optional[projects.schemas.run.RunCreate] = None,
                           session: Session = Depends(session_scope)):
     """
     Handles POST requests to /.
@@ -53,21 +51,17 @@ async def handle_post_run(project_id: str,
     ----------
     project_id : str
     experiment_id : str
+    run : projects.schemas.run.RunCreate
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
     projects.schemas.run.Run
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     run_controller = RunController(session)
     run = run_controller.create_run(project_id=project_id,
-                                    experiment_id=experiment_id)
+                                    experiment_id=experiment_id,
+                                    run=run)
     return run
 
 
@@ -90,12 +84,6 @@ async def handle_get_run(project_id: str,
     -------
     projects.schemas.run.Run
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     run_controller = RunController(session)
     run = run_controller.get_run(project_id=project_id,
                                  experiment_id=experiment_id,
@@ -122,12 +110,6 @@ async def handle_delete_run(project_id: str,
     -------
     projects.schemas.message.Message
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     run_controller = RunController(session)
     run = run_controller.terminate_run(project_id=project_id,
                                        experiment_id=experiment_id,
@@ -154,12 +136,6 @@ async def handle_post_retry_run(project_id: str,
     -------
     projects.schemas.message.Message
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    experiment_controller = ExperimentController(session)
-    experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
-
     run_controller = RunController(session)
     run = run_controller.retry_run(project_id=project_id,
                                    experiment_id=experiment_id,
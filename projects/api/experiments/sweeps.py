@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Sweeps API Router."""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+import projects.schemas.sweep
+from projects.api.dependencies import validate_path
+from projects.controllers.experiments.sweeps import SweepController
+from projects.database import session_scope
+
+router = APIRouter(
+    prefix="/projects/{project_id}/experiments/{experiment_id}/sweeps",
+    dependencies=[Depends(validate_path)],
+)
+
+
+@router.post("", response_model=projects.schemas.sweep.Sweep)
+async def handle_post_sweep(project_id: str,
+                            experiment_id: str,
+                            sweep: projects.schemas.sweep.SweepCreate,
+                            session: Session = Depends(session_scope)):
+    """
+    Handles POST requests to /.
+
+    Parameters
+    ----------
+    project_id : str
+    experiment_id : str
+    sweep : projects.schemas.sweep.SweepCreate
+    session : sqlalchemy.orm.session.Session
+
+    Returns
+    -------
+    projects.schemas.sweep.Sweep
+    """
+    sweep_controller = SweepController(session)
+    sweep = sweep_controller.create_sweep(project_id=project_id,
+                                          experiment_id=experiment_id,
+                                          sweep=sweep)
+    return sweep
+
+
+@router.get("/{sweep_id}", response_model=projects.schemas.sweep.Sweep)
+async def handle_get_sweep(project_id: str,
+                           experiment_id: str,
+                           sweep_id: str,
+                           session: Session = Depends(session_scope)):
+    """
+    Handles GET requests to /<sweep_id>.
+
+    Parameters
+    ----------
+    project_id : str
+    experiment_id : str
+    sweep_id : str
+    session : sqlalchemy.orm.session.Session
+
+    Returns
+    -------
+    projects.schemas.sweep.Sweep
+    """
+    sweep_controller = SweepController(session)
+    sweep = sweep_controller.get_sweep(project_id=project_id,
+                                       experiment_id=experiment_id,
+                                       sweep_id=sweep_id)
+    return sweep
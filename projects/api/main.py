@@ -10,16 +10,16 @@ from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from projects import __version__
 from projects.api import comparisons, deployments, experiments, monitorings, \
     predictions, projects, tasks, templates
-from projects.api.deployments import operators as deployment_operators, \
-    runs as deployment_runs, responses
+from projects.api.deployments import events as deployment_events, \
+    operators as deployment_operators, runs as deployment_runs, responses
 from projects.api.deployments.runs import logs as deployment_logs
-from projects.api.experiments import operators as experiment_operators, \
-    runs as experiment_runs
+from projects.api.experiments import events as experiment_events, \
+    operators as experiment_operators, runs as experiment_runs, sweeps
 from projects.api.experiments.runs import datasets, figures, \
     logs as experiment_logs, metrics, results
 from projects.api.experiments.operators import parameters as operator_parameters
 from projects.api.tasks import parameters
-from projects.database import engine, init_db
+from projects.database import REPLICAS, engine, init_db
 from projects.exceptions import BadRequest, Forbidden, NotFound, \
     InternalServerError
 from projects.api.monitorings import figures as monitoring_figures
@@ -40,11 +40,14 @@ app.include_router(figures.router)
 app.include_router(experiment_logs.router)
 app.include_router(metrics.router)
 app.include_router(results.router)
+app.include_router(sweeps.router)
+app.include_router(experiment_events.router)
 app.include_router(operator_parameters.router)
 app.include_router(deployments.router)
 app.include_router(deployment_operators.router)
 app.include_router(deployment_runs.router)
 app.include_router(deployment_logs.router)
+app.include_router(deployment_events.router)
 app.include_router(monitorings.router)
 app.include_router(monitoring_figures.router)
 app.include_router(predictions.router)
@@ -135,5 +138,7 @@ if __name__ == "__main__":
 
     if args.debug:
         engine.echo = True
+        for replica in REPLICAS.engines:
+            replica.echo = True
 
     uvicorn.run(app, port=args.port, debug=args.debug)
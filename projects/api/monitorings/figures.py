@@ -3,12 +3,13 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from projects.controllers import DeploymentController, MonitoringController, \
-    MonitoringFigureController, ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import MonitoringFigureController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/deployments/{deployment_id}/monitorings/{monitoring_id}/figures",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -31,15 +32,6 @@ async def handle_list_figures_monitorings(project_id: str,
     -------
     list
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
-    monitoring_controller = MonitoringController(session)
-    monitoring_controller.raise_if_monitoring_does_not_exist(monitoring_id)
-
     monitoring_figure_controller = MonitoringFigureController(session)
     figures_monitoring = monitoring_figure_controller.list_figures(project_id=project_id,
                                                                    deployment_id=deployment_id,
@@ -4,12 +4,13 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 import projects.schemas.monitoring
-from projects.controllers import DeploymentController, MonitoringController, \
-    ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import MonitoringController
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/deployments/{deployment_id}/monitorings",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -30,12 +31,6 @@ async def handle_list_monitorings(project_id: str,
     -------
     projects.schemas.monitoring.MonitoringList
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     monitoring_controller = MonitoringController(session)
     monitorings = monitoring_controller.list_monitorings(project_id=project_id,
                                                          deployment_id=deployment_id)
@@ -61,12 +56,6 @@ async def handle_post_monitorings(project_id: str,
     -------
     projects.schemas.monitoring.Monitoring
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     monitoring_controller = MonitoringController(session)
     monitoring = monitoring_controller.create_monitoring(project_id=project_id,
                                                          deployment_id=deployment_id,
@@ -93,12 +82,6 @@ async def handle_delete_monitorings(project_id: str,
     -------
     projects.schemas.message.Message
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     monitoring_controller = MonitoringController(session)
     response = monitoring_controller.delete_monitoring(uuid=monitoring_id,
                                                        project_id=project_id,
@@ -6,13 +6,14 @@ from typing import Optional
 from fastapi import APIRouter, Depends, File, Request, UploadFile
 from sqlalchemy.orm import Session
 
-from projects.controllers import DeploymentController, PredictionController, \
-    ProjectController
+from projects.api.dependencies import validate_path
+from projects.controllers import PredictionController
 from projects.exceptions import BadRequest
 from projects.database import session_scope
 
 router = APIRouter(
     prefix="/projects/{project_id}/deployments/{deployment_id}/predictions",
+    dependencies=[Depends(validate_path)],
 )
 
 
@@ -37,12 +38,6 @@ async def handle_post_prediction(project_id: str,
     -------
     dict
     """
-    project_controller = ProjectController(session)
-    project_controller.raise_if_project_does_not_exist(project_id)
-
-    deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
-
     # at this endpoint, we can accept both form-data and json as the request content-type
     kwargs = {}
     if file is not None:
@@ -1,21 +1,22 @@
 # -*- coding: utf-8 -*-
 """Projects API Router."""
-from typing import List
+from typing import List, Union
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
 import projects.schemas.project
 from projects.controllers import ProjectController
 from projects.database import session_scope
-from projects.utils import format_query_params
+from projects.utils import REVALIDATE_CACHE_CONTROL, format_query_params, not_modified_response
 
 router = APIRouter(
     prefix="/projects",
 )
 
 
-@router.get("", response_model=projects.schemas.project.ProjectList)
+@router.get("", response_model=Union[projects.schemas.project.ProjectList,
+                                     projects.schemas.project.ProjectSummaryList])
 async def handle_list_projects(request: Request,
                                session: Session = Depends(session_scope)):
     """
@@ -28,7 +29,7 @@ async def handle_list_projects(request: Request,
 
     Returns
     -------
-    projects.schemas.project.ProjectList
+    projects.schemas.project.ProjectList or projects.schemas.project.ProjectSummaryList
     """
     filters = format_query_params(str(request.query_params))
 
@@ -40,10 +41,21 @@ async def handle_list_projects(request: Request,
     page_size = filters.pop("page_size", None)
     page_size = int(page_size) if page_size else 10
 
+    view = filters.pop("view", None) or "full"
+
+    cursor = filters.pop("cursor", None)
+    with_total = filters.pop("withTotal", "true").lower() not in ["false", "0"]
+
+    q = filters.pop("q", None)
+
     project_controller = ProjectController(session)
     projects = project_controller.list_projects(page=page,
                                                 page_size=page_size,
                                                 order_by=order_by,
+                                                view=view,
+                                                cursor=cursor,
+                                                with_total=with_total,
+                                                q=q,
                                                 **filters)
     return projects
 
@@ -70,6 +82,8 @@ async def handle_post_projects(project: projects.schemas.project.ProjectCreate,
 
 @router.get("/{project_id}", response_model=projects.schemas.project.Project)
 async def handle_get_project(project_id: str,
+                             request: Request,
+                             response: Response,
                              session: Session = Depends(session_scope)):
     """
     Handles GET requests to /<project_id>.
@@ -77,13 +91,20 @@ async def handle_get_project(project_id: str,
     Parameters
     ----------
     project_id : str
+    request : fastapi.Request
+    response : fastapi.Response
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
-    projects.schemas.project.Project
+    projects.schemas.project.Project or starlette.responses.Response
     """
     project_controller = ProjectController(session)
+    etag = project_controller.get_project_etag(project_id=project_id)
+    not_modified = not_modified_response(request, response, etag, REVALIDATE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     project = project_controller.get_project(project_id=project_id)
     return project
 
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 """Tasks API Router."""
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Request
+from typing import Union
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response
 from sqlalchemy.orm import Session
 
 import projects.schemas.message
@@ -9,7 +11,7 @@ import projects.schemas.task
 from projects.controllers import TaskController
 from projects.database import session_scope
 from projects.schemas.mailing import EmailSchema
-from projects.utils import format_query_params
+from projects.utils import CATALOGUE_CACHE_CONTROL, format_query_params, not_modified_response
 
 router = APIRouter(
     prefix="/tasks",
@@ -18,8 +20,10 @@ router = APIRouter(
 ATTACHMENT_FILE_NAME = 'taskfiles.zip'
 
 
-@router.get("", response_model=projects.schemas.task.TaskList)
+@router.get("", response_model=Union[projects.schemas.task.TaskList,
+                                     projects.schemas.task.TaskSummaryList])
 async def handle_list_tasks(request: Request,
+                            response: Response,
                             session: Session = Depends(session_scope)):
     """
     Handles GET requests to /.
@@ -27,13 +31,19 @@ async def handle_list_tasks(request: Request,
     Parameters
     ----------
     request : fastapi.Request
+    response : fastapi.Response
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
-    projects.schemas.task.TaskList
+    projects.schemas.task.TaskList or projects.schemas.task.TaskSummaryList or starlette.responses.Response
     """
     task_controller = TaskController(session)
+    etag = task_controller.get_tasks_etag()
+    not_modified = not_modified_response(request, response, etag, CATALOGUE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     filters = format_query_params(str(request.query_params))
     order_by = filters.pop("order", None)
     page = filters.pop("page", None)
@@ -42,9 +52,17 @@ async def handle_list_tasks(request: Request,
     page_size = filters.pop("page_size", None)
     if page_size:
         page_size = int(page_size)
+    view = filters.pop("view", None) or "full"
+    cursor = filters.pop("cursor", None)
+    with_total = filters.pop("withTotal", "true").lower() not in ["false", "0"]
+    q = filters.pop("q", None)
     tasks = task_controller.list_tasks(page=page,
                                        page_size=page_size,
                                        order_by=order_by,
+                                       view=view,
+                                       cursor=cursor,
+                                       with_total=with_total,
+                                       q=q,
                                        **filters)
     return tasks
 
@@ -73,6 +91,8 @@ async def handle_post_tasks(task: projects.schemas.task.TaskCreate,
 
 @router.get("/{task_id}", response_model=projects.schemas.task.Task)
 async def handle_get_task(task_id: str,
+                          request: Request,
+                          response: Response,
                           session: Session = Depends(session_scope)):
     """
     Handles GET requests to /<task_id>.
@@ -80,13 +100,20 @@ async def handle_get_task(task_id: str,
     Parameters
     ----------
     task_id : str
+    request : fastapi.Request
+    response : fastapi.Response
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
-    projects.schemas.task.Task
+    projects.schemas.task.Task or starlette.responses.Response
     """
     task_controller = TaskController(session)
+    etag = task_controller.get_task_etag(task_id=task_id)
+    not_modified = not_modified_response(request, response, etag, CATALOGUE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     task = task_controller.get_task(task_id=task_id)
     return task
 
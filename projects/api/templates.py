@@ -2,12 +2,13 @@
 """Templates API Router."""
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
 import projects.schemas.template
 from projects.controllers import TemplateController
 from projects.database import session_scope
+from projects.utils import CATALOGUE_CACHE_CONTROL, not_modified_response
 
 router = APIRouter(
     prefix="/templates",
@@ -15,19 +16,28 @@ router = APIRouter(
 
 
 @router.get("", response_model=projects.schemas.template.TemplateList)
-async def handle_list_templates(session: Session = Depends(session_scope)):
+async def handle_list_templates(request: Request,
+                                response: Response,
+                                session: Session = Depends(session_scope)):
     """
     Handles GET requests to /.
 
     Parameters
     ----------
+    request : fastapi.Request
+    response : fastapi.Response
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
-    projects.schemas.template.TemplateList
+    projects.schemas.template.TemplateList or starlette.responses.Response
     """
     template_controller = TemplateController(session)
+    etag = template_controller.get_templates_etag()
+    not_modified = not_modified_response(request, response, etag, CATALOGUE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     templates = template_controller.list_templates()
     return templates
 
@@ -54,6 +64,8 @@ async def handle_post_templates(template: projects.schemas.template.TemplateCrea
 
 @router.get("/{template_id}", response_model=projects.schemas.template.Template)
 async def handle_get_template(template_id: str,
+                              request: Request,
+                              response: Response,
                               session: Session = Depends(session_scope)):
     """
     Handles GET requests to /<template_id>.
@@ -61,13 +73,20 @@ async def handle_get_template(template_id: str,
     Parameters
     ----------
     template_id : str
+    request : fastapi.Request
+    response : fastapi.Response
     session : sqlalchemy.orm.session.Session
 
     Returns
     -------
-    projects.schemas.template.Template
+    projects.schemas.template.Template or starlette.responses.Response
     """
     template_controller = TemplateController(session)
+    etag = template_controller.get_template_etag(template_id=template_id)
+    not_modified = not_modified_response(request, response, etag, CATALOGUE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     template = template_controller.get_template(template_id=template_id)
     return template
 
@@ -12,6 +12,7 @@ from projects.controllers.monitorings import MonitoringController
 from projects.controllers.operators import OperatorController
 from projects.controllers.operators.parameters import OperatorParameterController
 from projects.controllers.tasks.parameters import ParameterController
+from projects.controllers.paths import PathController
 from projects.controllers.projects import ProjectController
 from projects.controllers.predictions import PredictionController
 from projects.controllers.tasks.tasks import TaskController
@@ -31,6 +32,7 @@ __all__ = [
     'OperatorController',
     'OperatorParameterController',
     'ParameterController',
+    'PathController',
     'ProjectController',
     'PredictionController',
     'ResponseController',
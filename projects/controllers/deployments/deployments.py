@@ -2,12 +2,17 @@
 """Deployments controller."""
 import sys
 from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import lazyload, selectinload
 
 from projects import models, schemas
 from projects.controllers.experiments import ExperimentController
 from projects.controllers.operators import OperatorController
 from projects.controllers.templates import TemplateController
-from projects.controllers.utils import uuid_alpha
+from projects.controllers.utils import raise_if_view_is_invalid, updated_since_cutoff, \
+    uuid_alpha
 from projects.exceptions import BadRequest, NotFound
 
 NOT_FOUND = NotFound("The specified deployment does not exist")
@@ -40,24 +45,64 @@ class DeploymentController:
         if not exists:
             raise NOT_FOUND
 
-    def list_deployments(self, project_id: str):
+    def list_deployments(self,
+                         project_id: str,
+                         updated_since: Optional[datetime] = None,
+                         view: Optional[str] = "full"):
         """
         Lists all deployments under a project.
 
         Parameters
         ----------
         project_id: str
+        updated_since : datetime.datetime or None
+            If given, lists only the deployments that were updated since then,
+            or whose operators were.
+        view : str
+            "summary" lists the deployments without their operators.
 
         Returns
         -------
-        projects.schemas.deployment.DeploymentList
+        projects.schemas.deployment.DeploymentList or projects.schemas.deployment.DeploymentSummaryList
+
+        Raises
+        ------
+        BadRequest
+            When view is invalid.
         """
+        raise_if_view_is_invalid(view)
+
+        if updated_since is not None:
+            # a replica may lag more than UPDATED_SINCE_MARGIN, and a delta would miss its pending updates
+            self.session.use_primary()
+
+        # read before the query, so that the next delta includes concurrent updates
+        server_time = datetime.utcnow()
+
+        if view == "summary":
+            options = [lazyload("*")]
+        else:
+            options = [selectinload(models.Deployment.operators).selectinload(models.Operator.task)]
+
         deployments = self.session.query(models.Deployment) \
-            .filter_by(project_id=project_id) \
+            .options(*options) \
+            .filter_by(project_id=project_id)
+
+        if updated_since is not None:
+            cutoff = updated_since_cutoff(updated_since)
+            updated_operators = self.session.query(models.Operator.uuid) \
+                .filter(models.Operator.deployment_id == models.Deployment.uuid) \
+                .filter(models.Operator.updated_at >= cutoff)
+            deployments = deployments.filter(or_(models.Deployment.updated_at >= cutoff,
+                                                 updated_operators.exists()))
+
+        deployments = deployments \
             .order_by(models.Deployment.position.asc()) \
             .all()
 
-        return schemas.DeploymentList.from_orm(deployments, len(deployments))
+        if view == "summary":
+            return schemas.DeploymentSummaryList.from_orm(deployments, len(deployments), server_time)
+        return schemas.DeploymentList.from_orm(deployments, len(deployments), server_time)
 
     def create_deployment(self, deployment: schemas.DeploymentCreate, project_id: str):
         """
@@ -136,7 +181,9 @@ class DeploymentController:
         NotFound
             When deployment_id does not exist.
         """
-        deployment = self.session.query(models.Deployment).get(deployment_id)
+        deployment = self.session.query(models.Deployment) \
+            .options(selectinload(models.Deployment.operators).selectinload(models.Operator.task)) \
+            .get(deployment_id)
         if deployment is None:
             raise NOT_FOUND
 
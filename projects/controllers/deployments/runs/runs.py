@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 """Deployments Runs controller."""
+from datetime import datetime
+
 from kubernetes import client
 from kubernetes.client.rest import ApiException
 
@@ -117,10 +119,10 @@ class RunController:
         url = get_seldon_deployment_url(deployment_id)
         self.session.query(models.Deployment) \
             .filter_by(uuid=deployment_id) \
-            .update({"url": url})
+            .update({"url": url, "updated_at": datetime.utcnow()})
         self.session.query(models.Operator) \
             .filter_by(deployment_id=deployment_id) \
-            .update({"status": "Pending"})
+            .update({"status": "Pending", "updated_at": datetime.utcnow()})
         self.session.commit()
 
         run["deploymentId"] = deployment_id
@@ -4,9 +4,12 @@ import sys
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import select
+from sqlalchemy.orm import lazyload, selectinload
+
 from projects import models, schemas
 from projects.controllers.operators import OperatorController
-from projects.controllers.utils import uuid_alpha
+from projects.controllers.utils import make_etag, raise_if_view_is_invalid, uuid_alpha, versions_of
 from projects.exceptions import BadRequest, NotFound
 
 
@@ -37,28 +40,40 @@ class ExperimentController:
         if not exists:
             raise NotFound("The specified experiment does not exist")
 
-    def list_experiments(self, project_id: str):
+    def list_experiments(self, project_id: str, view: Optional[str] = "full"):
         """
         Lists all experiments under a project.
 
         Parameters
         ----------
         project_id: str
+        view : str
+            "summary" lists the experiments without their operators.
 
         Returns
         -------
-        projects.schemas.experiment.ExperimentList
+        projects.schemas.experiment.ExperimentList or projects.schemas.experiment.ExperimentSummaryList
 
         Raises
         ------
-        NotFound
-            When project_id does not exist.
+        BadRequest
+            When view is invalid.
         """
+        raise_if_view_is_invalid(view)
+
+        if view == "summary":
+            options = [lazyload("*")]
+        else:
+            options = [selectinload(models.Experiment.operators).selectinload(models.Operator.task)]
+
         experiments = self.session.query(models.Experiment) \
+            .options(*options) \
             .filter_by(project_id=project_id) \
             .order_by(models.Experiment.position.asc()) \
             .all()
 
+        if view == "summary":
+            return schemas.ExperimentSummaryList.from_orm(experiments, len(experiments))
         return schemas.ExperimentList.from_orm(experiments, len(experiments))
 
     def create_experiment(self, experiment: schemas.ExperimentCreate, project_id: str):
@@ -109,6 +124,36 @@ class ExperimentController:
 
         return schemas.Experiment.from_orm(experiment)
 
+    def get_experiment_etag(self, project_id: str, experiment_id: str):
+        """
+        Builds the ETag of an experiment from the versions of the experiment,
+        its operators and their tasks, in one query.
+
+        Parameters
+        ----------
+        project_id : str
+        experiment_id : str
+
+        Returns
+        -------
+        str or None
+            None when the experiment does not exist, or was just updated.
+        """
+        task_ids = select([models.Operator.task_id]).where(models.Operator.experiment_id == experiment_id)
+
+        versions = self.session.query(
+            select([models.Experiment.updated_at])
+            .where(models.Experiment.uuid == experiment_id)
+            .where(models.Experiment.project_id == project_id)
+            .as_scalar(),
+            *versions_of(models.Operator, models.Operator.experiment_id == experiment_id),
+            *versions_of(models.Task, models.Task.uuid.in_(task_ids)),
+        ).one()
+
+        if versions[0] is None:
+            return None
+        return make_etag(*versions)
+
     def get_experiment(self, project_id: str, experiment_id: str):
         """
         Details an experiment from our database.
@@ -127,7 +172,9 @@ class ExperimentController:
         NotFound
             When experiment_id does not exist.
         """
-        experiment = self.session.query(models.Experiment).get(experiment_id)
+        experiment = self.session.query(models.Experiment) \
+            .options(selectinload(models.Experiment.operators).selectinload(models.Operator.task)) \
+            .get(experiment_id)
 
         if experiment is None:
             raise NOT_FOUND
@@ -212,6 +259,16 @@ class ExperimentController:
             .filter(models.Comparison.experiment_id == experiment_id) \
             .delete()
 
+        # remove queued runs
+        self.session.query(models.QueuedRun) \
+            .filter(models.QueuedRun.experiment_id == experiment_id) \
+            .delete()
+
+        # remove sweeps
+        self.session.query(models.Sweep) \
+            .filter(models.Sweep.experiment_id == experiment_id) \
+            .delete()
+
         # remove experiment operators
         self.session.query(models.Operator) \
             .filter(models.Operator.experiment_id == experiment_id) \
@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 """Experiments Runs controller."""
+from typing import Optional
+
 from kfp_server_api.rest import ApiException
 
 from projects import models, schemas
-from projects.exceptions import NotFound
+from projects.controllers.experiments.runs.scheduler import SchedulerController
+from projects.exceptions import BadRequest, NotFound
 from projects.kfp import runs as kfp_runs
+from projects.kfp.artifacts import is_object_storage_mode
 
 NOT_FOUND = NotFound("The specified run does not exist")
 
@@ -12,6 +16,7 @@ NOT_FOUND = NotFound("The specified run does not exist")
 class RunController:
     def __init__(self, session):
         self.session = session
+        self.scheduler_controller = SchedulerController(session)
 
     def raise_if_run_does_not_exist(self, run_id: str, experiment_id: str):
         """
@@ -34,7 +39,7 @@ class RunController:
 
     def list_runs(self, project_id: str, experiment_id: str):
         """
-        Lists all runs from an experiment.
+        Lists all runs from an experiment, starting with queued runs.
 
         Parameters
         ----------
@@ -51,45 +56,79 @@ class RunController:
         NotFound
             When experiment_id does not exist.
         """
-        runs = kfp_runs.list_runs(experiment_id=experiment_id)
+        queued_runs = self.session.query(models.QueuedRun) \
+            .filter_by(experiment_id=experiment_id, status="Queued") \
+            .order_by(models.QueuedRun.created_at.desc()) \
+            .all()
+
+        runs = [self.scheduler_controller.to_run(queued_run) for queued_run in queued_runs]
+        runs.extend(kfp_runs.list_runs(experiment_id=experiment_id))
         return schemas.RunList.from_orm(runs, len(runs))
 
-    def create_run(self, project_id: str, experiment_id: str):
+    def create_run(self, project_id: str, experiment_id: str, run: Optional[schemas.RunCreate] = None):
         """
-        Starts a new run in Kubeflow Pipelines.
+        Starts a new run in Kubeflow Pipelines. When the concurrency limits
+        of the cluster or project are reached, the run is queued instead
+        (see projects.controllers.experiments.runs.scheduler).
 
         Parameters
         ----------
         project_id : str
         experiment_id : str
+        run : projects.schemas.run.RunCreate or None
+            If startFrom or only is set, runs only part of the pipeline,
+            and reuses the outputs of the other operators from the latest run.
+            Queued runs with higher priority are started first.
 
         Returns
         -------
         dict
-            The run attributes.
+            The run attributes. A queued run has a queuePosition, and
+            its uuid is replaced by the KFP run id once it starts.
 
         Raises
         ------
         NotFound
             When experiment_id does not exist.
+        BadRequest
+            When startFrom or only are invalid, or an operator upstream of
+            them did not succeed in the latest run.
         """
         experiment = self.session.query(models.Experiment).get(experiment_id)
 
         if experiment is None:
             raise NotFound("The specified experiment does not exist")
 
-        run = kfp_runs.start_run(project_id=project_id,
-                                 experiment_id=experiment_id,
-                                 operators=experiment.operators)
-        run["experimentId"] = experiment_id
-
-        update_data = {"status": "Pending", "status_message": None}
-        self.session.query(models.Operator) \
-            .filter_by(experiment_id=experiment_id) \
-            .update(update_data)
-        self.session.commit()
-
-        return schemas.Run.from_orm(run)
+        start_from = run.start_from if run is not None else None
+        only = (run.only or None) if run is not None else None
+        priority = (run.priority or 0) if run is not None else 0
+
+        if start_from is not None and only is not None:
+            raise BadRequest("Only one of startFrom and only can be set")
+
+        operator_ids = {operator.uuid for operator in experiment.operators}
+        for operator_id in ([start_from] if start_from else []) + (only or []):
+            if operator_id not in operator_ids:
+                raise BadRequest("The specified operator does not exist")
+
+        # validated now, as a queued run may only start later
+        if start_from is not None or only is not None:
+            if is_object_storage_mode():
+                raise BadRequest("Partial runs require the volume data passing mode")
+            kfp_runs.raise_if_partial_run_is_invalid(operators=experiment.operators,
+                                                     experiment_id=experiment_id,
+                                                     start_from=start_from,
+                                                     only=only)
+
+        queued_run = self.scheduler_controller.submit_run(project_id=project_id,
+                                                          experiment_id=experiment_id,
+                                                          start_from=start_from,
+                                                          only=only,
+                                                          priority=priority)
+
+        return self.get_run(project_id=project_id,
+                            experiment_id=experiment_id,
+                            run_id=queued_run.uuid)
 
     def get_run(self, project_id: str, experiment_id: str, run_id: str):
         """
@@ -100,6 +139,7 @@ class RunController:
         project_id : str
         experiment_id : str
         run_id : str
+            A KFP run id, or the id of a queued run.
 
         Returns
         -------
@@ -111,6 +151,15 @@ class RunController:
         NotFound
             When any of project_id, experiment_id, or run_id does not exist.
         """
+        queued_run = self.session.query(models.QueuedRun) \
+            .filter_by(uuid=run_id, experiment_id=experiment_id) \
+            .first()
+
+        if queued_run is not None:
+            if queued_run.run_id is None:
+                return schemas.Run.from_orm(self.scheduler_controller.to_run(queued_run))
+            run_id = queued_run.run_id
+
         try:
             run = kfp_runs.get_run(experiment_id=experiment_id,
                                    run_id=run_id)
@@ -139,6 +188,15 @@ class RunController:
         NotFound
             When any of project_id, experiment_id, or run_id does not exist.
         """
+        queued_run = self.session.query(models.QueuedRun) \
+            .filter_by(uuid=run_id, experiment_id=experiment_id) \
+            .first()
+
+        if queued_run is not None:
+            if self.scheduler_controller.cancel_run(queued_run):
+                return {"message": "Run terminated"}
+            run_id = queued_run.run_id or run_id
+
         try:
             run = kfp_runs.terminate_run(experiment_id=experiment_id,
                                          run_id=run_id)
@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+"""
+Experiments Runs scheduler.
+
+Runs, including the runs of sweeps, are not submitted to Kubeflow Pipelines
+directly: they are queued in the database, and dispatched by priority (then
+FIFO) while the number of running runs is below RUN_MAX_CONCURRENT (whole
+cluster) and RUN_MAX_CONCURRENT_PER_PROJECT. A limit of 0 means unlimited.
+
+The persistence agent releases the slot of a run once its workflow finishes,
+and dispatches the runs that were waiting for it. As API processes and the
+agent dispatch runs concurrently, the limits are checked while a lock row
+is held, so that their claims are counted one after another.
+"""
+import warnings
+from datetime import datetime
+from os import getenv
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+
+from projects import models
+from projects.controllers.utils import uuid_alpha
+from projects.exceptions import BadRequest
+from projects.kfp import runs as kfp_runs, sweeps as kfp_sweeps
+
+RUN_MAX_CONCURRENT = int(getenv("RUN_MAX_CONCURRENT", "0"))
+RUN_MAX_CONCURRENT_PER_PROJECT = int(getenv("RUN_MAX_CONCURRENT_PER_PROJECT", "0"))
+
+# The name of the lock row held while a run is claimed
+RUNS_LOCK = "runs"
+
+
+class SchedulerController:
+    def __init__(self, session):
+        self.session = session
+
+    def submit_run(self, project_id: str, experiment_id: str, start_from=None, only=None, priority=0):
+        """
+        Queues a run and dispatches the runs that fit in the concurrency limits.
+
+        Parameters
+        ----------
+        project_id : str
+        experiment_id : str
+        start_from : str or None
+        only : list or None
+        priority : int
+            Runs with higher priority are dispatched first.
+
+        Returns
+        -------
+        projects.models.queued_run.QueuedRun
+
+        Raises
+        ------
+        Exception
+            When the run was dispatched, but could not be submitted.
+        """
+        queued_run = models.QueuedRun(
+            uuid=uuid_alpha(),
+            project_id=project_id,
+            experiment_id=experiment_id,
+            status="Queued",
+            priority=priority,
+            start_from=start_from,
+            only=only,
+        )
+        self.session.add(queued_run)
+        self.session.query(models.Operator) \
+            .filter_by(experiment_id=experiment_id) \
+            .update({"status": "Queued", "status_message": None, "updated_at": datetime.utcnow()})
+        self.session.commit()
+
+        errors = self.dispatch_runs()
+        if queued_run.uuid in errors:
+            raise errors[queued_run.uuid]
+
+        self.session.refresh(queued_run)
+        return queued_run
+
+    def submit_sweep(self, project_id: str, experiment_id: str, sweep_id: str, parameter_sets: list):
+        """
+        Queues a run for each parameter set of a sweep, and dispatches the
+        runs that fit in the concurrency limits. Unlike other runs, the runs
+        of a sweep do not set the status of the experiment operators.
+
+        Parameters
+        ----------
+        project_id : str
+        experiment_id : str
+        sweep_id : str
+        parameter_sets : list
+
+        Returns
+        -------
+        list
+            The ids of the queued runs, in the same order as parameter_sets.
+        """
+        queued_runs = [
+            models.QueuedRun(
+                uuid=uuid_alpha(),
+                project_id=project_id,
+                experiment_id=experiment_id,
+                status="Queued",
+                priority=0,
+                sweep_id=sweep_id,
+                parameters=parameter_set,
+            )
+            for parameter_set in parameter_sets
+        ]
+        queued_run_ids = [queued_run.uuid for queued_run in queued_runs]
+        self.session.add_all(queued_runs)
+        self.session.commit()
+
+        # runs that could not be submitted are reported by the sweep as failed
+        self.dispatch_runs()
+
+        return queued_run_ids
+
+    def dispatch_runs(self):
+        """
+        Submits queued runs to Kubeflow Pipelines, by priority then FIFO,
+        while the concurrency limits allow.
+
+        Returns
+        -------
+        dict
+            The errors of runs that could not be submitted, by queued run id.
+        """
+        errors = {}
+
+        queued_runs = self.session.query(models.QueuedRun) \
+            .filter_by(status="Queued") \
+            .order_by(models.QueuedRun.priority.desc(), models.QueuedRun.created_at) \
+            .all()
+
+        sweep_runs = []
+
+        for queued_run in queued_runs:
+            claimed = self.claim_run(queued_run)
+            if claimed is None:
+                break
+            if not claimed:
+                continue
+
+            if queued_run.sweep_id is not None:
+                # the runs of a sweep are submitted together, once they are claimed
+                sweep_runs.append(queued_run)
+                continue
+
+            try:
+                self.start_run(queued_run)
+            except Exception as e:
+                # a run that can not be submitted must not hold its slot
+                self.fail_run(queued_run, e)
+                errors[queued_run.uuid] = e
+
+        if sweep_runs:
+            errors.update(self.start_sweep_runs(sweep_runs))
+
+        return errors
+
+    def claim_run(self, queued_run):
+        """
+        Marks a queued run as Running, so that concurrent dispatchers start it
+        only once, if the concurrency limits allow.
+
+        Parameters
+        ----------
+        queued_run : projects.models.queued_run.QueuedRun
+
+        Returns
+        -------
+        bool or None
+            Whether the run was claimed. None when RUN_MAX_CONCURRENT is
+            reached, so that no other run can be claimed.
+        """
+        if RUN_MAX_CONCURRENT or RUN_MAX_CONCURRENT_PER_PROJECT:
+            project_id = queued_run.project_id
+            self.lock_runs()
+
+            # the lock is held until the commit, and the runs claimed by
+            # others were committed before they released it
+            running = self.session.query(func.count(models.QueuedRun.uuid)) \
+                .filter_by(status="Running")
+            if RUN_MAX_CONCURRENT and running.scalar() >= RUN_MAX_CONCURRENT:
+                self.session.commit()
+                return None
+            if RUN_MAX_CONCURRENT_PER_PROJECT \
+                    and running.filter_by(project_id=project_id).scalar() >= RUN_MAX_CONCURRENT_PER_PROJECT:
+                self.session.commit()
+                return False
+
+        claimed = self.session.query(models.QueuedRun) \
+            .filter_by(uuid=queued_run.uuid, status="Queued") \
+            .update({"status": "Running", "updated_at": datetime.utcnow()},
+                    synchronize_session=False)
+        self.session.commit()
+        return claimed > 0
+
+    def lock_runs(self):
+        """
+        Starts a transaction that holds the lock row of the runs,
+        which is created by the first dispatcher.
+        """
+        # the runs must be counted by a transaction that starts after the lock is held
+        self.session.commit()
+
+        lock = self.session.query(models.SchedulerLock) \
+            .filter_by(name=RUNS_LOCK) \
+            .with_for_update() \
+            .first()
+        if lock is not None:
+            return
+
+        # the row is inserted without holding a lock, as concurrent
+        # inserts after a locking read of a missing row would deadlock
+        self.session.rollback()
+        try:
+            self.session.add(models.SchedulerLock(name=RUNS_LOCK))
+            self.session.commit()
+        except IntegrityError:
+            self.session.rollback()
+
+        self.session.query(models.SchedulerLock) \
+            .filter_by(name=RUNS_LOCK) \
+            .with_for_update() \
+            .one()
+
+    def start_run(self, queued_run):
+        """
+        Submits a claimed run to Kubeflow Pipelines.
+
+        Parameters
+        ----------
+        queued_run : projects.models.queued_run.QueuedRun
+        """
+        experiment_id = queued_run.experiment_id
+        experiment = self.session.query(models.Experiment).get(experiment_id)
+
+        run = kfp_runs.start_run(project_id=queued_run.project_id,
+                                 experiment_id=experiment_id,
+                                 operators=experiment.operators,
+                                 start_from=queued_run.start_from,
+                                 only=queued_run.only)
+
+        self.session.query(models.QueuedRun) \
+            .filter_by(uuid=queued_run.uuid) \
+            .update({"run_id": run["uuid"], "updated_at": datetime.utcnow()})
+
+        update_data = {"status": "Pending", "status_message": None, "updated_at": datetime.utcnow()}
+        self.session.query(models.Operator) \
+            .filter_by(experiment_id=experiment_id) \
+            .update(update_data)
+
+        # operators whose results were reused from the latest run are not scheduled
+        cached_operator_ids = [
+            operator_id for operator_id, operator in run["operators"].items()
+            if operator["status"] == "Cached"
+        ]
+        if cached_operator_ids:
+            self.session.query(models.Operator) \
+                .filter(models.Operator.uuid.in_(cached_operator_ids)) \
+                .update({"status": "Cached", "updated_at": datetime.utcnow()}, synchronize_session=False)
+        self.session.commit()
+
+    def start_sweep_runs(self, queued_runs):
+        """
+        Submits claimed runs of sweeps to Kubeflow Pipelines,
+        concurrently for the runs of the same sweep.
+
+        Parameters
+        ----------
+        queued_runs : list
+
+        Returns
+        -------
+        dict
+            The errors of runs that could not be submitted, by queued run id.
+        """
+        errors = {}
+
+        sweeps = {}
+        for queued_run in queued_runs:
+            sweeps.setdefault(queued_run.sweep_id, []).append(queued_run)
+
+        for sweep_runs in sweeps.values():
+            project_id = sweep_runs[0].project_id
+            experiment_id = sweep_runs[0].experiment_id
+            experiment = self.session.query(models.Experiment).get(experiment_id)
+
+            try:
+                results = kfp_sweeps.start_sweep(operators=experiment.operators,
+                                                 project_id=project_id,
+                                                 experiment_id=experiment_id,
+                                                 parameter_sets=[queued_run.parameters for queued_run in sweep_runs])
+            except Exception as e:
+                # eg. the pipeline could not be compiled
+                results = [e] * len(sweep_runs)
+
+            failed_runs = []
+            for queued_run, result in zip(sweep_runs, results):
+                if isinstance(result, Exception):
+                    failed_runs.append((queued_run, result))
+                else:
+                    self.session.query(models.QueuedRun) \
+                        .filter_by(uuid=queued_run.uuid) \
+                        .update({"run_id": result, "updated_at": datetime.utcnow()})
+            self.session.commit()
+
+            for queued_run, error in failed_runs:
+                # a run that can not be submitted must not hold its slot
+                self.fail_run(queued_run, error)
+                errors[queued_run.uuid] = error
+
+        return errors
+
+    def fail_run(self, queued_run, error):
+        """
+        Marks a run that could not be submitted, and its operators, as Failed.
+        The operators of a sweep run are left as they are. A run that was
+        invalid when it started (eg. an operator upstream of startFrom did not
+        succeed in the latest run) did not run its operators, so they are
+        only unset, as when the run is cancelled.
+
+        Parameters
+        ----------
+        queued_run : projects.models.queued_run.QueuedRun
+        error : Exception
+        """
+        self.session.rollback()
+
+        status_message = getattr(error, "message", None) or str(error)
+        warnings.warn(f"Failed to start run {queued_run.uuid}: {status_message}")
+
+        self.session.query(models.QueuedRun) \
+            .filter_by(uuid=queued_run.uuid) \
+            .update({"status": "Failed", "status_message": status_message, "updated_at": datetime.utcnow()})
+        if queued_run.sweep_id is None and isinstance(error, BadRequest):
+            self.session.query(models.Operator) \
+                .filter_by(experiment_id=queued_run.experiment_id, status="Queued") \
+                .update({"status": "Unset", "status_message": None, "updated_at": datetime.utcnow()})
+        elif queued_run.sweep_id is None:
+            self.session.query(models.Operator) \
+                .filter_by(experiment_id=queued_run.experiment_id) \
+                .update({"status": "Failed", "status_message": status_message, "updated_at": datetime.utcnow()})
+        self.session.commit()
+
+    def finish_run(self, run_id: str):
+        """
+        Releases the slot of a run whose workflow finished.
+
+        Parameters
+        ----------
+        run_id : str
+
+        Returns
+        -------
+        bool
+            Whether a slot was released.
+        """
+        released = self.session.query(models.QueuedRun) \
+            .filter_by(run_id=run_id, status="Running") \
+            .update({"status": "Finished", "updated_at": datetime.utcnow()})
+        self.session.commit()
+        return released > 0
+
+    def cancel_run(self, queued_run):
+        """
+        Removes a run from the queue.
+
+        Parameters
+        ----------
+        queued_run : projects.models.queued_run.QueuedRun
+
+        Returns
+        -------
+        bool
+            Whether the run was still queued.
+        """
+        cancelled = self.session.query(models.QueuedRun) \
+            .filter_by(uuid=queued_run.uuid, status="Queued") \
+            .update({"status": "Cancelled", "updated_at": datetime.utcnow()})
+        if cancelled and queued_run.sweep_id is None:
+            self.session.query(models.Operator) \
+                .filter_by(experiment_id=queued_run.experiment_id, status="Queued") \
+                .update({"status": "Unset", "status_message": None, "updated_at": datetime.utcnow()})
+        self.session.commit()
+        return cancelled > 0
+
+    def get_queue_position(self, queued_run):
+        """
+        Counts the runs that are dispatched before a queued run.
+
+        Parameters
+        ----------
+        queued_run : projects.models.queued_run.QueuedRun
+
+        Returns
+        -------
+        int
+            The position of the run in the queue, starting at 1.
+        """
+        ahead = self.session.query(func.count(models.QueuedRun.uuid)) \
+            .filter_by(status="Queued") \
+            .filter(or_(
+                models.QueuedRun.priority > queued_run.priority,
+                and_(models.QueuedRun.priority == queued_run.priority,
+                     models.QueuedRun.created_at < queued_run.created_at),
+            )) \
+            .scalar()
+        return ahead + 1
+
+    def to_run(self, queued_run):
+        """
+        Builds the attributes of a run that was not submitted to Kubeflow Pipelines.
+
+        Parameters
+        ----------
+        queued_run : projects.models.queued_run.QueuedRun
+
+        Returns
+        -------
+        dict
+            The run attributes, with the same status for every operator.
+        """
+        operators = self.session.query(models.Operator) \
+            .filter_by(experiment_id=queued_run.experiment_id) \
+            .all()
+
+        queue_position = None
+        if queued_run.status == "Queued":
+            queue_position = self.get_queue_position(queued_run)
+
+        return {
+            "uuid": queued_run.uuid,
+            "operators": {
+                operator.uuid: {
+                    "status": queued_run.status,
+                    "taskId": operator.task_id,
+                    "parameters": operator.parameters,
+                }
+                for operator in operators
+            },
+            "createdAt": queued_run.created_at,
+            "queuePosition": queue_position,
+            "statusMessage": queued_run.status_message,
+        }
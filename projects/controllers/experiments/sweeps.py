@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""Experiments Sweeps controller."""
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+
+import platiagro
+
+from projects import models, schemas
+from projects.controllers.experiments.runs.scheduler import SchedulerController
+from projects.controllers.utils import uuid_alpha
+from projects.exceptions import BadRequest, NotFound
+from projects.kfp import sweeps as kfp_sweeps
+
+NOT_FOUND = NotFound("The specified sweep does not exist")
+
+SWEEP_MAX_RUNS = int(getenv("SWEEP_MAX_RUNS", "64"))
+
+
+class SweepController:
+    def __init__(self, session):
+        self.session = session
+        self.scheduler_controller = SchedulerController(session)
+
+    def create_sweep(self, project_id: str, experiment_id: str, sweep: schemas.SweepCreate):
+        """
+        Queues a run for each parameter set of a sweep. The runs are started
+        like other runs, within the concurrency limits of the scheduler.
+
+        Parameters
+        ----------
+        project_id : str
+        experiment_id : str
+        sweep : projects.schemas.sweep.SweepCreate
+            Either a grid of parameter values by operator id (every combination
+            of values is run), or a list of parameter sets.
+
+        Returns
+        -------
+        projects.schemas.sweep.Sweep
+
+        Raises
+        ------
+        NotFound
+            When experiment_id does not exist.
+        BadRequest
+            When the parameters are invalid.
+        """
+        experiment = self.session.query(models.Experiment).get(experiment_id)
+
+        if experiment is None:
+            raise NotFound("The specified experiment does not exist")
+
+        if len(experiment.operators) == 0:
+            raise BadRequest("Necessary at least one operator")
+
+        if (sweep.parameters is None) == (sweep.parameter_sets is None):
+            raise BadRequest("Exactly one of parameters and parameterSets must be set")
+
+        if sweep.parameters is not None:
+            parameter_sets = self.expand_grid(sweep.parameters)
+        else:
+            parameter_sets = sweep.parameter_sets
+
+        self.raise_if_parameter_sets_are_invalid(parameter_sets, experiment.operators)
+
+        sweep_id = uuid_alpha()
+        queued_run_ids = self.scheduler_controller.submit_sweep(project_id=project_id,
+                                                                experiment_id=experiment_id,
+                                                                sweep_id=sweep_id,
+                                                                parameter_sets=parameter_sets)
+
+        sweep = models.Sweep(
+            uuid=sweep_id,
+            experiment_id=experiment_id,
+            runs=[
+                {"queuedRunId": queued_run_id, "parameters": parameter_set}
+                for queued_run_id, parameter_set in zip(queued_run_ids, parameter_sets)
+            ],
+        )
+        self.session.add(sweep)
+        self.session.commit()
+
+        return self.get_sweep(project_id=project_id,
+                              experiment_id=experiment_id,
+                              sweep_id=sweep.uuid)
+
+    def get_sweep(self, project_id: str, experiment_id: str, sweep_id: str):
+        """
+        Details a sweep: the status and metrics of its runs.
+
+        Parameters
+        ----------
+        project_id : str
+        experiment_id : str
+        sweep_id : str
+
+        Returns
+        -------
+        projects.schemas.sweep.Sweep
+
+        Raises
+        ------
+        NotFound
+            When sweep_id does not exist.
+        """
+        sweep = self.session.query(models.Sweep) \
+            .filter_by(uuid=sweep_id, experiment_id=experiment_id) \
+            .first()
+
+        if sweep is None:
+            raise NOT_FOUND
+
+        operator_ids = [
+            operator_id for (operator_id,) in self.session.query(models.Operator.uuid)
+            .filter_by(experiment_id=experiment_id)
+        ]
+
+        queued_runs = {
+            queued_run.uuid: queued_run
+            for queued_run in self.session.query(models.QueuedRun).filter_by(sweep_id=sweep_id)
+        }
+
+        # the KFP run id, or the queued run of runs that were not started
+        run_ids = []
+        for run in sweep.runs:
+            queued_run = queued_runs.get(run.get("queuedRunId"))
+            if "runId" in run:
+                run_ids.append((run["runId"], None))
+            elif queued_run is not None and queued_run.run_id is not None:
+                run_ids.append((queued_run.run_id, None))
+            else:
+                run_ids.append((run.get("queuedRunId"), queued_run))
+
+        started_run_ids = [run_id for run_id, queued_run in run_ids if queued_run is None]
+        statuses = dict(zip(started_run_ids, kfp_sweeps.get_run_statuses(started_run_ids)))
+        metrics = dict(zip(started_run_ids, self.list_metrics(experiment_id, started_run_ids, operator_ids)))
+
+        runs = []
+        for run, (run_id, queued_run) in zip(sweep.runs, run_ids):
+            if queued_run is None:
+                status = statuses.get(run_id)
+            else:
+                # Queued, Failed (could not be submitted) or Cancelled
+                status = queued_run.status
+            runs.append(schemas.SweepRun(
+                uuid=run_id,
+                parameters=run["parameters"],
+                status=status,
+                metrics=metrics.get(run_id, {}),
+            ))
+
+        statuses = [run.status for run in runs]
+
+        return schemas.Sweep.from_orm(sweep, get_sweep_status(statuses), runs)
+
+    def expand_grid(self, parameters):
+        """
+        Lists every combination of the values of a parameter grid.
+
+        Parameters
+        ----------
+        parameters : dict
+            Lists of values by parameter name, by operator id.
+
+        Returns
+        -------
+        list
+            The parameter sets.
+
+        Raises
+        ------
+        BadRequest
+            When a parameter has no values, or there are too many combinations.
+        """
+        keys = [
+            (operator_id, name)
+            for operator_id, values_by_name in parameters.items()
+            for name in values_by_name
+        ]
+
+        combinations = 1
+        for operator_id, name in keys:
+            if len(parameters[operator_id][name]) == 0:
+                raise BadRequest(f"The parameter {name} must have at least one value")
+            combinations *= len(parameters[operator_id][name])
+
+        if combinations > SWEEP_MAX_RUNS:
+            raise BadRequest(f"A sweep must have at most {SWEEP_MAX_RUNS} runs")
+
+        parameter_sets = []
+        for values in itertools.product(*[parameters[operator_id][name] for operator_id, name in keys]):
+            parameter_set = {operator_id: {} for operator_id in parameters}
+            for (operator_id, name), value in zip(keys, values):
+                parameter_set[operator_id][name] = value
+            parameter_sets.append(parameter_set)
+
+        return parameter_sets
+
+    def raise_if_parameter_sets_are_invalid(self, parameter_sets, operators):
+        """
+        Raises an exception if the parameter sets of a sweep are invalid.
+
+        Parameters
+        ----------
+        parameter_sets : list
+        operators : list
+
+        Raises
+        ------
+        BadRequest
+            When there are no or too many parameter sets, they do not set the
+            same parameters, or an operator or parameter is invalid.
+        """
+        if len(parameter_sets) == 0:
+            raise BadRequest("A sweep must have at least one run")
+
+        if len(parameter_sets) > SWEEP_MAX_RUNS:
+            raise BadRequest(f"A sweep must have at most {SWEEP_MAX_RUNS} runs")
+
+        # every run of a sweep shares a pipeline, whose params are the swept parameters
+        keys = {operator_id: set(parameters) for operator_id, parameters in parameter_sets[0].items()}
+        for parameter_set in parameter_sets:
+            if {operator_id: set(parameters) for operator_id, parameters in parameter_set.items()} != keys:
+                raise BadRequest("All parameter sets must set the same parameters")
+
+        if not any(keys.values()):
+            raise BadRequest("A sweep must set at least one parameter")
+
+        operator_ids = {operator.uuid for operator in operators}
+        for operator_id, names in keys.items():
+            if operator_id not in operator_ids:
+                raise BadRequest("The specified operator does not exist")
+            if "dataset" in names:
+                raise BadRequest("The dataset parameter can not be swept")
+
+    def list_metrics(self, experiment_id, run_ids, operator_ids):
+        """
+        Lists the metrics of the operators of each run.
+
+        Parameters
+        ----------
+        experiment_id : str
+        run_ids : list
+        operator_ids : list
+
+        Returns
+        -------
+        list
+            The metrics by operator id, for each run. Operators without
+            metrics are omitted.
+        """
+        def list_operator_metrics(key):
+            run_id, operator_id = key
+            try:
+                return platiagro.list_metrics(experiment_id=experiment_id,
+                                              operator_id=operator_id,
+                                              run_id=run_id)
+            except FileNotFoundError:
+                return None
+
+        keys = [(run_id, operator_id) for run_id in run_ids for operator_id in operator_ids]
+        with ThreadPoolExecutor(max_workers=kfp_sweeps.SWEEP_MAX_WORKERS) as executor:
+            results = dict(zip(keys, executor.map(list_operator_metrics, keys)))
+
+        return [
+            {
+                operator_id: results[(run_id, operator_id)]
+                for operator_id in operator_ids
+                if results[(run_id, operator_id)] is not None
+            }
+            for run_id in run_ids
+        ]
+
+
+def get_sweep_status(statuses):
+    """
+    Aggregates the status of the runs of a sweep.
+
+    Parameters
+    ----------
+    statuses : list
+
+    Returns
+    -------
+    str
+        "Running" while any run is not finished, "Succeeded" when all runs
+        succeeded, and "Failed" otherwise.
+    """
+    if any(status in {None, "Queued", "Pending", "Running"} for status in statuses):
+        return "Running"
+    if all(status == "Succeeded" for status in statuses):
+        return "Succeeded"
+    return "Failed"
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Logs archive.
+
+Logs of finished runs are kept in the object storage, as workflows and pods
+are deleted by a "Garbage Collector" after 1 day.
+
+Each operator has a data object with its messages and an index object:
+
+    logs/{run_id}/{operator_id}/logs.gz
+    logs/{run_id}/{operator_id}/index.json
+
+The data object is a sequence of gzip members (blocks). Each block holds up
+to LOG_ARCHIVE_BLOCK_SIZE messages as JSON lines of [level, message, createdAt].
+The index holds the byte range, levels, first and last dates of each block,
+so that a query only reads the blocks it needs.
+
+Once a run finishes, the indexes of its operators are gathered in:
+
+    logs/{run_id}/index.json
+
+The run index also lists the pods whose logs could not be archived, so that
+their logs are still read from the pods while they exist.
+"""
+import datetime
+import gzip
+import json
+from os import getenv
+from os.path import join
+
+import dateutil.parser
+from minio.error import NoSuchKey
+
+from projects.object_storage import get_object, get_partial_object, put_object
+
+PREFIX = "logs"
+LOG_ARCHIVE_BLOCK_SIZE = int(getenv("LOG_ARCHIVE_BLOCK_SIZE", "1000"))
+
+
+def save_operator_logs(run_id, operator_id, title, records, cursor_key=None, last_time=None):
+    """
+    Saves the logs of an operator.
+
+    Parameters
+    ----------
+    run_id : str
+    operator_id : str
+    title : str
+    records : list
+        Log records sorted by creation date ASC.
+    cursor_key : str or None
+        The "pod/container" key of these logs in a list_logs cursor.
+    last_time : str or None
+        The kubelet timestamp of the last line.
+
+    Returns
+    -------
+    dict
+        The operator index.
+    """
+    data = bytearray()
+    blocks = []
+
+    for start in range(0, len(records), LOG_ARCHIVE_BLOCK_SIZE):
+        block = records[start:start + LOG_ARCHIVE_BLOCK_SIZE]
+        lines = "".join(
+            json.dumps([r.level, r.message, format_datetime(r.created_at)]) + "\n"
+            for r in block
+        )
+        compressed = gzip.compress(lines.encode())
+
+        dates = [to_utc(r.created_at) for r in block if r.created_at is not None]
+        blocks.append({
+            "offset": len(data),
+            "length": len(compressed),
+            "line": start,
+            "count": len(block),
+            "levels": sorted({r.level for r in block}),
+            "start": format_datetime(min(dates)) if dates else None,
+            "end": format_datetime(max(dates)) if dates else None,
+        })
+        data.extend(compressed)
+
+    index = {
+        "operatorId": operator_id,
+        "title": title,
+        "object": join(PREFIX, run_id, operator_id, "logs.gz"),
+        "cursorKey": cursor_key,
+        "lastTime": last_time,
+        "total": len(records),
+        "blocks": blocks,
+    }
+
+    put_object(index["object"], bytes(data), content_type="application/gzip")
+    put_object(
+        join(PREFIX, run_id, operator_id, "index.json"),
+        json.dumps(index).encode(),
+        content_type="application/json",
+    )
+
+    return index
+
+
+def save_run_index(run_id, operator_indexes, missing_pods=None):
+    """
+    Saves the index of a finished run, which marks it as archived.
+
+    Parameters
+    ----------
+    run_id : str
+    operator_indexes : list
+    missing_pods : list or None
+        The names of the pods whose logs were not archived.
+    """
+    index = {
+        "runId": run_id,
+        "operators": operator_indexes,
+        "missingPods": missing_pods or [],
+    }
+    put_object(
+        join(PREFIX, run_id, "index.json"),
+        json.dumps(index).encode(),
+        content_type="application/json",
+    )
+
+
+def load_operator_index(run_id, operator_id):
+    """
+    Loads the index of an operator.
+
+    Parameters
+    ----------
+    run_id : str
+    operator_id : str
+
+    Returns
+    -------
+    dict or None
+        None if the operator logs were not archived.
+    """
+    return load_json(join(PREFIX, run_id, operator_id, "index.json"))
+
+
+def load_run_index(run_id):
+    """
+    Loads the index of a run.
+
+    Parameters
+    ----------
+    run_id : str
+
+    Returns
+    -------
+    dict or None
+        None if the run was not archived.
+    """
+    if run_id is None:
+        return None
+    return load_json(join(PREFIX, run_id, "index.json"))
+
+
+def load_operator_logs(operator_index, levels=None, start=None, end=None, pattern=None, limit=None):
+    """
+    Loads the logs of an operator. Only the blocks that may have matching
+    logs are read from the object storage.
+
+    Parameters
+    ----------
+    operator_index : dict
+    levels : set or None
+        If set, returns only logs of these levels.
+    start : datetime.datetime or None
+        If set, returns only logs created at or after this date.
+    end : datetime.datetime or None
+        If set, returns only logs created at or before this date.
+    pattern : re.Pattern or None
+        If set, returns only logs whose message matches this pattern.
+    limit : int or None
+        If set, blocks are read from the newest one, and reading stops once
+        the newest `limit` matching logs were found.
+
+    Returns
+    -------
+    list
+        Tuples of (level, title, message, created_at) sorted by creation date ASC.
+    """
+    blocks = [
+        block for block in operator_index["blocks"]
+        if block_matches(block, levels, start, end)
+    ]
+
+    if limit is None:
+        return [
+            log
+            for offset, length in coalesce_ranges(blocks)
+            for log in read_logs(operator_index, offset, length, levels, start, end, pattern)
+        ]
+
+    chunks = []
+    found = 0
+    for block in reversed(blocks):
+        if found >= limit:
+            break
+        chunk = read_logs(operator_index, block["offset"], block["length"], levels, start, end, pattern)
+        chunks.append(chunk)
+        found += len(chunk)
+
+    return [log for chunk in reversed(chunks) for log in chunk]
+
+
+def read_logs(operator_index, offset, length, levels, start, end, pattern):
+    """
+    Reads a byte range of the data object of an operator and returns
+    the logs that match the filters.
+
+    Parameters
+    ----------
+    operator_index : dict
+    offset : int
+    length : int
+    levels : set or None
+    start : datetime.datetime or None
+    end : datetime.datetime or None
+    pattern : re.Pattern or None
+
+    Returns
+    -------
+    list
+        Tuples of (level, title, message, created_at) sorted by creation date ASC.
+    """
+    title = operator_index["title"]
+    data = get_partial_object(operator_index["object"], offset, length)
+
+    logs = []
+    # consecutive gzip members are decompressed as a single stream
+    for line in gzip.decompress(data).decode().splitlines():
+        level, message, created_at = json.loads(line)
+
+        if levels is not None and level not in levels:
+            continue
+        if pattern is not None and pattern.search(message) is None:
+            continue
+
+        created_at = dateutil.parser.isoparse(created_at) if created_at else None
+        if start is not None and (created_at is None or created_at < start):
+            continue
+        if end is not None and (created_at is None or created_at > end):
+            continue
+
+        logs.append((level, title, message, created_at))
+
+    return logs
+
+
+def block_matches(block, levels, start, end):
+    """
+    Returns whether a block may have logs that match the filters.
+
+    Parameters
+    ----------
+    block : dict
+    levels : set or None
+    start : datetime.datetime or None
+    end : datetime.datetime or None
+
+    Returns
+    -------
+    bool
+    """
+    if levels is not None and levels.isdisjoint(block["levels"]):
+        return False
+
+    if start is not None or end is not None:
+        if block["start"] is None:
+            return False
+        if start is not None and dateutil.parser.isoparse(block["end"]) < start:
+            return False
+        if end is not None and dateutil.parser.isoparse(block["start"]) > end:
+            return False
+
+    return True
+
+
+def coalesce_ranges(blocks):
+    """
+    Merges the byte ranges of adjacent blocks, so they are read in one request.
+
+    Parameters
+    ----------
+    blocks : list
+
+    Returns
+    -------
+    list
+        A list of (offset, length) tuples.
+    """
+    ranges = []
+    for block in blocks:
+        if ranges and sum(ranges[-1]) == block["offset"]:
+            offset, length = ranges[-1]
+            ranges[-1] = (offset, length + block["length"])
+        else:
+            ranges.append((block["offset"], block["length"]))
+    return ranges
+
+
+def load_json(object_name):
+    """
+    Loads a JSON object from the object storage.
+
+    Parameters
+    ----------
+    object_name : str
+
+    Returns
+    -------
+    dict or None
+        None if the object does not exist.
+    """
+    try:
+        return json.loads(get_object(object_name))
+    except NoSuchKey:
+        return None
+
+
+def to_utc(value):
+    """
+    Returns a timezone aware date. Naive dates are assumed to be UTC.
+
+    Parameters
+    ----------
+    value : datetime.datetime
+
+    Returns
+    -------
+    datetime.datetime
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def format_datetime(value):
+    """
+    Formats a date as ISO 8601.
+
+    Parameters
+    ----------
+    value : datetime.datetime or None
+
+    Returns
+    -------
+    str or None
+    """
+    if value is None:
+        return None
+    return to_utc(value).isoformat()
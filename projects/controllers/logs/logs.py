@@ -1,27 +1,75 @@
 # -*- coding: utf-8 -*-
 """Logs controller."""
+import base64
+import binascii
 import datetime
-import io
+import heapq
+import json
+import math
+import queue
 import re
+import threading
+import time
 import dateutil.parser
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
 from typing import List, Optional
 
+from projects.controllers.logs.archive import load_operator_logs, load_run_index, to_utc
+from projects.exceptions import BadRequest, InternalServerError
 from projects.kfp.runs import get_latest_run_id
-from projects.kubernetes.argo import list_workflow_pods
+from projects.kubernetes.argo import list_workflow_pods, list_workflows
 from projects.kubernetes.seldon import list_deployment_pods
-from projects.kubernetes.utils import get_container_logs
+from projects.kubernetes.utils import get_container_logs, iter_log_lines, \
+    stream_container_logs
 from projects.schemas.log import Log, LogList
 
 EXCLUDE_CONTAINERS = ["istio-proxy", "wait"]
-LOG_PATTERN = re.compile(r"(.*?)\s(INFO|WARN|WARNING|ERROR|DEBUG)\s*(.*)")
+# The first level in a line splits its date (before) from its message (after)
+LEVEL_PATTERN = re.compile(r"\s(INFO|WARN|WARNING|ERROR|DEBUG)")
+# Timestamp that kubelet prepends to each line (RFC3339 with up to nanoseconds)
+KUBELET_TIMESTAMP_PATTERN = re.compile(r"^([0-9]{4}(?:-[0-9]{2}){2}T[0-9]{2}(?::[0-9]{2}){2})(?:\.([0-9]+))?Z\s")
+RFC3339_UTC_PATTERN = re.compile(r"([0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2})(?:\.([0-9]+))?Z$")
+
+# Interval (in seconds) between pod listings while following a run
+STREAM_POLL_INTERVAL = 5
+# Time (in seconds) a buffered message waits for continuation lines before it is sent
+STREAM_FLUSH_INTERVAL = 1
+# Time (in seconds) without events before a keep-alive comment is sent
+STREAM_KEEPALIVE_INTERVAL = 15
+FINISHED_WORKFLOW_PHASES = {"Succeeded", "Failed", "Error"}
+
+# Lightweight log, converted to projects.schemas.log.Log only when it is sent
+LogRecord = namedtuple("LogRecord", ["level", "title", "message", "created_at"])
+
+# Maximum number of containers whose logs are retrieved at the same time
+LOGS_MAX_WORKERS = int(getenv("LOGS_MAX_WORKERS", "8"))
+# Timeout (in seconds) of each request for container logs
+LOGS_REQUEST_TIMEOUT = int(getenv("LOGS_REQUEST_TIMEOUT", "10"))
 
 
 class LogController:
 
-    def list_logs(self, project_id: str, run_id: str, experiment_id: Optional[str] = None, deployment_id: Optional[str] = None):
+    def list_logs(self,
+                  project_id: str,
+                  run_id: str,
+                  experiment_id: Optional[str] = None,
+                  deployment_id: Optional[str] = None,
+                  since: Optional[str] = None,
+                  level: Optional[str] = None,
+                  start: Optional[datetime.datetime] = None,
+                  end: Optional[datetime.datetime] = None,
+                  title: Optional[str] = None,
+                  q: Optional[str] = None,
+                  regex: bool = False,
+                  limit: Optional[int] = None):
         """
         Lists logs from a run.
 
+        Logs of finished runs are read from the logs archive, and the logs of
+        other runs, or of operators that were not archived, are read from their pods.
+
         Parameters
         ----------
         project_id : str
@@ -29,16 +77,287 @@ class LogController:
             The run_id. If `run_id=latest`, then returns logs from the latest run_id.
         experiment_id : str or None
         deployment_id : str or None
+        since : str or None
+            The cursor returned by a previous call. Only logs written after it are returned.
+        level : str or None
+            Comma-separated levels. If set, returns only logs of these levels.
+        start : datetime.datetime or None
+            If set, returns only logs created at or after this date.
+        end : datetime.datetime or None
+            If set, returns only logs created at or before this date.
+        title : str or None
+            Comma-separated task names. If set, returns only logs of these tasks.
+        q : str or None
+            If set, returns only logs whose message contains this text (case-insensitive).
+        regex : bool
+            Whether q is a regular expression.
+        limit : int or None
+            If set, returns only the newest `limit` logs.
 
         Returns
         -------
-        dict
-            A dict of logs from a run.
+        projects.schemas.log.LogList
+            The logs from a run, and a cursor for the next call.
+
+        Raises
+        ------
+        BadRequest
+            When since is not a valid cursor, q is not a valid regular
+            expression or limit is not positive.
         """
+        cursor = self.decode_cursor(since) if since else {}
+        levels = {value.strip().upper() for value in level.split(",")} if level else None
+        titles = {value.strip() for value in title.split(",")} if title else None
+        pattern = self.compile_pattern(q, regex) if q else None
+        start = to_utc(start) if start else None
+        end = to_utc(end) if end else None
+
+        if limit is not None and limit < 1:
+            raise BadRequest("Invalid limit argument")
+
         if run_id == "latest":
             run_id = get_latest_run_id(experiment_id or deployment_id)
 
         pods = []
+        if deployment_id is not None:
+            # Tries to retrieve any pods associated to a seldondeployment
+            pods = list_deployment_pods(deployment_id=deployment_id)
+
+        run_index = None
+        if len(pods) == 0:
+            # Workflows and pods are deleted after 1 day, so the persistence
+            # agent archives the logs of finished runs
+            run_index = load_run_index(run_id)
+
+        if run_index is not None:
+            # The logs are sorted by creation date DESC
+            logs = self.archive_to_logs(run_index,
+                                        cursor=cursor,
+                                        levels=levels,
+                                        start=start,
+                                        end=end,
+                                        titles=titles,
+                                        pattern=pattern,
+                                        limit=limit)
+
+            if run_index.get("missingPods"):
+                # The logs of some operators were not archived, so they are
+                # read from the pods that were not archived, while they exist
+                archived_pods = {
+                    operator_index["cursorKey"].split("/")[0]
+                    for operator_index in run_index["operators"]
+                    if operator_index["cursorKey"] is not None
+                }
+                pods = [pod for pod in list_workflow_pods(run_id=run_id) if pod.metadata.name not in archived_pods]
+                pod_logs = self.pods_to_logs(pods, cursor=cursor, titles=titles)
+                pod_logs = [log for log in pod_logs if self.log_matches(log, levels, start, end, pattern)]
+                logs = list(heapq.merge(logs, pod_logs, key=lambda log: log.created_at, reverse=True))
+        else:
+            if len(pods) == 0:
+                pods = list_workflow_pods(run_id=run_id)
+
+            # Retrieves logs from all containers in all pods (that were not deleted)
+            # The logs are sorted by creation date DESC
+            logs = self.pods_to_logs(pods, cursor=cursor, titles=titles)
+            logs = [log for log in logs if self.log_matches(log, levels, start, end, pattern)]
+
+        if limit is not None:
+            logs = logs[:limit]
+
+        return LogList(
+            logs=[self.to_log(log) for log in logs],
+            total=len(logs),
+            cursor=self.encode_cursor(cursor),
+        )
+
+    def archive_to_logs(self,
+                        run_index: dict,
+                        cursor: dict,
+                        levels=None,
+                        start=None,
+                        end=None,
+                        titles=None,
+                        pattern=None,
+                        limit=None):
+        """
+        Reads the logs of an archived run.
+        Operators whose title does not match are not read at all.
+
+        Parameters
+        ----------
+        run_index : dict
+        cursor : dict
+            The timestamp of the last line read from each container. Only newer
+            logs are returned, and the timestamps are updated in place.
+        levels : set or None
+        start : datetime.datetime or None
+        end : datetime.datetime or None
+        titles : set or None
+        pattern : re.Pattern or None
+        limit : int or None
+
+        Returns
+        -------
+        list
+            Log records sorted by creation date DESC.
+        """
+        def load(operator_index):
+            key = operator_index["cursorKey"]
+            last_time = operator_index["lastTime"]
+            since_time = cursor.get(key)
+
+            if since_time is not None and last_time is not None \
+                    and self.timestamp_key(since_time) >= self.timestamp_key(last_time):
+                # nothing was written after the cursor
+                return []
+
+            logs = [
+                LogRecord._make(log)
+                for log in load_operator_logs(operator_index,
+                                              levels=levels,
+                                              start=start,
+                                              end=end,
+                                              pattern=pattern,
+                                              limit=limit)
+            ]
+
+            if since_time is not None:
+                since_date = dateutil.parser.isoparse(since_time)
+                logs = [log for log in logs if log.created_at is not None and log.created_at > since_date]
+
+            return sorted(logs, key=lambda log: log.created_at, reverse=True)
+
+        operators = [
+            operator_index for operator_index in run_index["operators"]
+            if titles is None or operator_index["title"] in titles
+        ]
+
+        operator_logs = []
+        if len(operators) > 0:
+            with ThreadPoolExecutor(max_workers=min(LOGS_MAX_WORKERS, len(operators))) as executor:
+                operator_logs = list(executor.map(load, operators))
+
+        for operator_index in run_index["operators"]:
+            if operator_index["cursorKey"] is not None and operator_index["lastTime"] is not None:
+                cursor[operator_index["cursorKey"]] = operator_index["lastTime"]
+
+        return list(heapq.merge(*operator_logs, key=lambda log: log.created_at, reverse=True))
+
+    def log_matches(self, log: LogRecord, levels=None, start=None, end=None, pattern=None):
+        """
+        Returns whether a log matches the filters.
+
+        Parameters
+        ----------
+        log : LogRecord
+        levels : set or None
+        start : datetime.datetime or None
+        end : datetime.datetime or None
+        pattern : re.Pattern or None
+
+        Returns
+        -------
+        bool
+        """
+        if levels is not None and log.level not in levels:
+            return False
+
+        if pattern is not None and pattern.search(log.message) is None:
+            return False
+
+        if start is not None or end is not None:
+            if log.created_at is None:
+                return False
+            created_at = to_utc(log.created_at)
+            if start is not None and created_at < start:
+                return False
+            if end is not None and created_at > end:
+                return False
+
+        return True
+
+    def compile_pattern(self, q: str, regex: bool = False):
+        """
+        Compiles the pattern of a log search.
+
+        Parameters
+        ----------
+        q : str
+        regex : bool
+            Whether q is a regular expression. Otherwise, it is a case-insensitive text.
+
+        Returns
+        -------
+        re.Pattern
+
+        Raises
+        ------
+        BadRequest
+            When q is not a valid regular expression.
+        """
+        if not regex:
+            return re.compile(re.escape(q), re.IGNORECASE)
+
+        try:
+            return re.compile(q)
+        except re.error:
+            raise BadRequest("Invalid regex")
+
+    def encode_cursor(self, cursor: dict):
+        """
+        Encodes the last timestamp read from each container as an opaque string.
+
+        Parameters
+        ----------
+        cursor : dict
+
+        Returns
+        -------
+        str
+        """
+        return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+    def decode_cursor(self, since: str):
+        """
+        Decodes a cursor returned by `encode_cursor`.
+
+        Parameters
+        ----------
+        since : str
+
+        Returns
+        -------
+        dict
+
+        Raises
+        ------
+        BadRequest
+            When since is not a valid cursor.
+        """
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(since.encode()))
+            assert isinstance(cursor, dict)
+            assert all(KUBELET_TIMESTAMP_PATTERN.match(f"{t} ") for t in cursor.values())
+        except (AssertionError, binascii.Error, TypeError, ValueError):
+            raise BadRequest("Invalid since cursor")
+
+        return cursor
+
+    def list_pods(self, run_id: str, deployment_id: Optional[str] = None):
+        """
+        Lists the pods that hold the logs of a run.
+
+        Parameters
+        ----------
+        run_id : str
+        deployment_id : str or None
+
+        Returns
+        -------
+        list
+            A list of pod details.
+        """
+        pods = []
 
         if deployment_id is not None:
             # Tries to retrieve any pods associated to a seldondeployment
@@ -47,63 +366,410 @@ class LogController:
             )
 
         if len(pods) == 0:
-            # BUG: workflows and pods are deleted after 1 day due to a
+            # Workflows and pods are deleted after 1 day due to a
             # "Garbage Collector" feature of Argo workflows/Kubeflow Pipelines.
-            # The link below provide useful information on how to configure log
-            # persistence and where to set the Time-to-live (TTL) for workflows:
-            # https://github.com/kubeflow/pipelines/issues/844#issuecomment-559841627
-            # We can make use of these configurations and fix this bug later.
+            # See projects.controllers.logs.archive for how logs are kept.
             pods.extend(
                 list_workflow_pods(run_id=run_id),
             )
 
-        # Retrieves logs from all containers in all pods (that were not deleted)
-        logs = self.pods_to_logs(pods)
+        return pods
 
-        # Sorts logs by creation date DESC
-        logs = sorted(logs, key=lambda l: l.created_at, reverse=True)
+    def stream_logs(self, project_id: str, run_id: str, experiment_id: Optional[str] = None, deployment_id: Optional[str] = None):
+        """
+        Follows the logs from a run and yields them as server-sent events.
 
-        return LogList(
-            logs=logs,
-            total=len(logs),
-        )
+        Each container is followed by its own log stream. New pods are attached
+        as they start, and streams of finished containers are closed. The
+        generator ends once the workflow finished and every stream was drained.
 
-    def pods_to_logs(self, pods: List):
+        Parameters
+        ----------
+        project_id : str
+        run_id : str
+            The run_id. If `run_id=latest`, then follows logs from the latest run_id.
+        experiment_id : str or None
+        deployment_id : str or None
+
+        Returns
+        -------
+        generator
+            Yields `text/event-stream` formatted messages, one per log.
         """
-        Transform raw log text into human-readable logs.
+        if run_id == "latest":
+            run_id = get_latest_run_id(experiment_id or deployment_id)
+
+        events = queue.Queue()
+        streams = {}
+        followed = set()
+        pending = {}
+
+        next_poll = 0
+        last_event = time.monotonic()
+
+        try:
+            while True:
+                now = time.monotonic()
+
+                if now >= next_poll:
+                    next_poll = now + STREAM_POLL_INTERVAL
+                    pods = self.list_pods(run_id=run_id, deployment_id=deployment_id)
+
+                    for pod, container in self.iter_containers(pods):
+                        key = (pod.metadata.name, container.name)
+                        if key in followed or not self.container_started(pod, container):
+                            continue
+
+                        response = stream_container_logs(pod, container)
+                        if response is None:
+                            continue
+
+                        followed.add(key)
+                        streams[key] = response
+                        pending[key] = {
+                            "task_name": self.get_task_name(pod, container),
+                            "created_at": pod.metadata.creation_timestamp,
+                            "lines": [],
+                        }
+                        threading.Thread(
+                            target=self.follow_container,
+                            args=(key, response, events),
+                            daemon=True,
+                        ).start()
+
+                    if len(streams) == 0 and events.empty() and self.run_is_finished(run_id, pods):
+                        break
+
+                try:
+                    key, line = events.get(timeout=STREAM_FLUSH_INTERVAL)
+                except queue.Empty:
+                    # Sends buffered messages that received no continuation lines
+                    for state in pending.values():
+                        for log in self.flush_message(state):
+                            last_event = time.monotonic()
+                            yield self.to_event(log)
+
+                    if time.monotonic() - last_event >= STREAM_KEEPALIVE_INTERVAL:
+                        last_event = time.monotonic()
+                        yield ": keep-alive\n\n"
+                    continue
+
+                state = pending[key]
+
+                if line is None:
+                    # The container finished: its stream is drained and closed
+                    streams.pop(key).release_conn()
+                    logs = self.flush_message(state)
+                elif LEVEL_PATTERN.search(line):
+                    # A new message begins, so the buffered one is complete
+                    logs = self.flush_message(state)
+                    state["lines"].append(line)
+                else:
+                    logs = []
+                    state["lines"].append(line)
+
+                for log in logs:
+                    last_event = time.monotonic()
+                    yield self.to_event(log)
+        finally:
+            for response in streams.values():
+                response.close()
+
+    def follow_container(self, key: tuple, response, events: queue.Queue):
+        """
+        Reads a container log stream and puts its lines into a queue.
+
+        A `None` line is put after the stream ends.
 
         Parameters
         ----------
-        pods : list
-            A list of pod details.
+        key : tuple
+            The (pod name, container name) pair.
+        response : urllib3.response.HTTPResponse
+        events : queue.Queue
+        """
+        try:
+            for line in iter_log_lines(response):
+                events.put((key, line))
+        except Exception:
+            # the stream was closed, either by the client or by the kubelet
+            pass
+        finally:
+            events.put((key, None))
+
+    def flush_message(self, state: dict):
+        """
+        Parses the buffered lines of a container and clears the buffer.
+
+        Parameters
+        ----------
+        state : dict
+            The task name, last creation date and buffered lines of a container.
 
         Returns
         -------
         list
-            Detailed logs with level, title, date and message from a container.
+            Detailed logs with level, title, date and message.
+        """
+        if len(state["lines"]) == 0:
+            return []
+
+        logs = self.split_messages("\n".join(state["lines"]), state["task_name"], state["created_at"])
+        state["lines"] = []
+        state["created_at"] = logs[-1].created_at
+        return logs
+
+    def to_event(self, record: LogRecord):
+        """
+        Formats a log record as a server-sent event.
+
+        Parameters
+        ----------
+        record : LogRecord
+
+        Returns
+        -------
+        str
+        """
+        return f"data: {self.to_log(record).json(by_alias=True)}\n\n"
+
+    def run_is_finished(self, run_id: str, pods: List):
+        """
+        Returns whether a run won't start any other pods.
+
+        Parameters
+        ----------
+        run_id : str
+        pods : list
+
+        Returns
+        -------
+        bool
+        """
+        if any("seldon-deployment-id" in (pod.metadata.labels or {}) for pod in pods):
+            # seldondeployments run until they are deleted
+            return False
+
+        workflows = list_workflows(run_id)
+        if len(workflows) == 0:
+            return True
+
+        phase = workflows[0].get("status", {}).get("phase")
+        return phase in FINISHED_WORKFLOW_PHASES
+
+    def container_started(self, pod, container):
+        """
+        Returns whether a container is running or has already terminated.
+
+        Parameters
+        ----------
+        pod : kubernetes.client.models.v1_pod.V1Pod
+        container : kubernetes.client.models.v1_container.V1Container
+
+        Returns
+        -------
+        bool
+        """
+        for status in pod.status.container_statuses or []:
+            if status.name == container.name:
+                return status.state.running is not None or status.state.terminated is not None
+        return False
+
+    def iter_containers(self, pods: List):
+        """
+        Iterates over the containers of pods that ran a task.
+
+        Parameters
+        ----------
+        pods : list
+
+        Returns
+        -------
+        generator
+            Yields (pod, container) pairs.
         """
-        logs = []
         for pod in pods:
             for container in pod.spec.containers:
                 if container.name not in EXCLUDE_CONTAINERS:
-                    raw_logs = get_container_logs(pod, container)
+                    yield pod, container
 
-                    if container.env is None:
-                        task_name = pod.metadata.name
-                    else:
-                        task_name = next((e.value for e in container.env if e.name == "TASK_NAME"), pod.metadata.name)
+    def get_task_name(self, pod, container):
+        """
+        Returns the task name of a container.
 
-                    created_at = pod.metadata.creation_timestamp
+        Parameters
+        ----------
+        pod : kubernetes.client.models.v1_pod.V1Pod
+        container : kubernetes.client.models.v1_container.V1Container
 
-                    logs.extend(
-                        self.split_messages(raw_logs, task_name, created_at),
-                    )
+        Returns
+        -------
+        str
+            The value of TASK_NAME env var, or the pod name if not set.
+        """
+        if container.env is None:
+            return pod.metadata.name
+        return next((e.value for e in container.env if e.name == "TASK_NAME"), pod.metadata.name)
 
-        return logs
+    def pods_to_logs(self, pods: List, cursor: Optional[dict] = None, titles: Optional[set] = None):
+        """
+        Transform raw log text into human-readable logs.
+
+        Logs are retrieved concurrently from all containers. A container whose
+        logs could not be retrieved is reported as an ERROR log, so the logs
+        from the other containers are still returned.
+
+        Parameters
+        ----------
+        pods : list
+            A list of pod details.
+        cursor : dict or None
+            The timestamp of the last line read from each container. Only newer
+            lines are returned, and the timestamps are updated in place.
+        titles : set or None
+            If set, only containers of these tasks are read.
+
+        Returns
+        -------
+        list
+            Detailed logs with level, title, date and message from a container,
+            sorted by creation date DESC.
+        """
+        containers = [
+            (pod, container) for pod, container in self.iter_containers(pods)
+            if titles is None or self.get_task_name(pod, container) in titles
+        ]
+        if len(containers) == 0:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(LOGS_MAX_WORKERS, len(containers))) as executor:
+            futures = []
+            for pod, container in containers:
+                key = f"{pod.metadata.name}/{container.name}"
+                since_time = cursor.get(key) if cursor is not None else None
+                futures.append(
+                    (key, executor.submit(self.container_to_logs, pod, container, since_time)),
+                )
+
+            container_logs = []
+            for key, future in futures:
+                logs, last_time = future.result()
+                if cursor is not None and last_time is not None:
+                    cursor[key] = last_time
+
+                # Logs of a single container are nearly chronological, so this sort is cheap
+                container_logs.append(
+                    sorted(logs, key=lambda log: log.created_at, reverse=True),
+                )
+
+        return list(heapq.merge(*container_logs, key=lambda log: log.created_at, reverse=True))
+
+    def container_to_logs(self, pod, container, since_time: Optional[str] = None):
+        """
+        Retrieves and parses the logs of a single container.
+
+        Parameters
+        ----------
+        pod : kubernetes.client.models.v1_pod.V1Pod
+        container : kubernetes.client.models.v1_container.V1Container
+        since_time : str or None
+            The timestamp of the last line previously read from this container.
+
+        Returns
+        -------
+        tuple
+            The list of logs, and the timestamp of the last line read.
+        """
+        task_name = self.get_task_name(pod, container)
+        created_at = pod.metadata.creation_timestamp
+
+        since_seconds = None
+        if since_time is not None:
+            # kubelet only accepts whole seconds, so a few older
+            # lines are fetched and then skipped by their timestamps
+            elapsed = datetime.datetime.now(datetime.timezone.utc) - dateutil.parser.isoparse(since_time)
+            since_seconds = max(1, math.ceil(elapsed.total_seconds()) + 1)
+
+        try:
+            raw_logs = get_container_logs(pod,
+                                          container,
+                                          since_seconds=since_seconds,
+                                          timeout=LOGS_REQUEST_TIMEOUT)
+        except InternalServerError as e:
+            log = LogRecord(
+                level="ERROR",
+                title=task_name,
+                message=e.message,
+                created_at=datetime.datetime.now(datetime.timezone.utc),
+            )
+            return [log], None
+
+        last_time = None
+        if raw_logs is not None:
+            raw_logs, last_time = self.skip_read_lines(raw_logs, since_time)
+
+        logs = self.split_messages(raw_logs, task_name, created_at)
+        return logs, last_time
+
+    def skip_read_lines(self, raw_logs: str, since_time: Optional[str] = None):
+        """
+        Removes the lines written up to a kubelet timestamp.
+
+        Parameters
+        ----------
+        raw_logs : str
+        since_time : str or None
+
+        Returns
+        -------
+        tuple
+            The remaining raw log text, and the timestamp of its last line.
+        """
+        lines = raw_logs.splitlines()
+
+        if since_time is not None:
+            since_key = self.timestamp_key(since_time)
+            # lines are in chronological order, so only a prefix is skipped
+            start = 0
+            for start, line in enumerate(lines):
+                match = KUBELET_TIMESTAMP_PATTERN.match(line)
+                if match is None or self.timestamp_key(match) > since_key:
+                    break
+            else:
+                start = len(lines)
+            lines = lines[start:]
+
+        last_time = None
+        for line in reversed(lines):
+            match = KUBELET_TIMESTAMP_PATTERN.match(line)
+            if match:
+                last_time = match.group(0).rstrip()
+                break
+
+        return "\n".join(lines), last_time
+
+    def timestamp_key(self, timestamp):
+        """
+        Returns a sortable key of a kubelet timestamp.
+
+        Parameters
+        ----------
+        timestamp : str or re.Match
+            A timestamp, or a match of KUBELET_TIMESTAMP_PATTERN.
+
+        Returns
+        -------
+        tuple
+        """
+        if isinstance(timestamp, str):
+            timestamp = KUBELET_TIMESTAMP_PATTERN.match(f"{timestamp} ")
+        seconds, fraction = timestamp.groups()
+        # fractions have no trailing zeros, so they are padded to nanoseconds
+        return seconds, (fraction or "").ljust(9, "0")
 
     def split_messages(self, raw_logs: str, task_name: str, created_at: datetime.datetime):
         """
-        Splits raw log text into a list of log schemas.
+        Splits raw log text into a list of log records.
 
         Parameters
         ----------
@@ -115,11 +781,12 @@ class LogController:
         -------
         list
             Detailed logs with level, Time Stamp and message from pod container.
+            Use `to_log` to convert each record to a log schema.
         """
         # default return for empty logs
         if raw_logs is None:
             return [
-                Log(
+                LogRecord(
                     level="INFO",
                     title=task_name,
                     message="Container is creating...",
@@ -128,60 +795,93 @@ class LogController:
             ]
 
         logs = []
-        buffer = io.StringIO(raw_logs)
+        lines = raw_logs.split("\n")
+        if lines[-1] == "":
+            lines.pop()
 
         message_lines = []
         level = "INFO"
 
-        line = buffer.readline()
-        while line:
-            line = line.strip("\n")
+        search_level = LEVEL_PATTERN.search
+        match_timestamp = KUBELET_TIMESTAMP_PATTERN.match
+
+        for line in lines:
             # Captures the beginning of a log message (until 1st space char)
             # and tries to parse a datetime and a level from this message.
-            match = LOG_PATTERN.match(line)
+            # The regex only runs on lines that contain a level.
+            if "INFO" in line or "WARN" in line or "ERROR" in line or "DEBUG" in line:
+                match = search_level(line)
+            else:
+                match = None
+
             if match:
                 # Appends the previous lines of log
                 if len(message_lines) > 0:
                     logs.append(
-                        Log(
-                            level=level,
-                            title=task_name,
-                            message="\n".join(message_lines),
-                            created_at=created_at,
-                        ),
+                        LogRecord(level, task_name, "\n".join(message_lines), created_at),
                     )
                     message_lines = []
 
-                date_str = match.group(1)
-                level = match.group(2) or "INFO"
-                line = match.group(3)
-
-                message_lines.append(line)
-                try:
-                    created_at = dateutil.parser.isoparse(date_str)
-                except (ValueError, OverflowError):
-                    pass
+                date_str = line[:match.start()]
+                level = match.group(1)
+                message_lines.append(line[match.end():].lstrip())
+                created_at = parse_timestamp(date_str) or created_at
             else:
                 # This is necessary to remove kubernetes timestamps
-                # of the lines in the message body. This regex will
-                # look for timestamp at the beginning of line.
-                line = re.sub(
-                    r"^([0-9]{4}(-[0-9]{2}){2}T[0-9]{2}(:[0-9]{2}){2}.[0-9]+Z\s)",
-                    "", line, 2
-                )
+                # of the lines in the message body.
+                timestamp = match_timestamp(line)
+                if timestamp:
+                    line = line[timestamp.end():]
 
                 message_lines.append(line)
 
-            line = buffer.readline()
-
         if len(message_lines) > 0:
             logs.append(
-                Log(
-                    level=level,
-                    title=task_name,
-                    message="\n".join(message_lines),
-                    created_at=created_at,
-                ),
+                LogRecord(level, task_name, "\n".join(message_lines), created_at),
             )
 
         return logs
+
+    def to_log(self, record: LogRecord):
+        """
+        Converts a log record to a log schema.
+
+        Parameters
+        ----------
+        record : LogRecord
+
+        Returns
+        -------
+        projects.schemas.log.Log
+        """
+        # records are built from already parsed values, so validation is skipped
+        return Log.construct(**record._asdict())
+
+
+def parse_timestamp(date_str: str):
+    """
+    Parses a date from the beginning of a log message.
+
+    Kubelet timestamps (RFC3339 in UTC) are parsed directly. Other formats
+    are parsed by dateutil.
+
+    Parameters
+    ----------
+    date_str : str
+
+    Returns
+    -------
+    datetime.datetime or None
+        None if date_str is not a date.
+    """
+    match = RFC3339_UTC_PATTERN.match(date_str)
+    try:
+        if match is None:
+            return dateutil.parser.isoparse(date_str)
+
+        seconds, fraction = match.groups()
+        # dateutil truncates fractions to microseconds, and so does this
+        fraction = (fraction or "")[:6].ljust(6, "0")
+        return datetime.datetime.fromisoformat(f"{seconds}.{fraction}+00:00")
+    except (ValueError, OverflowError):
+        return None
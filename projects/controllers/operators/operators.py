@@ -3,9 +3,11 @@
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from sqlalchemy.orm import selectinload
+
 from projects import models, schemas
 from projects.controllers.tasks import TaskController
-from projects.controllers.utils import uuid_alpha
+from projects.controllers.utils import updated_since_cutoff, uuid_alpha
 from projects.exceptions import BadRequest, NotFound
 
 NOT_FOUND = NotFound("The specified operator does not exist")
@@ -36,7 +38,11 @@ class OperatorController:
         if operator.scalar() is None:
             raise NOT_FOUND
 
-    def list_operators(self, project_id: str, experiment_id: Optional[str] = None, deployment_id: Optional[str] = None):
+    def list_operators(self,
+                       project_id: str,
+                       experiment_id: Optional[str] = None,
+                       deployment_id: Optional[str] = None,
+                       updated_since: Optional[datetime] = None):
         """
         Lists all operators under an experiment.
 
@@ -45,17 +51,31 @@ class OperatorController:
         project_id : str
         experiment_id : str or None
         deployment_id : str or None
+        updated_since : datetime.datetime or None
+            If given, lists only the operators updated since then.
 
         Returns
         -------
         projects.schemas.ListOperator
         """
+        if updated_since is not None:
+            # a replica may lag more than UPDATED_SINCE_MARGIN, and a delta would miss its pending updates
+            self.session.use_primary()
+
+        # read before the query, so that the next delta includes concurrent updates
+        server_time = datetime.utcnow()
+
         operators = self.session.query(models.Operator) \
+            .options(selectinload(models.Operator.task)) \
             .filter_by(experiment_id=experiment_id) \
-            .filter_by(deployment_id=deployment_id) \
-            .all()
+            .filter_by(deployment_id=deployment_id)
+
+        if updated_since is not None:
+            operators = operators.filter(models.Operator.updated_at >= updated_since_cutoff(updated_since))
+
+        operators = operators.all()
 
-        return schemas.OperatorList.from_orm(operators, len(operators))
+        return schemas.OperatorList.from_orm(operators, len(operators), server_time)
 
     def create_operator(self,
                         operator: schemas.OperatorCreate,
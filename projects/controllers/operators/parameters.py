@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 """Parameter controller."""
+from datetime import datetime
+
 from projects import models, schemas
 
 
@@ -35,7 +37,7 @@ class OperatorParameterController:
         setted_keys = set(key for key, value in parameters.items() if value != "")
         all_keys = set(p["name"] for p in operator.task.parameters) - {"dataset", "target"}
         status = "Setted up" if all_keys <= setted_keys else "Unset"
-        update_data.update({"status": status})
+        update_data.update({"status": status, "updated_at": datetime.utcnow()})
 
         self.session.query(models.Operator).filter_by(uuid=operator_id).update(update_data)
         self.session.commit()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Paths controller."""
+from typing import Optional
+
+from sqlalchemy import and_, exists
+
+from projects import models
+from projects.controllers.deployments.deployments import NOT_FOUND as DEPLOYMENT_NOT_FOUND
+from projects.controllers.experiments.experiments import NOT_FOUND as EXPERIMENT_NOT_FOUND
+from projects.controllers.monitorings.monitorings import NOT_FOUND as MONITORING_NOT_FOUND
+from projects.controllers.operators.operators import NOT_FOUND as OPERATOR_NOT_FOUND
+from projects.controllers.projects import NOT_FOUND as PROJECT_NOT_FOUND
+
+
+class PathController:
+    def __init__(self, session):
+        self.session = session
+
+    def raise_if_path_does_not_exist(self,
+                                     project_id: str,
+                                     experiment_id: Optional[str] = None,
+                                     deployment_id: Optional[str] = None,
+                                     operator_id: Optional[str] = None,
+                                     monitoring_id: Optional[str] = None):
+        """
+        Raises an exception if a resource of the path does not exist, or does not
+        belong to its parent in the path. All resources are checked in one query.
+
+        Parameters
+        ----------
+        project_id : str
+        experiment_id : str or None
+        deployment_id : str or None
+        operator_id : str or None
+            An operator of the experiment, or of the deployment.
+        monitoring_id : str or None
+            A monitoring of the deployment.
+
+        Raises
+        ------
+        NotFound
+            For the first resource of the path that does not exist.
+        """
+        # (exception, condition) in the order of the path
+        checks = [
+            (PROJECT_NOT_FOUND, exists().where(models.Project.uuid == project_id)),
+        ]
+
+        if experiment_id is not None:
+            checks.append((EXPERIMENT_NOT_FOUND, exists().where(and_(
+                models.Experiment.uuid == experiment_id,
+                models.Experiment.project_id == project_id,
+            ))))
+
+        if deployment_id is not None:
+            checks.append((DEPLOYMENT_NOT_FOUND, exists().where(and_(
+                models.Deployment.uuid == deployment_id,
+                models.Deployment.project_id == project_id,
+            ))))
+
+        if operator_id is not None:
+            if deployment_id is not None:
+                parent = models.Operator.deployment_id == deployment_id
+            else:
+                parent = models.Operator.experiment_id == experiment_id
+            checks.append((OPERATOR_NOT_FOUND, exists().where(and_(
+                models.Operator.uuid == operator_id,
+                parent,
+            ))))
+
+        if monitoring_id is not None:
+            checks.append((MONITORING_NOT_FOUND, exists().where(and_(
+                models.Monitoring.uuid == monitoring_id,
+                models.Monitoring.deployment_id == deployment_id,
+            ))))
+
+        # SELECT EXISTS(...), EXISTS(...), ... without a FROM clause
+        row = self.session.query(*(condition for _, condition in checks)).one()
+
+        for (exception, _), found in zip(checks, row):
+            if not found:
+                raise exception
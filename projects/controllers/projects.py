@@ -4,11 +4,14 @@ from datetime import datetime
 from os.path import join
 from typing import Optional
 
-from sqlalchemy import asc, desc, func
+from sqlalchemy import asc, desc, func, or_, select
+from sqlalchemy.orm import selectinload
 
 from projects import models, schemas
 from projects.controllers.experiments import ExperimentController
-from projects.controllers.utils import uuid_alpha
+from projects.controllers.totals import TOTALS
+from projects.controllers.utils import RELEVANCE, decode_cursor, encode_cursor, fulltext_match, \
+    keyset_filter, make_etag, raise_if_view_is_invalid, uuid_alpha, versions_of
 from projects.exceptions import BadRequest, NotFound
 from projects.object_storage import remove_objects
 
@@ -39,10 +42,31 @@ class ProjectController:
         if not exists:
             raise NOT_FOUND
 
+    def load_options(self):
+        """
+        Lists the loader options of the relationships that schemas.Project reads.
+
+        Returns
+        -------
+        list
+        """
+        return [
+            selectinload(models.Project.experiments)
+            .selectinload(models.Experiment.operators)
+            .selectinload(models.Operator.task),
+            selectinload(models.Project.deployments)
+            .selectinload(models.Deployment.operators)
+            .selectinload(models.Operator.task),
+        ]
+
     def list_projects(self,
                       page: Optional[int] = 1,
                       page_size: Optional[int] = 10,
                       order_by: Optional[str] = None,
+                      view: Optional[str] = "full",
+                      cursor: Optional[str] = None,
+                      with_total: Optional[bool] = True,
+                      q: Optional[str] = None,
                       **filters):
         """
         Lists projects. Supports pagination, and sorting.
@@ -55,48 +79,113 @@ class ProjectController:
             The page size. Default value is 10.
         order_by : str
             Order by instruction. Format is "column [asc|desc]".
+        cursor : str or None
+            The nextCursor of the previous page. If given, page is ignored.
+        with_total : bool
+            Whether to count the projects that match the filters.
+        q : str or None
+            Search words, all of which the name or description must contain.
+            Without order_by, projects are sorted by relevance.
+        view : str
+            "summary" lists only the columns and flags of projects, without their
+            experiments, deployments and hasDeployment (read from Kubernetes).
         **filters : dict
 
         Returns
         -------
-        projects.schemas.project.ProjectList
+        projects.schemas.project.ProjectList or projects.schemas.project.ProjectSummaryList
 
         Raises
         ------
         BadRequest
-            When order_by is invalid.
+            When order_by, cursor or view are invalid.
         """
-        query = self.session.query(models.Project)
+        raise_if_view_is_invalid(view)
+
+        if view == "summary":
+            has_experiment = self.session.query(models.Experiment.uuid) \
+                .filter(models.Experiment.project_id == models.Project.uuid) \
+                .exists()
+            has_pre_deployment = self.session.query(models.Deployment.uuid) \
+                .filter(models.Deployment.project_id == models.Project.uuid) \
+                .exists()
+            query = self.session.query(models.Project.uuid,
+                                       models.Project.name,
+                                       models.Project.description,
+                                       models.Project.created_at,
+                                       models.Project.updated_at,
+                                       has_experiment.label("has_experiment"),
+                                       has_pre_deployment.label("has_pre_deployment"))
+        else:
+            # the experiments, deployments, their operators and tasks are loaded
+            # with one query each, for the whole page
+            query = self.session.query(models.Project).options(*self.load_options())
         query_total = self.session.query(func.count(models.Project.uuid))
 
         for column, value in filters.items():
             query = query.filter(getattr(models.Project, column).ilike(f"%{value}%").collate("utf8mb4_bin"))
             query_total = query_total.filter(getattr(models.Project, column).ilike(f"%{value}%").collate("utf8mb4_bin"))
 
-        total = query_total.scalar()
+        search = fulltext_match([models.Project.name, models.Project.description], q)
+        if search is not None:
+            query = query.filter(search)
+            query_total = query_total.filter(search)
 
-        # Default sort is name in ascending order
+        total = None
+        if with_total:
+            total = TOTALS.get_or_count("projects", {**filters, "q": q}, query_total)
+
+        if cursor:
+            (cursor_column, cursor_sort, value, key) = decode_cursor(cursor, models.Project)
+            if cursor_column == RELEVANCE and search is None:
+                raise BadRequest("Invalid cursor argument")
+            # the cursor was returned for the same order
+            if not order_by:
+                order_by = f"{cursor_column} {cursor_sort}"
+
+        # Default sort is relevance of search results, or name in ascending order
         if not order_by:
-            order_by = "name asc"
+            order_by = f"{RELEVANCE} desc" if search is not None else "name asc"
 
         # Sorts records
         try:
             (column, sort) = order_by.strip().split()
-            assert sort.lower() in ["asc", "desc"]
-            assert column in models.Project.__table__.columns.keys()
+            sort = sort.lower()
+            assert sort in ["asc", "desc"]
+            assert column in models.Project.__table__.columns.keys() or (column == RELEVANCE and search is not None)
         except (AssertionError, ValueError):
             raise BadRequest("Invalid order argument")
 
-        if sort.lower() == "asc":
-            query = query.order_by(asc(getattr(models.Project, column)))
-        elif sort.lower() == "desc":
-            query = query.order_by(desc(getattr(models.Project, column)))
-
-        # Applies pagination
-        query = query.limit(page_size).offset((page - 1) * page_size)
-        projects = query.all()
-
-        return schemas.ProjectList.from_orm(projects, total)
+        # uuid orders projects with the same value, so that pages do not overlap
+        direction = asc if sort == "asc" else desc
+        sort_column = search if column == RELEVANCE else getattr(models.Project, column)
+        query = query.order_by(direction(sort_column), direction(models.Project.uuid))
+
+        # Applies pagination: after the cursor, or at an offset
+        if cursor:
+            if (cursor_column, cursor_sort) != (column, sort):
+                raise BadRequest("Invalid cursor argument")
+            query = query.filter(keyset_filter(sort_column, models.Project.uuid, sort, value, key))
+        else:
+            query = query.offset((page - 1) * page_size)
+
+        # one more project tells whether there is a next page
+        projects = query.limit(page_size + 1).all()
+
+        next_cursor = None
+        if len(projects) > page_size:
+            projects = projects[:page_size]
+            last = projects[-1]
+            if column == RELEVANCE:
+                # the relevance of a row is not loaded with it
+                last_value = self.session.query(search).filter(models.Project.uuid == last.uuid).scalar()
+            else:
+                last_value = getattr(last, column)
+            next_cursor = encode_cursor(column, sort, last_value, last.uuid)
+
+        if view == "summary":
+            return schemas.ProjectSummaryList.from_orm(projects, total, next_cursor)
+        return schemas.ProjectList.from_orm(projects, total, next_cursor)
 
     def create_project(self, project: schemas.ProjectCreate):
         """
@@ -129,10 +218,43 @@ class ProjectController:
         self.experiment_controller.create_experiment(experiment=experiment, project_id=project.uuid)
 
         self.session.commit()
+        TOTALS.invalidate("projects")
         self.session.refresh(project)
 
         return schemas.Project.from_orm(project)
 
+    def get_project_etag(self, project_id: str):
+        """
+        Builds the ETag of a project from the versions of the project, its
+        experiments, deployments, their operators and tasks, in one query.
+
+        Parameters
+        ----------
+        project_id : str
+
+        Returns
+        -------
+        str or None
+            None when the project does not exist, or was just updated.
+        """
+        experiment_ids = select([models.Experiment.uuid]).where(models.Experiment.project_id == project_id)
+        deployment_ids = select([models.Deployment.uuid]).where(models.Deployment.project_id == project_id)
+        operator_criteria = or_(models.Operator.experiment_id.in_(experiment_ids),
+                                models.Operator.deployment_id.in_(deployment_ids))
+        task_ids = select([models.Operator.task_id]).where(operator_criteria)
+
+        versions = self.session.query(
+            select([models.Project.updated_at]).where(models.Project.uuid == project_id).as_scalar(),
+            *versions_of(models.Experiment, models.Experiment.project_id == project_id),
+            *versions_of(models.Deployment, models.Deployment.project_id == project_id),
+            *versions_of(models.Operator, operator_criteria),
+            *versions_of(models.Task, models.Task.uuid.in_(task_ids)),
+        ).one()
+
+        if versions[0] is None:
+            return None
+        return make_etag(*versions)
+
     def get_project(self, project_id: str):
         """
         Details a project from our database.
@@ -150,7 +272,9 @@ class ProjectController:
         NotFound
             When project_id does not exist.
         """
-        project = self.session.query(models.Project).get(project_id)
+        project = self.session.query(models.Project) \
+            .options(*self.load_options()) \
+            .get(project_id)
 
         if project is None:
             raise NOT_FOUND
@@ -190,6 +314,7 @@ class ProjectController:
 
         self.session.query(models.Project).filter_by(uuid=project_id).update(update_data)
         self.session.commit()
+        TOTALS.invalidate("projects")
 
         project = self.session.query(models.Project).get(project_id)
 
@@ -219,6 +344,7 @@ class ProjectController:
 
         self.session.delete(project)
         self.session.commit()
+        TOTALS.invalidate("projects")
 
         prefix = join("experiments", project_id)
         remove_objects(prefix=prefix)
@@ -259,6 +385,7 @@ class ProjectController:
             self.session.delete(project)
 
         self.session.commit()
+        TOTALS.invalidate("projects")
 
         for experiment in experiments:
             prefix = join("experiments", experiment.uuid)
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""Status stream controller."""
+import asyncio
+import json
+import threading
+import time
+import warnings
+from os import getenv
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from projects import models
+from projects.database import Session
+
+# Interval (in seconds) between reads of the status changes table
+STATUS_STREAM_POLL_INTERVAL = float(getenv("STATUS_STREAM_POLL_INTERVAL", "1"))
+# Time (in seconds) without events before a keep-alive comment is sent
+STATUS_STREAM_KEEPALIVE_INTERVAL = 15
+# Status changes are numbered when inserted, but may be committed out of order,
+# so this many ids before the last one are read again
+STATUS_STREAM_OVERLAP = 100
+
+
+class StatusChangeBroker:
+    """
+    Reads new status changes once per interval, for all clients of the API
+    process, and dispatches them to the queues of the streams that follow
+    their experiment or deployment. The queues are asyncio queues, which are
+    fed in the event loop of their stream.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (event loop, queue) pairs by (experiment_id, deployment_id)
+        self.subscribers = {}
+        # the highest status change id read, and the ids read after last_id - STATUS_STREAM_OVERLAP
+        self.last_id = None
+        self.read_ids = set()
+        self.thread = None
+
+    def subscribe(self, key, subscriber):
+        """
+        Follows the status changes of an experiment or deployment.
+
+        Parameters
+        ----------
+        key : tuple
+            (experiment_id, None) or (None, deployment_id).
+        subscriber : tuple
+            (asyncio.AbstractEventLoop, asyncio.Queue). The queue receives
+            projects.models.StatusChange.
+        """
+        with self.lock:
+            if self.last_id is None:
+                # changes committed before the subscription are in the initial statuses,
+                # including those of the overlap window, that must not be sent again
+                session = Session()
+                try:
+                    ids = [
+                        change_id for (change_id,) in session.query(models.StatusChange.id)
+                        .order_by(models.StatusChange.id.desc())
+                        .limit(STATUS_STREAM_OVERLAP)
+                    ]
+                finally:
+                    session.close()
+                self.last_id = ids[0] if ids else 0
+                self.read_ids = {i for i in ids if i > self.last_id - STATUS_STREAM_OVERLAP}
+
+            self.subscribers.setdefault(key, set()).add(subscriber)
+
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def unsubscribe(self, key, subscriber):
+        """
+        Stops following the status changes of an experiment or deployment.
+
+        Parameters
+        ----------
+        key : tuple
+        subscriber : tuple
+        """
+        with self.lock:
+            subscribers = self.subscribers.get(key, set())
+            subscribers.discard(subscriber)
+            if not subscribers:
+                self.subscribers.pop(key, None)
+
+    def run(self):
+        while True:
+            time.sleep(STATUS_STREAM_POLL_INTERVAL)
+
+            with self.lock:
+                if not self.subscribers:
+                    # the table is not read while no one follows it
+                    self.last_id = None
+                    continue
+
+            try:
+                self.poll()
+            except Exception as e:
+                warnings.warn(f"Failed to read status changes: {e}")
+
+    def poll(self):
+        """
+        Reads the new status changes, and dispatches them to subscribers.
+        """
+        with self.lock:
+            last_id = self.last_id
+        if last_id is None:
+            return
+
+        session = Session()
+        try:
+            changes = session.query(models.StatusChange) \
+                .filter(models.StatusChange.id > last_id - STATUS_STREAM_OVERLAP) \
+                .order_by(models.StatusChange.id) \
+                .all()
+            session.expunge_all()
+        finally:
+            session.close()
+
+        with self.lock:
+            if self.last_id is None:
+                return
+
+            for change in changes:
+                if change.id in self.read_ids:
+                    continue
+                self.read_ids.add(change.id)
+                self.last_id = max(self.last_id, change.id)
+
+                key = (None, change.deployment_id) if change.deployment_id else (change.experiment_id, None)
+                for loop, subscriber in self.subscribers.get(key, ()):
+                    try:
+                        loop.call_soon_threadsafe(subscriber.put_nowait, change)
+                    except RuntimeError:
+                        # the event loop of the stream is closed
+                        pass
+
+            self.read_ids = {i for i in self.read_ids if i > self.last_id - STATUS_STREAM_OVERLAP}
+
+
+BROKER = StatusChangeBroker()
+
+
+class StatusStreamController:
+    def __init__(self, session):
+        self.session = session
+
+    async def stream_status_changes(self, experiment_id: Optional[str] = None, deployment_id: Optional[str] = None):
+        """
+        Follows the status of the operators of an experiment, or of a deployment
+        and its operators, and yields them as server-sent events. The current
+        statuses are sent first, then each change.
+
+        The changes are awaited in the event loop, so open streams do not hold
+        threads of the threadpool; only database reads run in the threadpool.
+
+        Parameters
+        ----------
+        experiment_id : str or None
+        deployment_id : str or None
+
+        Returns
+        -------
+        async generator
+            Yields `text/event-stream` formatted messages.
+        """
+        # the current statuses are read on the primary, as the broker starts
+        # from its latest change, that a replica may not have applied yet
+        self.session.use_primary()
+
+        key = (experiment_id, deployment_id)
+        changes = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), changes)
+        await run_in_threadpool(BROKER.subscribe, key, subscriber)
+
+        try:
+            events = await run_in_threadpool(self.list_current_statuses, experiment_id, deployment_id)
+            # the stream may stay open for a long time, so the database
+            # connection is returned to the pool once the current statuses are read
+            await run_in_threadpool(self.session.close)
+
+            for event in events:
+                yield event
+
+            while True:
+                try:
+                    change = await asyncio.wait_for(changes.get(), timeout=STATUS_STREAM_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if change.operator_id is None:
+                    yield self.to_event("deployment", {
+                        "deploymentId": change.deployment_id,
+                        "status": change.status,
+                    }, change.id)
+                else:
+                    yield self.to_event("operator", {
+                        "operatorId": change.operator_id,
+                        "status": change.status,
+                        "statusMessage": change.status_message,
+                    }, change.id)
+        finally:
+            BROKER.unsubscribe(key, subscriber)
+
+    def list_current_statuses(self, experiment_id: Optional[str] = None, deployment_id: Optional[str] = None):
+        """
+        Lists the current status of operators (and deployment) as server-sent events.
+
+        Parameters
+        ----------
+        experiment_id : str or None
+        deployment_id : str or None
+
+        Returns
+        -------
+        list
+        """
+        events = []
+
+        if deployment_id is not None:
+            deployment = self.session.query(models.Deployment.status) \
+                .filter_by(uuid=deployment_id) \
+                .first()
+            if deployment is not None:
+                events.append(self.to_event("deployment", {
+                    "deploymentId": deployment_id,
+                    "status": deployment.status,
+                }))
+            filters = {"deployment_id": deployment_id}
+        else:
+            filters = {"experiment_id": experiment_id}
+
+        operators = self.session.query(models.Operator.uuid,
+                                       models.Operator.status,
+                                       models.Operator.status_message) \
+            .filter_by(**filters) \
+            .all()
+        for operator in operators:
+            events.append(self.to_event("operator", {
+                "operatorId": operator.uuid,
+                "status": operator.status,
+                "statusMessage": operator.status_message,
+            }))
+
+        return events
+
+    def to_event(self, event_type: str, data: dict, event_id: Optional[int] = None):
+        """
+        Formats a server-sent event.
+
+        Parameters
+        ----------
+        event_type : str
+        data : dict
+        event_id : int or None
+
+        Returns
+        -------
+        str
+        """
+        event = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+        if event_id is not None:
+            event = f"id: {event_id}\n{event}"
+        return event
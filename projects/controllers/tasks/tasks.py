@@ -12,9 +12,12 @@ from typing import Optional
 from fastapi_mail import FastMail, MessageSchema
 from jinja2 import Template
 from sqlalchemy import asc, desc, func
+from sqlalchemy.orm import load_only
 
 from projects import __version__, models, schemas
-from projects.controllers.utils import uuid_alpha
+from projects.controllers.totals import TOTALS
+from projects.controllers.utils import RELEVANCE, decode_cursor, encode_cursor, fulltext_match, \
+    keyset_filter, make_etag, raise_if_view_is_invalid, uuid_alpha, versions_of
 from projects.exceptions import BadRequest, Forbidden, NotFound
 from projects.kubernetes.notebook import (copy_file_to_pod,
                                           get_files_from_task,
@@ -75,6 +78,10 @@ class TaskController:
                    page: Optional[int] = None,
                    page_size: Optional[int] = None,
                    order_by: str = Optional[str],
+                   view: Optional[str] = "full",
+                   cursor: Optional[str] = None,
+                   with_total: Optional[bool] = True,
+                   q: Optional[str] = None,
                    **filters):
         """
         Lists tasks. Supports pagination, and sorting.
@@ -84,52 +91,107 @@ class TaskController:
         page : int
             The page number. First page is 1.
         page_size : int
-            The page size.
+            The page size. Without page or cursor, every task is listed.
         order_by : str
             Order by instruction. Format is "column [asc|desc]".
+        cursor : str or None
+            The nextCursor of the previous page. If given, page is ignored.
+        with_total : bool
+            Whether to count the tasks that match the filters.
+        q : str or None
+            Search words, all of which the name, description or tags must contain.
+            Without order_by, tasks are sorted by relevance.
+        view : str
+            "summary" lists the tasks without their docs, parameters, image,
+            commands and resources.
         **filters : dict
 
         Returns
         -------
-        projects.schemas.task.TaskList
+        projects.schemas.task.TaskList or projects.schemas.task.TaskSummaryList
 
         Raises
         ------
         BadRequest
-            When order_by is invalid.
+            When order_by, cursor or view are invalid.
         """
+        raise_if_view_is_invalid(view)
+
         query = self.session.query(models.Task)
+        if view == "summary":
+            query = query.options(load_only("uuid", "name", "description", "category", "tags", "data_in",
+                                            "data_out", "experiment_notebook_path", "deployment_notebook_path",
+                                            "created_at", "updated_at"))
         query_total = self.session.query(func.count(models.Task.uuid))
 
         for column, value in filters.items():
             query = query.filter(getattr(models.Task, column).ilike(f"%{value}%"))
             query_total = query_total.filter(getattr(models.Task, column).ilike(f"%{value}%"))
 
-        total = query_total.scalar()
+        search = fulltext_match([models.Task.name, models.Task.description, models.Task.tags_text], q)
+        if search is not None:
+            query = query.filter(search)
+            query_total = query_total.filter(search)
+
+        total = None
+        if with_total:
+            total = TOTALS.get_or_count("tasks", {**filters, "q": q}, query_total)
+
+        if cursor:
+            (cursor_column, cursor_sort, value, key) = decode_cursor(cursor, models.Task)
+            if cursor_column == RELEVANCE and search is None:
+                raise BadRequest("Invalid cursor argument")
+            # the cursor was returned for the same order
+            if not order_by:
+                order_by = f"{cursor_column} {cursor_sort}"
 
-        # Default sort is name in ascending order
+        # Default sort is relevance of search results, or name in ascending order
         if not order_by:
-            order_by = "name asc"
+            order_by = f"{RELEVANCE} desc" if search is not None else "name asc"
 
         # Sorts records
         try:
             (column, sort) = order_by.replace('+', ' ').strip().split()
-            assert sort.lower() in ["asc", "desc"]
-            assert column in models.Task.__table__.columns.keys()
+            sort = sort.lower()
+            assert sort in ["asc", "desc"]
+            assert column in models.Task.__table__.columns.keys() or (column == RELEVANCE and search is not None)
         except (AssertionError, ValueError):
             raise BadRequest("Invalid order argument")
 
-        if sort.lower() == "asc":
-            query = query.order_by(asc(getattr(models.Task, column)))
-        elif sort.lower() == "desc":
-            query = query.order_by(desc(getattr(models.Task, column)))
-
-        if page and page_size:
-            # Applies pagination
-            query = query.limit(page_size).offset((page - 1) * page_size)
+        # uuid orders tasks with the same value, so that pages do not overlap
+        direction = asc if sort == "asc" else desc
+        sort_column = search if column == RELEVANCE else getattr(models.Task, column)
+        query = query.order_by(direction(sort_column), direction(models.Task.uuid))
+
+        next_cursor = None
+        if cursor or (page and page_size):
+            # Applies pagination: after the cursor, or at an offset
+            page_size = page_size or 10
+            if cursor:
+                if (cursor_column, cursor_sort) != (column, sort):
+                    raise BadRequest("Invalid cursor argument")
+                query = query.filter(keyset_filter(sort_column, models.Task.uuid, sort, value, key))
+            else:
+                query = query.offset((page - 1) * page_size)
+
+            # one more task tells whether there is a next page
+            tasks = query.limit(page_size + 1).all()
+
+            if len(tasks) > page_size:
+                tasks = tasks[:page_size]
+                last = tasks[-1]
+                if column == RELEVANCE:
+                    # the relevance of a row is not loaded with it
+                    last_value = self.session.query(search).filter(models.Task.uuid == last.uuid).scalar()
+                else:
+                    last_value = getattr(last, column)
+                next_cursor = encode_cursor(column, sort, last_value, last.uuid)
+        else:
+            tasks = query.all()
 
-        tasks = query.all()
-        return schemas.TaskList.from_orm(tasks, total)
+        if view == "summary":
+            return schemas.TaskSummaryList.from_orm(tasks, total, next_cursor)
+        return schemas.TaskList.from_orm(tasks, total, next_cursor)
 
     def generate_name_task(self, name, attempt=1):
         name_task = f"{name} - {attempt}"
@@ -234,10 +296,44 @@ class TaskController:
 
         self.session.add(task)
         self.session.commit()
+        TOTALS.invalidate("tasks")
         self.session.refresh(task)
 
         return schemas.Task.from_orm(task)
 
+    def get_tasks_etag(self):
+        """
+        Builds the ETag of the task catalogue, for any filters and page.
+
+        Returns
+        -------
+        str or None
+            None when a task was just updated.
+        """
+        versions = self.session.query(*versions_of(models.Task)).one()
+        return make_etag(*versions)
+
+    def get_task_etag(self, task_id: str):
+        """
+        Builds the ETag of a task.
+
+        Parameters
+        ----------
+        task_id : str
+
+        Returns
+        -------
+        str or None
+            None when the task does not exist, or was just updated.
+        """
+        updated_at = self.session.query(models.Task.updated_at) \
+            .filter_by(uuid=task_id) \
+            .scalar()
+
+        if updated_at is None:
+            return None
+        return make_etag(updated_at)
+
     def get_task(self, task_id):
         """
         Details a task from our database.
@@ -326,6 +422,7 @@ class TaskController:
 
         self.session.query(models.Task).filter_by(uuid=task_id).update(update_data)
         self.session.commit()
+        TOTALS.invalidate("tasks")
 
         task = self.session.query(models.Task).get(task_id)
 
@@ -365,6 +462,7 @@ class TaskController:
 
         self.session.delete(task)
         self.session.commit()
+        TOTALS.invalidate("tasks")
         return schemas.Message(message="Task deleted")
 
     def raise_if_invalid_docker_image(self, image):
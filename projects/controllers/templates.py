@@ -4,7 +4,7 @@ import re
 from datetime import datetime
 
 from projects import models, schemas
-from projects.controllers.utils import uuid_alpha
+from projects.controllers.utils import make_etag, uuid_alpha, versions_of
 from projects.exceptions import BadRequest, NotFound
 
 NOT_FOUND = NotFound("The specified template does not exist")
@@ -48,6 +48,18 @@ class TemplateController:
 
         return schemas.TemplateList.from_orm(templates, len(templates))
 
+    def get_templates_etag(self):
+        """
+        Builds the ETag of the template catalogue.
+
+        Returns
+        -------
+        str or None
+            None when a template was just updated.
+        """
+        versions = self.session.query(*versions_of(models.Template)).one()
+        return make_etag(*versions)
+
     def create_template(self, template: schemas.TemplateCreate):
         """
         Creates a new template in our database.
@@ -127,6 +139,27 @@ class TemplateController:
 
         return schemas.Template.from_orm(template)
 
+    def get_template_etag(self, template_id: str):
+        """
+        Builds the ETag of a template.
+
+        Parameters
+        ----------
+        template_id : str
+
+        Returns
+        -------
+        str or None
+            None when the template does not exist, or was just updated.
+        """
+        updated_at = self.session.query(models.Template.updated_at) \
+            .filter_by(uuid=template_id) \
+            .scalar()
+
+        if updated_at is None:
+            return None
+        return make_etag(updated_at)
+
     def get_template(self, template_id: str):
         """
         Details a template from our database.
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of the totals of paginated listings.
+
+Counting the rows that match the filters of a listing scans them all, on
+every page. The totals are kept for TOTAL_CACHE_TTL seconds, and dropped
+when the controllers of this process write to the table. Writes of other
+replicas are seen once the TTL expires, so the total may be off by the
+rows written meanwhile.
+"""
+import threading
+import time
+from os import getenv
+
+TOTAL_CACHE_TTL = float(getenv("TOTAL_CACHE_TTL", "30"))
+
+
+class TotalCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # tuples of (total, expires_at) by table, then by filters
+        self.totals = {}
+        # incremented on each invalidation, so that a count that ran
+        # meanwhile is not cached
+        self.generations = {}
+
+    def get_or_count(self, table, filters, query_total):
+        """
+        Returns the cached total of a listing, or counts it.
+
+        Parameters
+        ----------
+        table : str
+        filters : dict
+        query_total : sqlalchemy.orm.query.Query
+            Counts the rows that match the filters.
+
+        Returns
+        -------
+        int
+        """
+        key = tuple(sorted(filters.items()))
+        now = time.monotonic()
+
+        with self.lock:
+            total, expires_at = self.totals.get(table, {}).get(key, (None, 0))
+            generation = self.generations.get(table, 0)
+        if total is not None and now < expires_at:
+            return total
+
+        total = query_total.scalar()
+        with self.lock:
+            if self.generations.get(table, 0) == generation:
+                self.totals.setdefault(table, {})[key] = (total, now + TOTAL_CACHE_TTL)
+        return total
+
+    def invalidate(self, table):
+        """
+        Drops the totals of a table.
+
+        Parameters
+        ----------
+        table : str
+        """
+        with self.lock:
+            self.totals.pop(table, None)
+            self.generations[table] = self.generations.get(table, 0) + 1
+
+
+TOTALS = TotalCache()
@@ -1,13 +1,36 @@
 # -*- coding: utf-8 -*-
 """Shared functions."""
 import base64
+import binascii
 import csv
+import hashlib
+import json
 import random
 import re
 import uuid
+from datetime import datetime, timedelta, timezone
+from os import getenv
 
 import filetype
 import pandas
+from sqlalchemy import DateTime, Float, and_, func, literal, or_, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+
+from projects.exceptions import BadRequest
+
+# Rows updated this many seconds before updatedSince are listed again, and rows updated
+# this many seconds ago get no ETag: updated_at is stored in seconds, and is set
+# before the commit, on clocks that may be skewed
+UPDATED_SINCE_MARGIN = int(getenv("UPDATED_SINCE_MARGIN", "2"))
+
+# "full" lists the nested relationships, "summary" only the columns of the listed rows
+VIEWS = ["full", "summary"]
+
+# Sorts search results by the relevance given by MATCH ... AGAINST, instead of a column
+RELEVANCE = "relevance"
+# FULLTEXT indexes split text in tokens of this many chars (ngram parser's ngram_token_size)
+NGRAM_TOKEN_SIZE = 2
 
 
 def uuid_alpha():
@@ -110,3 +133,237 @@ def parse_file_buffer_to_seldon_request(file):
         return {
             "strData": file.read().decode("utf-8")
         }
+
+
+def updated_since_cutoff(updated_since):
+    """
+    Computes the oldest updated_at listed by a delta request.
+
+    Parameters
+    ----------
+    updated_since : datetime.datetime
+        The serverTime of the previous response.
+
+    Returns
+    -------
+    datetime.datetime
+        In UTC, without timezone, as updated_at is stored.
+    """
+    if updated_since.tzinfo is not None:
+        updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+    return updated_since - timedelta(seconds=UPDATED_SINCE_MARGIN)
+
+
+def versions_of(model, *criteria):
+    """
+    Selects the count and the newest updated_at of the rows of a model, which
+    change when a row is inserted, updated or deleted.
+
+    Parameters
+    ----------
+    model : projects.database.Base
+        A model with an updated_at column.
+    *criteria : sqlalchemy.sql.elements.ClauseElement
+        Filters the rows.
+
+    Returns
+    -------
+    list
+        Two scalar subqueries, to be selected by the query of an ETag.
+    """
+    count = select([func.count()]).select_from(model.__table__)
+    newest = select([func.max(model.updated_at)])
+    if criteria:
+        count = count.where(and_(*criteria))
+        newest = newest.where(and_(*criteria))
+    return [count.as_scalar(), newest.as_scalar()]
+
+
+def make_etag(*versions):
+    """
+    Builds a weak ETag from the versions of the rows a response is read from.
+
+    Parameters
+    ----------
+    *versions
+        Counts and updated_at of the rows.
+
+    Returns
+    -------
+    str or None
+        None while a row was updated less than UPDATED_SINCE_MARGIN seconds ago:
+        updated_at is stored in seconds, so a change later in the same second
+        would keep the same ETag.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=UPDATED_SINCE_MARGIN)
+    if any(isinstance(version, datetime) and version >= cutoff for version in versions):
+        return None
+
+    digest = hashlib.md5(json.dumps(versions, default=str).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def raise_if_view_is_invalid(view):
+    """
+    Raises an exception if the view of a listing is not one of VIEWS.
+
+    Parameters
+    ----------
+    view : str
+
+    Raises
+    ------
+    BadRequest
+    """
+    if view not in VIEWS:
+        raise BadRequest(f"Invalid view argument. Must be one of: {', '.join(VIEWS)}")
+
+
+def encode_cursor(column, sort, value, key):
+    """
+    Encodes the position of the last listed row, after which the next page starts.
+
+    Parameters
+    ----------
+    column : str
+        The sort column.
+    sort : str
+        "asc" or "desc".
+    value : object
+        The value of the sort column in the last row.
+    key : str
+        The uuid of the last row, which orders rows with the same value.
+
+    Returns
+    -------
+    str
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    data = json.dumps([column, sort, value, key]).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(cursor, model):
+    """
+    Decodes a cursor returned by encode_cursor.
+
+    Parameters
+    ----------
+    cursor : str
+    model : projects.database.Base
+        The listed model.
+
+    Returns
+    -------
+    tuple
+        (column, sort, value, key).
+
+    Raises
+    ------
+    BadRequest
+        When the cursor is invalid.
+    """
+    try:
+        column, sort, value, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        assert sort in ["asc", "desc"]
+        if column == RELEVANCE:
+            assert value is None or isinstance(value, (int, float))
+        else:
+            assert column in model.__table__.columns.keys()
+            if value is not None and isinstance(model.__table__.columns[column].type, DateTime):
+                value = datetime.fromisoformat(value)
+    except (AssertionError, ValueError, TypeError, binascii.Error):
+        raise BadRequest("Invalid cursor argument")
+
+    return column, sort, value, key
+
+
+def keyset_filter(column, key_column, sort, value, key):
+    """
+    Filters the rows that come after (value, key) in the order of (column, key_column),
+    as MySQL sorts them: NULL before any value.
+
+    Parameters
+    ----------
+    column : sqlalchemy.Column
+    key_column : sqlalchemy.Column
+        A unique column.
+    sort : str
+        "asc" or "desc".
+    value : object
+    key : str
+
+    Returns
+    -------
+    sqlalchemy.sql.elements.BooleanClauseList
+    """
+    if sort == "asc":
+        after_key = key_column > key
+        if value is None:
+            return or_(and_(column.is_(None), after_key), column.isnot(None))
+        return or_(column > value, and_(column == value, after_key))
+
+    after_key = key_column < key
+    if value is None:
+        return and_(column.is_(None), after_key)
+    return or_(column < value, and_(column == value, after_key), column.is_(None))
+
+
+class FulltextMatch(ColumnElement):
+    """
+    MATCH (columns) AGAINST (terms IN BOOLEAN MODE), which is true for the rows
+    that contain all terms, and sorts them by relevance. The columns must be
+    exactly those of a FULLTEXT index.
+    """
+    type = Float()
+
+    def __init__(self, columns, terms):
+        self.columns = columns
+        self.terms = literal(terms)
+
+    def get_children(self, **kwargs):
+        return [*self.columns, self.terms]
+
+    @property
+    def _from_objects(self):
+        return [from_ for column in self.columns for from_ in column._from_objects]
+
+
+@compiles(FulltextMatch)
+def compile_fulltext_match(element, compiler, **kw):
+    columns = ", ".join(compiler.process(column, **kw) for column in element.columns)
+    terms = compiler.process(element.terms, **kw)
+    return f"MATCH ({columns}) AGAINST ({terms} IN BOOLEAN MODE)"
+
+
+def fulltext_match(columns, q):
+    """
+    Builds the search condition of a q argument: rows that contain every word of q.
+
+    Parameters
+    ----------
+    columns : list
+        The columns of a FULLTEXT index with the ngram parser.
+    q : str or None
+
+    Returns
+    -------
+    FulltextMatch or None
+        None when q has no words.
+    """
+    terms = []
+    # the characters of boolean mode operators separate words
+    for word in re.split(r'[\s+\-<>()~*"@]+', q or ""):
+        if not word:
+            continue
+        if len(word) < NGRAM_TOKEN_SIZE:
+            # words shorter than a token match the tokens they start
+            terms.append(f"+{word}*")
+        else:
+            # a phrase matches the consecutive tokens of the word
+            terms.append(f'+"{word}"')
+
+    if not terms:
+        return None
+    return FulltextMatch(columns, " ".join(terms))
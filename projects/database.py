@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 import os
+import threading
+import time
+import warnings
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Request
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import Session as BaseSession, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.schema import CreateColumn
 
 DB_HOST = os.getenv("MYSQL_DB_HOST", "mysql.platiagro")
 DB_NAME = os.getenv("MYSQL_DB_NAME", "platiagro")
@@ -14,7 +19,179 @@ engine = create_engine(DB_URL,
                        pool_size=32,
                        pool_recycle=300,
                        max_overflow=64)
-Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Comma-separated hosts of read replicas of MYSQL_DB_HOST
+DB_REPLICA_HOSTS = [host.strip() for host in os.getenv("MYSQL_DB_REPLICA_HOSTS", "").split(",") if host.strip()]
+# Replication lag (in seconds) above which a replica is not read
+DB_REPLICA_MAX_LAG = float(os.getenv("MYSQL_DB_REPLICA_MAX_LAG", "1"))
+# Interval (in seconds) between measures of the replication lag of each replica
+DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("MYSQL_DB_REPLICA_LAG_CHECK_INTERVAL", "5"))
+# Timeout (in seconds) of connections to replicas, so an unreachable replica is soon skipped
+DB_REPLICA_CONNECT_TIMEOUT = int(os.getenv("MYSQL_DB_REPLICA_CONNECT_TIMEOUT", "2"))
+
+# HTTP methods whose requests only read, so their sessions may read from replicas
+READ_ONLY_METHODS = {"GET", "HEAD"}
+
+
+class ReplicaSet:
+    """
+    Picks the read replica of a session, in turns, among those whose replication
+    lag is at most DB_REPLICA_MAX_LAG. A replica that can't be measured is not
+    picked until its next measure.
+
+    The lags are measured by a single thread, every DB_REPLICA_LAG_CHECK_INTERVAL,
+    so requests never wait for a measure, and a replica is read by one measure
+    at a time.
+    """
+
+    def __init__(self, engines):
+        self.engines = engines
+        self.lock = threading.Lock()
+        # tuples of (lag, measured_at) by engine
+        self.lags = {}
+        self.turn = 0
+        # monotonic time of the latest commit with writes of this process
+        self.last_write_at = float("-inf")
+        self.thread = None
+        # set once every replica was measured
+        self.measured = threading.Event()
+
+    def pick(self):
+        """
+        Returns a replica that is up to date, or None when the primary must be read.
+
+        Returns
+        -------
+        sqlalchemy.engine.Engine or None
+        """
+        if not self.engines:
+            return None
+
+        now = time.monotonic()
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name="replica-lag", daemon=True)
+                self.thread.start()
+
+            # replicas may not have applied the latest writes yet
+            if now - self.last_write_at < DB_REPLICA_MAX_LAG:
+                return None
+            turn = self.turn
+            self.turn = (turn + 1) % len(self.engines)
+
+            for i in range(len(self.engines)):
+                replica = self.engines[(turn + i) % len(self.engines)]
+                lag, measured_at = self.lags.get(replica, (None, float("-inf")))
+                # a measure that was not renewed in time is not trusted
+                if now - measured_at >= 2 * DB_REPLICA_LAG_CHECK_INTERVAL:
+                    continue
+                if lag is not None and lag <= DB_REPLICA_MAX_LAG:
+                    return replica
+
+        return None
+
+    def run(self):
+        while True:
+            self.measure_lags()
+            time.sleep(DB_REPLICA_LAG_CHECK_INTERVAL)
+
+    def measure_lags(self):
+        """
+        Measures the replication lag of every replica.
+        """
+        for replica in self.engines:
+            measured_at = time.monotonic()
+            lag = self.measure_lag(replica)
+            with self.lock:
+                self.lags[replica] = (lag, measured_at)
+        self.measured.set()
+
+    def measure_lag(self, replica):
+        """
+        Reads the replication lag of a replica.
+
+        Parameters
+        ----------
+        replica : sqlalchemy.engine.Engine
+
+        Returns
+        -------
+        float or None
+            None when the replica is unreachable, or is not replicating.
+        """
+        try:
+            with replica.connect() as conn:
+                status = conn.execute("SHOW SLAVE STATUS").first()
+        except Exception as e:
+            warnings.warn(f"Failed to read the replication lag of {replica.url.host}: {e}")
+            return None
+
+        if status is None or status["Seconds_Behind_Master"] is None:
+            return None
+        return float(status["Seconds_Behind_Master"])
+
+    def record_write(self):
+        """
+        Keeps reads on the primary for DB_REPLICA_MAX_LAG seconds.
+        """
+        with self.lock:
+            self.last_write_at = time.monotonic()
+
+
+REPLICAS = ReplicaSet([
+    create_engine(f"mysql+pymysql://{DB_USER}:{DB_PASS}@{host}/{DB_NAME}",
+                  pool_size=32,
+                  pool_recycle=300,
+                  max_overflow=64,
+                  connect_args={"connect_timeout": DB_REPLICA_CONNECT_TIMEOUT})
+    for host in DB_REPLICA_HOSTS
+])
+
+
+class RoutingSession(BaseSession):
+    """
+    Session that reads from a replica when it is read only, and otherwise
+    reads and writes on the primary. A session that flushes stays on the
+    primary, so that it reads its own writes.
+    """
+
+    def __init__(self, *args, read_only=False, replicas=REPLICAS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_only = read_only
+        self.replicas = replicas
+        self.replica = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.read_only and not self._flushing:
+            # the replica is picked once, so that the reads of a session are consistent
+            if self.replica is None:
+                self.replica = self.replicas.pick()
+                if self.replica is None:
+                    self.read_only = False
+            if self.replica is not None:
+                return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def use_primary(self):
+        """
+        Sends the next reads of the session to the primary.
+        """
+        self.read_only = False
+        self.replica = None
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def stay_on_primary(session, flush_context):
+    session.use_primary()
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def record_write(session):
+    # sessions only commit to write, in flushes or in statements such as bulk updates
+    session.replicas.record_write()
+
+
+Session = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
@@ -32,13 +209,57 @@ def init_db():
     conn.close()
 
     Base.metadata.create_all(bind=engine)
+    create_missing_columns()
+    create_missing_indexes()
 
 
-def session_scope():
+def create_missing_columns():
+    """
+    Adds the columns that were added to models after their tables were
+    created, as create_all only creates missing tables. The columns must be
+    nullable or generated, so that the rows already stored are valid.
+    """
+    inspector = inspect(engine)
+    table_names = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in table_names:
+            continue
+        column_names = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in column_names:
+                column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                engine.execute(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}")
+
+
+def create_missing_indexes():
+    """
+    Creates the indexes that were added to models after their tables were
+    created, as create_all only creates missing tables.
+    """
+    inspector = inspect(engine)
+    table_names = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in table_names:
+            continue
+        index_names = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in index_names:
+                index.create(bind=engine)
+
+
+def session_scope(request: Request = None):
     """
     Provide a transactional scope around a series of operations.
+    The session of a GET or HEAD request reads from a replica, if any is up to date.
+
+    Parameters
+    ----------
+    request : fastapi.Request or None
     """
-    session = Session()
+    read_only = request is not None and request.method in READ_ONLY_METHODS
+    session = Session(read_only=read_only)
     try:
         yield session
     finally:
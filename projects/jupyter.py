@@ -71,3 +71,34 @@ def get_jupyter_notebook(experiment_id, operator_id, notebook_type="Experiment")
         if status_code == 404:
             return {}
         raise HTTPError("Error occured while trying to access Jupyter API.")
+
+
+def get_task_notebook(task_name, notebook_path):
+    """
+    Get JSON content from a task notebook using the JupyterLab API.
+
+    Parameters
+    ----------
+    task_name : str
+    notebook_path : str
+
+    Returns
+    -------
+    dict
+        The notebook content. Empty if the notebook does not exist.
+
+    Raises
+    ------
+    HTTPError
+        When a error occured while trying to access Jupyter API.
+    """
+    try:
+        r = SESSION.get(url=f"{JUPYTER_ENDPOINT}/api/contents/tasks/{task_name}/{notebook_path}").content
+        content = json.loads(r.decode("utf-8"))
+
+        return content
+    except HTTPError as e:
+        status_code = e.response.status_code
+        if status_code == 404:
+            return {}
+        raise HTTPError("Error occured while trying to access Jupyter API.")
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Kubeflow Pipelines data passing through object storage.
+
+By default, every operator of an experiment mounts the same ReadWriteOnce
+volume at /tmp/data, so all steps of a run are scheduled on the node that
+holds the volume. With DATA_PASSING_MODE=object-storage, /tmp/data is local
+to each step instead, and its contents are passed to downstream operators as
+Argo artifacts, which are stored in the artifact repository of Kubeflow
+Pipelines (MinIO). Independent branches then run on any node.
+
+The /tmp/data of an operator holds the data of all operators upstream of it,
+as with the shared volume:
+
+- an operator with one dependency receives the artifact of that dependency;
+- the artifacts of an operator with many dependencies are merged first,
+  by a "data-merge-{operator_id}" step;
+- a final "data-sync" step copies the data of the run to the experiment
+  volume, which is mounted by deployments.
+"""
+from os import getenv
+
+from kfp import dsl
+
+DATA_PASSING_MODE = getenv("DATA_PASSING_MODE", "volume")
+DATA_PASSING_IMAGE = getenv("DATA_PASSING_IMAGE", "busybox")
+
+DATA_ARTIFACT = "data"
+DATA_PATH = "/tmp/data"
+DATA_VOLUME = "tmp-data-local"
+
+
+def is_object_storage_mode():
+    """
+    Returns whether operators exchange /tmp/data through object storage.
+
+    Returns
+    -------
+    bool
+    """
+    return DATA_PASSING_MODE == "object-storage"
+
+
+def create_data_ops(containers, operators, volume_op=None):
+    """
+    Creates the steps that merge the data of operators with many dependencies,
+    and the step that copies the data of the run to the experiment volume.
+
+    Parameters
+    ----------
+    containers : dict
+        Tuples of (operator, container_op) by operator id.
+    operators : list
+    volume_op : kfp.dsl.VolumeOp or None
+        The experiment volume. If None, the data is not copied to a volume.
+
+    Returns
+    -------
+    dict
+        Tuples of (source task, path) by task name: the /tmp/data artifact of
+        each source task is an input of the task, at the given path.
+    """
+    order = {operator.uuid: index for index, operator in enumerate(sort_operators(operators))}
+    sources = {}
+    dependents = set()
+
+    for operator, container_op in containers.values():
+        dependencies = sorted(
+            (dependency_id for dependency_id in operator.dependencies if dependency_id in containers),
+            key=order.get,
+        )
+        dependents.update(dependencies)
+
+        if len(dependencies) == 1:
+            sources[container_op.name] = [(containers[dependencies[0]][1].name, DATA_PATH)]
+        elif len(dependencies) > 1:
+            upstream_ops = [containers[dependency_id][1] for dependency_id in dependencies]
+            merge_op = create_merge_op(f"data-merge-{operator.uuid}", upstream_ops)
+            container_op.after(merge_op)
+            sources[merge_op.name] = merge_sources(upstream_ops)
+            sources[container_op.name] = [(merge_op.name, DATA_PATH)]
+
+    if volume_op is not None:
+        leaves = sorted((i for i in containers if i not in dependents), key=order.get)
+        upstream_ops = [containers[operator_id][1] for operator_id in leaves]
+        sync_op = create_merge_op("data-sync", upstream_ops)
+        sync_op.add_pvolumes({DATA_PATH: volume_op.volume})
+        sources[sync_op.name] = merge_sources(upstream_ops)
+
+    return sources
+
+
+def create_merge_op(name, upstream_ops):
+    """
+    Creates a kfp.dsl.ContainerOp that copies the /tmp/data artifacts
+    of upstream ops, in order, to its /tmp/data.
+
+    Parameters
+    ----------
+    name : str
+    upstream_ops : list
+
+    Returns
+    -------
+    kfp.dsl.ContainerOp
+    """
+    commands = [f"mkdir -p {DATA_PATH}"]
+    commands.extend(f"cp -a /tmp/inputs/{index}/. {DATA_PATH}/" for index in range(len(upstream_ops)))
+
+    merge_op = dsl.ContainerOp(
+        name=name,
+        image=DATA_PASSING_IMAGE,
+        command=["sh", "-c"],
+        arguments=[" && ".join(commands)],
+    )
+    merge_op.container.set_image_pull_policy("IfNotPresent")
+    merge_op.after(*upstream_ops)
+    return merge_op
+
+
+def merge_sources(upstream_ops):
+    """
+    Lists the inputs of a merge op.
+
+    Parameters
+    ----------
+    upstream_ops : list
+
+    Returns
+    -------
+    list
+        Tuples of (source task, path).
+    """
+    return [(upstream_op.name, f"/tmp/inputs/{index}") for index, upstream_op in enumerate(upstream_ops)]
+
+
+def add_data_artifacts(workflow, sources):
+    """
+    Declares the /tmp/data artifacts of a compiled workflow: the outputs of
+    source tasks, and the inputs and arguments of the tasks that use them.
+    Steps whose /tmp/data is not an input get an emptyDir there, so that
+    outputs are collected by any Argo executor.
+
+    Parameters
+    ----------
+    workflow : dict
+    sources : dict
+        As returned by create_data_ops.
+    """
+    templates = {template["name"]: template for template in workflow["spec"]["templates"]}
+    dag = next(template for template in workflow["spec"]["templates"] if "dag" in template)
+    tasks = {task["name"]: task for task in dag["dag"]["tasks"]}
+
+    producers = {source for task_sources in sources.values() for source, _ in task_sources}
+    for name in producers:
+        outputs = templates[tasks[name]["template"]].setdefault("outputs", {})
+        outputs.setdefault("artifacts", []).append({"name": DATA_ARTIFACT, "path": DATA_PATH})
+
+    for name, task_sources in sources.items():
+        task = tasks[name]
+        inputs = templates[task["template"]].setdefault("inputs", {}).setdefault("artifacts", [])
+        arguments = task.setdefault("arguments", {}).setdefault("artifacts", [])
+        for index, (source, path) in enumerate(task_sources):
+            inputs.append({"name": f"{DATA_ARTIFACT}-{index}", "path": path})
+            arguments.append({
+                "name": f"{DATA_ARTIFACT}-{index}",
+                "from": f"{{{{tasks.{source}.outputs.artifacts.{DATA_ARTIFACT}}}}}",
+            })
+
+    local_data = False
+    for name in producers:
+        if any(path == DATA_PATH for _, path in sources.get(name, [])):
+            continue
+        container = templates[tasks[name]["template"]]["container"]
+        container.setdefault("volumeMounts", []).append({"name": DATA_VOLUME, "mountPath": DATA_PATH})
+        local_data = True
+
+    if local_data:
+        workflow["spec"].setdefault("volumes", []).append({"name": DATA_VOLUME, "emptyDir": {}})
+
+
+def sort_operators(operators):
+    """
+    Sorts operators so that each operator comes after its dependencies.
+    Operators that are in a cycle keep their relative order, at the end.
+
+    Parameters
+    ----------
+    operators : list
+
+    Returns
+    -------
+    list
+    """
+    operator_ids = {operator.uuid for operator in operators}
+    remaining = list(operators)
+    visited = set()
+    sorted_operators = []
+
+    while remaining:
+        ready = [
+            operator for operator in remaining
+            if all(d in visited or d not in operator_ids for d in operator.dependencies)
+        ]
+        if not ready:
+            ready = remaining
+        for operator in ready:
+            visited.add(operator.uuid)
+            sorted_operators.append(operator)
+        remaining = [operator for operator in remaining if operator.uuid not in visited]
+
+    return sorted_operators
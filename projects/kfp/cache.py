@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+Kubeflow Pipelines run cache.
+
+Each operator of an experiment run has a fingerprint, which is a hash of
+its task image, commands, notebook content, parameters, dataset and the
+fingerprints of its dependencies. Operators whose fingerprint equals the
+one of an operator that succeeded in the latest run are not scheduled:
+their artifacts are copied from the latest run instead.
+
+Only the latest run is looked up, because a cached operator relies on the
+files it wrote to the experiment volume (/tmp/data), which are replaced
+whenever the operator runs again.
+"""
+import hashlib
+import json
+import warnings
+from os import getenv
+
+from minio.error import MinioError
+from requests.exceptions import RequestException
+
+from projects.exceptions import BadRequest
+from projects.jupyter import get_task_notebook
+from projects.object_storage import copy_objects
+
+RUN_CACHE_ENABLED = getenv("RUN_CACHE_ENABLED", "true").lower() == "true"
+
+# Pod annotation with the fingerprint of an operator
+FINGERPRINT_ANNOTATION = "fingerprint"
+# Workflow annotation with the operators that were not scheduled
+CACHED_OPERATORS_ANNOTATION = "cached-operators"
+
+
+def fingerprint_operators(operators, dataset):
+    """
+    Computes the fingerprint of each operator.
+
+    Parameters
+    ----------
+    operators : list
+    dataset : str or None
+
+    Returns
+    -------
+    dict
+        The fingerprints by operator id. The fingerprint is None when it could
+        not be computed (eg. the notebook is unavailable), so the operator
+        is never cached.
+    """
+    operators_by_id = {operator.uuid: operator for operator in operators}
+    notebook_hashes = {}
+    fingerprints = {}
+
+    def fingerprint(operator, visiting):
+        if operator.uuid in fingerprints:
+            return fingerprints[operator.uuid]
+
+        if operator.uuid in visiting:
+            # pipelines with cycles are not cached
+            return None
+        visiting.add(operator.uuid)
+
+        upstream = []
+        for dependency_id in operator.dependencies or []:
+            dependency = operators_by_id.get(dependency_id)
+            upstream.append(fingerprint(dependency, visiting) if dependency is not None else None)
+
+        task = operator.task
+        if task.uuid not in notebook_hashes:
+            notebook_hashes[task.uuid] = hash_notebook(task.name, task.experiment_notebook_path)
+
+        value = None
+        if notebook_hashes[task.uuid] is not None and None not in upstream:
+            value = hash_json({
+                "image": task.image,
+                "commands": task.commands,
+                "arguments": task.arguments,
+                "notebook": notebook_hashes[task.uuid],
+                "parameters": operator.parameters,
+                "dataset": dataset,
+                "upstream": sorted(upstream),
+            })
+
+        fingerprints[operator.uuid] = value
+        return value
+
+    for operator in operators:
+        fingerprint(operator, set())
+
+    return fingerprints
+
+
+def hash_notebook(task_name, notebook_path):
+    """
+    Hashes the source of the cells of a task notebook.
+    Outputs and metadata are ignored, as they change whenever the notebook runs.
+
+    Parameters
+    ----------
+    task_name : str
+    notebook_path : str or None
+
+    Returns
+    -------
+    str or None
+        None if the notebook is unavailable.
+    """
+    if notebook_path is None:
+        return None
+
+    try:
+        notebook = get_task_notebook(task_name, notebook_path)
+    except (RequestException, ValueError):
+        # ValueError: the response is not JSON, such as the error page of a proxy
+        warnings.warn(f"Notebook of task {task_name} is unavailable. Skipping run cache.")
+        return None
+
+    cells = notebook.get("content", {}).get("cells") if notebook else None
+    if cells is None:
+        return None
+
+    return hash_json([(cell.get("cell_type"), cell.get("source")) for cell in cells])
+
+
+def hash_json(value):
+    """
+    Hashes a JSON-serializable value.
+
+    Parameters
+    ----------
+    value : object
+
+    Returns
+    -------
+    str
+    """
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+def find_cached_operators(operators, fingerprints, run_id, workflow_manifest):
+    """
+    Finds operators that succeeded in the latest run with the same fingerprint.
+
+    Parameters
+    ----------
+    operators : list
+    fingerprints : dict
+    run_id : str
+        The latest run id.
+    workflow_manifest : dict
+        The workflow manifest of the latest run.
+
+    Returns
+    -------
+    dict
+        The cached operators by operator id, with the run id of their artifacts,
+        their fingerprint, task id and parameters.
+    """
+    succeeded = get_succeeded_fingerprints(workflow_manifest)
+
+    cached_operators = {}
+    for operator in operators:
+        fingerprint = fingerprints.get(operator.uuid)
+        if fingerprint is not None and succeeded.get(operator.uuid) == fingerprint:
+            cached_operators[operator.uuid] = {
+                "runId": run_id,
+                "fingerprint": fingerprint,
+                "taskId": operator.task_id,
+                "parameters": operator.parameters,
+            }
+
+    return cached_operators
+
+
+def find_reused_operators(operators, scheduled_ids, run_id, workflow_manifest):
+    """
+    Finds the operators whose outputs are reused from the latest run
+    in a partial run, which only schedules some operators. These are the
+    operators the scheduled ones depend on; the other operators are not
+    part of the partial run.
+
+    Parameters
+    ----------
+    operators : list
+    scheduled_ids : set
+        The operators that are scheduled.
+    run_id : str
+        The latest run id.
+    workflow_manifest : dict
+        The workflow manifest of the latest run.
+
+    Returns
+    -------
+    dict
+        The reused operators by operator id, in the same format as cached operators.
+
+    Raises
+    ------
+    BadRequest
+        When an operator upstream of a scheduled one did not succeed in the latest run.
+    """
+    succeeded = get_succeeded_fingerprints(workflow_manifest)
+
+    reused_ids = list_upstream(operators, scheduled_ids) - scheduled_ids
+    for operator_id in reused_ids:
+        if operator_id not in succeeded:
+            raise BadRequest(f"The operator {operator_id} did not succeed in the latest run")
+
+    reused_operators = {}
+    for operator in operators:
+        if operator.uuid in reused_ids:
+            reused_operators[operator.uuid] = {
+                "runId": run_id,
+                "fingerprint": succeeded[operator.uuid],
+                "taskId": operator.task_id,
+                "parameters": operator.parameters,
+            }
+
+    return reused_operators
+
+
+def list_partial_run_operators(operators, scheduled_ids, reused_operators):
+    """
+    Lists the operators of a partial run: the scheduled operators and the
+    operators whose outputs they reuse. Other operators, such as a sibling
+    branch, are left out of the pipeline, even if they did not succeed in
+    the latest run.
+
+    Parameters
+    ----------
+    operators : list
+    scheduled_ids : set
+    reused_operators : dict
+        See find_reused_operators.
+
+    Returns
+    -------
+    list
+    """
+    return [
+        operator for operator in operators
+        if operator.uuid in scheduled_ids or operator.uuid in reused_operators
+    ]
+
+
+def list_upstream(operators, operator_ids):
+    """
+    Lists operators and all operators they depend on.
+
+    Parameters
+    ----------
+    operators : list
+    operator_ids : set
+
+    Returns
+    -------
+    set
+    """
+    dependencies = {operator.uuid: operator.dependencies or [] for operator in operators}
+
+    upstream = set()
+    pending = list(operator_ids)
+    while pending:
+        operator_id = pending.pop()
+        if operator_id not in upstream:
+            upstream.add(operator_id)
+            pending.extend(dependencies.get(operator_id, []))
+
+    return upstream
+
+
+def list_downstream(operators, operator_ids):
+    """
+    Lists operators and all operators that depend on them.
+
+    Parameters
+    ----------
+    operators : list
+    operator_ids : set
+
+    Returns
+    -------
+    set
+    """
+    dependents = {}
+    for operator in operators:
+        for dependency_id in operator.dependencies or []:
+            dependents.setdefault(dependency_id, []).append(operator.uuid)
+
+    downstream = set()
+    pending = list(operator_ids)
+    while pending:
+        operator_id = pending.pop()
+        if operator_id not in downstream:
+            downstream.add(operator_id)
+            pending.extend(dependents.get(operator_id, []))
+
+    return downstream
+
+
+def get_succeeded_fingerprints(workflow_manifest):
+    """
+    Lists the fingerprints of the operators that succeeded in a run,
+    including those that were cached.
+
+    Parameters
+    ----------
+    workflow_manifest : dict
+
+    Returns
+    -------
+    dict
+        The fingerprints by operator id. The fingerprint is None for operators
+        of runs that did not have fingerprints.
+    """
+    fingerprints = {
+        operator_id: cached["fingerprint"]
+        for operator_id, cached in get_cached_operators(workflow_manifest).items()
+    }
+
+    templates = {template["name"]: template for template in workflow_manifest["spec"]["templates"]}
+    for node in workflow_manifest["status"].get("nodes", {}).values():
+        if node.get("type") != "Pod" or node.get("phase") != "Succeeded":
+            continue
+
+        template = templates.get(node.get("templateName"), {})
+        annotations = template.get("metadata", {}).get("annotations", {})
+        fingerprints[node["displayName"]] = annotations.get(FINGERPRINT_ANNOTATION)
+
+    return fingerprints
+
+
+def get_cached_operators(workflow_manifest):
+    """
+    Lists the operators that were not scheduled in a run, as they were cached.
+
+    Parameters
+    ----------
+    workflow_manifest : dict
+
+    Returns
+    -------
+    dict
+        The cached operators by operator id.
+    """
+    annotations = workflow_manifest["metadata"].get("annotations", {})
+    return json.loads(annotations.get(CACHED_OPERATORS_ANNOTATION, "{}"))
+
+
+def copy_cached_artifacts(experiment_id, cached_operators, run_id):
+    """
+    Copies the artifacts (figures, metrics, ...) of cached operators to a run.
+
+    Parameters
+    ----------
+    experiment_id : str
+    cached_operators : dict
+    run_id : str
+    """
+    for operator_id, cached in cached_operators.items():
+        prefix = f"experiments/{experiment_id}/operators/{operator_id}"
+        try:
+            copy_objects(
+                source_prefix=f"{prefix}/{cached['runId']}/",
+                destination_prefix=f"{prefix}/{run_id}/",
+            )
+        except MinioError as e:
+            warnings.warn(f"Failed to copy artifacts of operator {operator_id}: {e}")
@@ -1,15 +1,23 @@
 # -*- coding: utf-8 -*-
 """Kubeflow Pipelines interface."""
-from collections import defaultdict
+import hashlib
+import inspect
+import tempfile
+import threading
+from collections import OrderedDict, defaultdict
 from json import dumps, loads
-from os import getenv
+from os import getenv, path
 
+import yaml
 from kfp import compiler, dsl
 from kubernetes import client as k8s_client
 from kubernetes.client.models import V1PersistentVolumeClaim
 
 from projects import __version__
 from projects.kfp import KF_PIPELINES_NAMESPACE, kfp_client
+from projects.kfp.artifacts import add_data_artifacts, create_data_ops, \
+    is_object_storage_mode
+from projects.kfp.cache import CACHED_OPERATORS_ANNOTATION, FINGERPRINT_ANNOTATION
 from projects.kfp.templates import COMPONENT_SPEC, GRAPH, SELDON_DEPLOYMENT
 from projects.kubernetes.utils import volume_exists
 from projects.object_storage import MINIO_ENDPOINT
@@ -26,10 +34,24 @@ SELDON_LOGGER_ENDPOINT = getenv(
     "http://projects.platiagro:8080",
 )
 
-
-def compile_pipeline(name, operators, project_id, experiment_id, deployment_id, deployment_name):
+# Compiled pipelines, by hash of everything the compilation depends on
+PIPELINE_CACHE_SIZE = int(getenv("PIPELINE_CACHE_SIZE", "128"))
+PIPELINE_CACHE = OrderedDict()
+PIPELINE_CACHE_LOCK = threading.Lock()
+
+
+def compile_pipeline(name,
+                     operators,
+                     project_id,
+                     experiment_id,
+                     deployment_id,
+                     deployment_name,
+                     fingerprints=None,
+                     cached_operators=None,
+                     sweep_parameters=None):
     """
-    Compile the pipeline in a .yaml file.
+    Compile the pipeline into a workflow yaml.
+    Pipelines are cached, so an unchanged pipeline is compiled only once.
 
     Parameters
     ----------
@@ -39,11 +61,55 @@ def compile_pipeline(name, operators, project_id, experiment_id, deployment_id,
     experiment_id : str
     deployment_id : str or None
     deployment_name : str
+    fingerprints : dict or None
+        The fingerprints by operator id, set as pod annotations.
+    cached_operators : dict or None
+        Operators that are not scheduled, as their results are reused.
+    sweep_parameters : dict or None
+        Names of parameters by operator id, which are set per run as pipeline
+        parameters (see list_sweep_parameters). Each run then gets its own
+        data volume, so that runs of a sweep do not share files.
+
+    Returns
+    -------
+    str
+        The pipeline package, as yaml.
     """
-    @dsl.pipeline(name=name)
-    def pipeline_func():
+    key = hash_pipeline(name=name,
+                        operators=operators,
+                        project_id=project_id,
+                        experiment_id=experiment_id,
+                        deployment_id=deployment_id,
+                        deployment_name=deployment_name,
+                        fingerprints=fingerprints,
+                        cached_operators=cached_operators,
+                        sweep_parameters=sweep_parameters)
+
+    fingerprints = fingerprints or {}
+    cached_operators = cached_operators or {}
+    pipeline_parameters = list_sweep_parameters(sweep_parameters or {})
+
+    # deployments always read the experiment volume
+    object_storage = is_object_storage_mode() and deployment_id is None
+    data_sources = {}
+
+    with PIPELINE_CACHE_LOCK:
+        if key in PIPELINE_CACHE:
+            PIPELINE_CACHE.move_to_end(key)
+            return PIPELINE_CACHE[key]
+
+    def pipeline_func(*args):
+        # Pipeline parameters of each operator, by parameter name
+        params = defaultdict(dict)
+        for (operator_id, parameter_name, _), param in zip(pipeline_parameters, args):
+            params[operator_id][parameter_name] = param
+
         # Creates a volume to share data among container_ops
-        volume_op_tmp_data = create_volume_op(name=f"tmp-data-{experiment_id}")
+        # (in object storage mode, it only receives the data of the run for deployments)
+        volume_op_tmp_data = None
+        if not object_storage or sweep_parameters is None:
+            volume_op_tmp_data = create_volume_op(name=f"tmp-data-{experiment_id}",
+                                                  run_scoped=sweep_parameters is not None)
 
         # Gets dataset from any operator that has a dataset
         dataset = get_dataset(operators)
@@ -51,6 +117,9 @@ def compile_pipeline(name, operators, project_id, experiment_id, deployment_id,
         # Creates a container_op for each operator
         containers = {}
         for operator in operators:
+            if operator.uuid in cached_operators:
+                continue
+
             if deployment_id is not None:
                 notebook_path = operator.task.deployment_notebook_path
             else:
@@ -59,7 +128,9 @@ def compile_pipeline(name, operators, project_id, experiment_id, deployment_id,
             container_op = create_container_op(operator=operator,
                                                experiment_id=experiment_id,
                                                notebook_path=notebook_path,
-                                               dataset=dataset)
+                                               dataset=dataset,
+                                               fingerprint=fingerprints.get(operator.uuid),
+                                               params=params[operator.uuid])
             containers[operator.uuid] = (operator, container_op)
 
         if deployment_id is not None:
@@ -72,11 +143,17 @@ def compile_pipeline(name, operators, project_id, experiment_id, deployment_id,
 
         # Sets dependencies for each container_op
         for operator, container_op in containers.values():
-            dependencies = [containers[dependency_id][1] for dependency_id in operator.dependencies]
+            # cached dependencies are not scheduled
+            dependencies = [
+                containers[dependency_id][1]
+                for dependency_id in operator.dependencies
+                if dependency_id in containers
+            ]
             container_op.after(*dependencies)
 
             # data volume
-            container_op.add_pvolumes({"/tmp/data": volume_op_tmp_data.volume})
+            if not object_storage:
+                container_op.add_pvolumes({"/tmp/data": volume_op_tmp_data.volume})
 
             # task volume
             volume_op_home_jovyan = create_volume_op(name=f"task-{operator.task_id}")
@@ -85,29 +162,147 @@ def compile_pipeline(name, operators, project_id, experiment_id, deployment_id,
             if deployment_id is not None:
                 resource_op.after(container_op)
 
-    compiler.Compiler() \
-        .compile(pipeline_func, f"{name}.yaml")
+        if object_storage:
+            data_sources.update(create_data_ops(containers, operators, volume_op_tmp_data))
+
+    # Each pipeline parameter is an argument of the pipeline function
+    pipeline_func.__signature__ = inspect.Signature([
+        inspect.Parameter(pipeline_parameter, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+        for _, _, pipeline_parameter in pipeline_parameters
+    ])
+    pipeline_func = dsl.pipeline(name=name)(pipeline_func)
+
+    # Compiles in a private directory, so that concurrent compilations
+    # of the same pipeline do not share a file
+    with tempfile.TemporaryDirectory() as tmpdir:
+        package_path = path.join(tmpdir, f"{name}.yaml")
+        compiler.Compiler() \
+            .compile(pipeline_func, package_path)
+
+        with open(package_path) as f:
+            package = f.read()
+
+    if cached_operators or data_sources:
+        workflow = yaml.safe_load(package)
+        if cached_operators:
+            workflow["metadata"]["annotations"][CACHED_OPERATORS_ANNOTATION] = dumps(cached_operators)
+        if data_sources:
+            add_data_artifacts(workflow, data_sources)
+        package = yaml.safe_dump(workflow)
+
+    with PIPELINE_CACHE_LOCK:
+        PIPELINE_CACHE[key] = package
+        while len(PIPELINE_CACHE) > PIPELINE_CACHE_SIZE:
+            PIPELINE_CACHE.popitem(last=False)
+
+    return package
+
+
+def hash_pipeline(name,
+                  operators,
+                  project_id,
+                  experiment_id,
+                  deployment_id,
+                  deployment_name,
+                  fingerprints=None,
+                  cached_operators=None,
+                  sweep_parameters=None):
+    """
+    Hashes everything the compilation of a pipeline depends on: its operators,
+    their tasks (images, commands, resources), parameters and dependencies,
+    whether it is a deployment, which operators are cached and which
+    parameters are swept.
 
+    Parameters
+    ----------
+    name : str
+    operators : list
+    project_id : str
+    experiment_id : str
+    deployment_id : str or None
+    deployment_name : str
+    fingerprints : dict or None
+    cached_operators : dict or None
+    sweep_parameters : dict or None
+
+    Returns
+    -------
+    str
+    """
+    pipeline = {
+        "name": name,
+        "projectId": project_id,
+        "experimentId": experiment_id,
+        "deploymentId": deployment_id,
+        "deploymentName": deployment_name,
+        "fingerprints": fingerprints,
+        "cachedOperators": cached_operators,
+        "sweepParameters": sweep_parameters,
+        "objectStorage": is_object_storage_mode(),
+        "operators": [
+            {
+                "uuid": operator.uuid,
+                "dependencies": operator.dependencies,
+                "parameters": operator.parameters,
+                "task": {
+                    "uuid": operator.task.uuid,
+                    "name": operator.task.name,
+                    "image": operator.task.image,
+                    "commands": operator.task.commands,
+                    "arguments": operator.task.arguments,
+                    "parameters": operator.task.parameters,
+                    "experimentNotebookPath": operator.task.experiment_notebook_path,
+                    "deploymentNotebookPath": operator.task.deployment_notebook_path,
+                    "cpuLimit": operator.task.cpu_limit,
+                    "cpuRequest": operator.task.cpu_request,
+                    "memoryLimit": operator.task.memory_limit,
+                    "memoryRequest": operator.task.memory_request,
+                    "readinessProbeInitialDelaySeconds": operator.task.readiness_probe_initial_delay_seconds,
+                },
+            }
+            for operator in operators
+        ],
+    }
+
+    if deployment_id is not None:
+        # the seldondeployment mounts the experiment volume if it exists
+        pipeline["experimentVolume"] = volume_exists(f"vol-tmp-data-{experiment_id}", KF_PIPELINES_NAMESPACE)
 
-def create_volume_op(name):
+    return hashlib.sha256(dumps(pipeline, sort_keys=True).encode()).hexdigest()
+
+
+def create_volume_op(name, run_scoped=False):
     """
     Creates a kfp.dsl.VolumeOp container.
 
     Parameters
     ----------
     name : str
+    run_scoped : bool
+        Whether each run gets its own volume, which is deleted with the workflow.
 
     Returns
     -------
     kfp.dsl.ContainerOp
     """
+    metadata = {
+        "name": f"vol-{name}",
+        "namespace": KF_PIPELINES_NAMESPACE,
+    }
+
+    if run_scoped:
+        metadata["name"] = f"vol-{name}-{dsl.RUN_ID_PLACEHOLDER}"
+        metadata["ownerReferences"] = [{
+            "apiVersion": "argoproj.io/v1alpha1",
+            "kind": "Workflow",
+            "name": "{{workflow.name}}",
+            "uid": "{{workflow.uid}}",
+        }]
+
     pvc = V1PersistentVolumeClaim(
         api_version="v1",
         kind="PersistentVolumeClaim",
-        metadata={
-            "name": f"vol-{name}",
-            "namespace": KF_PIPELINES_NAMESPACE,
-        },
+        metadata=metadata,
         spec={
             "accessModes": ["ReadWriteOnce"],
             "resources": {
@@ -144,6 +339,8 @@ def create_container_op(operator, experiment_id, **kwargs):
     """
     notebook_path = kwargs.get("notebook_path")
     dataset = kwargs.get("dataset")
+    fingerprint = kwargs.get("fingerprint")
+    params = kwargs.get("params") or {}
 
     container_op = dsl.ContainerOp(
         name=operator.uuid,
@@ -154,6 +351,9 @@ def create_container_op(operator, experiment_id, **kwargs):
 
     container_op.add_pod_annotation(name="name", value=operator.task.name)
 
+    if fingerprint is not None:
+        container_op.add_pod_annotation(name=FINGERPRINT_ANNOTATION, value=fingerprint)
+
     container_op.container.set_image_pull_policy("IfNotPresent") \
         .add_env_variable(
             k8s_client.V1EnvVar(
@@ -225,17 +425,15 @@ def create_container_op(operator, experiment_id, **kwargs):
             ),
         )
 
-    for name, value in operator.parameters.items():
-        # format multipe parameter
-        task_parameter = get_task_parameter(operator.task.parameters, name)
-        if task_parameter:
-            parameter_multiple = task_parameter.get('multiple', False)
-            if parameter_multiple and (value is None or not value):
-                value = []
-        if value is not None:
-            # fix for: cannot unmarshal number into
-            # Go struct field EnvVar.value of type string
-            value = dumps(value)
+    parameters = dict(operator.parameters)
+    parameters.update(params)
+
+    for name, value in parameters.items():
+        if name in params:
+            # pipeline params are formatted when the run is submitted
+            value = params[name]
+        else:
+            value = format_parameter(operator.task.parameters, name, value)
         container_op.container \
             .add_env_variable(
                 k8s_client.V1EnvVar(
@@ -430,6 +628,58 @@ def mount_volume_from_experiment(sdep_resource, experiment_id):
     return sdep_resource
 
 
+def format_parameter(task_parameters, name, value):
+    """
+    Formats the value of a parameter as an environment variable value.
+
+    Parameters
+    ----------
+    task_parameters : list
+    name : str
+    value : object
+
+    Returns
+    -------
+    str or None
+    """
+    # format multipe parameter
+    task_parameter = get_task_parameter(task_parameters, name)
+    if task_parameter:
+        parameter_multiple = task_parameter.get('multiple', False)
+        if parameter_multiple and (value is None or not value):
+            value = []
+    if value is not None:
+        # fix for: cannot unmarshal number into
+        # Go struct field EnvVar.value of type string
+        value = dumps(value)
+    return value
+
+
+def list_sweep_parameters(sweep_parameters):
+    """
+    Lists the pipeline parameters of a sweep, in a stable order.
+
+    Parameters
+    ----------
+    sweep_parameters : dict
+        Names of parameters by operator id.
+
+    Returns
+    -------
+    list
+        Tuples of (operator_id, parameter_name, pipeline_parameter).
+    """
+    parameters = sorted(
+        (operator_id, name)
+        for operator_id, names in sweep_parameters.items()
+        for name in names
+    )
+    return [
+        (operator_id, name, f"parameter_{i}")
+        for i, (operator_id, name) in enumerate(parameters)
+    ]
+
+
 def get_task_parameter(task_parameters, name):
     """
     Get task parameter.
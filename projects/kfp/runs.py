@@ -2,11 +2,19 @@
 """Kubeflow Pipelines Runs interface."""
 import json
 import os
+import re
+import tempfile
 from datetime import datetime
 
 from projects.exceptions import BadRequest
 from projects.kfp import kfp_client
-from projects.kfp.pipeline import compile_pipeline
+from projects.kfp.artifacts import is_object_storage_mode
+from projects.kfp.cache import RUN_CACHE_ENABLED, copy_cached_artifacts, \
+    find_cached_operators, find_reused_operators, fingerprint_operators, \
+    get_cached_operators, list_downstream, list_partial_run_operators
+from projects.kfp.pipeline import compile_pipeline, get_dataset
+
+PIPELINE_PARAM_REGEX = re.compile(r"\{\{inputs\.parameters\.([\w-]+)\}\}")
 
 
 def list_runs(experiment_id):
@@ -47,10 +55,22 @@ def list_runs(experiment_id):
     return runs
 
 
-def start_run(operators, project_id, experiment_id, deployment_id=None, deployment_name=None):
+def start_run(operators,
+              project_id,
+              experiment_id,
+              deployment_id=None,
+              deployment_name=None,
+              start_from=None,
+              only=None):
     """
     Start a new run in Kubeflow Pipelines.
 
+    Operators whose inputs did not change since the latest run are not
+    scheduled (see projects.kfp.cache). When start_from or only is set,
+    only those operators are scheduled: the outputs of the operators they
+    depend on are reused from the latest run, and the other operators are
+    left out of the pipeline.
+
     Parameters
     ----------
     operators : list
@@ -58,11 +78,21 @@ def start_run(operators, project_id, experiment_id, deployment_id=None, deployme
     experiment_id : str
     deployment_id : str or None
     deployment_name : str or None
+    start_from : str or None
+        Schedules only this operator and the operators downstream of it.
+    only : list or None
+        Schedules only these operators.
 
     Returns
     -------
     dict
         The run attributes.
+
+    Raises
+    ------
+    BadRequest
+        When start_from or only is set and there is no previous run, or an
+        operator upstream of them did not succeed in the latest run.
     """
     if len(operators) == 0:
         raise ValueError("Necessary at least one operator")
@@ -75,12 +105,52 @@ def start_run(operators, project_id, experiment_id, deployment_id=None, deployme
     if not deployment_name:
         deployment_name = deployment_id
 
-    compile_pipeline(name=name,
-                     operators=operators,
-                     project_id=project_id,
-                     experiment_id=experiment_id,
-                     deployment_id=deployment_id,
-                     deployment_name=deployment_name)
+    fingerprints = None
+    cached_operators = None
+    # in object storage mode, the outputs of the latest run are not available to the next one
+    if deployment_id is None and is_object_storage_mode():
+        if start_from is not None or only is not None:
+            raise BadRequest("Partial runs require the volume data passing mode")
+    elif deployment_id is None:
+        if RUN_CACHE_ENABLED:
+            fingerprints = fingerprint_operators(operators, get_dataset(operators))
+
+        latest_run_id = None
+        if RUN_CACHE_ENABLED or start_from is not None or only is not None:
+            latest_run_id = get_latest_run_id(experiment_id)
+
+        if latest_run_id is not None:
+            latest_workflow_manifest = get_workflow_manifest(latest_run_id)
+
+        if start_from is not None or only is not None:
+            if latest_run_id is None:
+                raise BadRequest("A partial run requires a previous run")
+
+            # the selected operators always run, even if unchanged
+            scheduled_ids = list_downstream(operators, {start_from}) if start_from else set(only)
+            cached_operators = find_reused_operators(
+                operators=operators,
+                scheduled_ids=scheduled_ids,
+                run_id=latest_run_id,
+                workflow_manifest=latest_workflow_manifest,
+            )
+            operators = list_partial_run_operators(operators, scheduled_ids, cached_operators)
+        elif latest_run_id is not None:
+            cached_operators = find_cached_operators(
+                operators=operators,
+                fingerprints=fingerprints,
+                run_id=latest_run_id,
+                workflow_manifest=latest_workflow_manifest,
+            )
+
+    package = compile_pipeline(name=name,
+                               operators=operators,
+                               project_id=project_id,
+                               experiment_id=experiment_id,
+                               deployment_id=deployment_id,
+                               deployment_name=deployment_name,
+                               fingerprints=fingerprints,
+                               cached_operators=cached_operators)
 
     if deployment_id is not None:
         kfp_experiment = kfp_client().create_experiment(name=deployment_id)
@@ -90,16 +160,72 @@ def start_run(operators, project_id, experiment_id, deployment_id=None, deployme
     tag = datetime.utcnow().strftime("%Y-%m-%d %H-%M-%S")
 
     job_name = f"{name}-{tag}"
-    pipeline_package_path = f"{name}.yaml"
-    run = kfp_client().run_pipeline(
-        experiment_id=kfp_experiment.id,
-        job_name=job_name,
-        pipeline_package_path=pipeline_package_path,
-    )
-    os.remove(pipeline_package_path)
+
+    # kfp client reads the package from a file
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline_package_path = os.path.join(tmpdir, f"{name}.yaml")
+        with open(pipeline_package_path, "w") as f:
+            f.write(package)
+
+        run = kfp_client().run_pipeline(
+            experiment_id=kfp_experiment.id,
+            job_name=job_name,
+            pipeline_package_path=pipeline_package_path,
+        )
+
+    if cached_operators:
+        copy_cached_artifacts(experiment_id, cached_operators, run.id)
+
     return get_run(run.id, experiment_id)
 
 
+def raise_if_partial_run_is_invalid(operators, experiment_id, start_from=None, only=None):
+    """
+    Raises an exception if a partial run can not reuse the outputs of the
+    latest run, as start_run would when the run is started.
+
+    Parameters
+    ----------
+    operators : list
+    experiment_id : str
+    start_from : str or None
+    only : list or None
+
+    Raises
+    ------
+    BadRequest
+        When there is no previous run, or an operator upstream of the
+        scheduled ones did not succeed in the latest run.
+    """
+    latest_run_id = get_latest_run_id(experiment_id)
+    if latest_run_id is None:
+        raise BadRequest("A partial run requires a previous run")
+
+    scheduled_ids = list_downstream(operators, {start_from}) if start_from else set(only)
+    find_reused_operators(
+        operators=operators,
+        scheduled_ids=scheduled_ids,
+        run_id=latest_run_id,
+        workflow_manifest=get_workflow_manifest(latest_run_id),
+    )
+
+
+def get_workflow_manifest(run_id):
+    """
+    Reads the workflow manifest of a run.
+
+    Parameters
+    ----------
+    run_id : str
+
+    Returns
+    -------
+    dict
+    """
+    run = kfp_client().get_run(run_id=run_id)
+    return json.loads(run.pipeline_runtime.workflow_manifest)
+
+
 def get_run(run_id, experiment_id):
     """
     Details a run in Kubeflow Pipelines.
@@ -139,22 +265,39 @@ def get_run(run_id, experiment_id):
 
     # initializes all operators with status=Pending and parameters={}
     template = next(t for t in workflow_manifest["spec"]["templates"] if "dag" in t)
-    tasks = (tsk for tsk in template["dag"]["tasks"] if not tsk["name"].startswith("vol-"))
+    # volumes and data passing steps are not operators
+    tasks = (tsk for tsk in template["dag"]["tasks"] if not tsk["name"].startswith(("vol-", "data-")))
     operators = dict((t["name"], {"status": default_node_status, "parameters": {}}) for t in tasks)
 
+    # operators that were not scheduled, as their results were reused
+    for operator_id, cached in get_cached_operators(workflow_manifest).items():
+        operators[operator_id] = {
+            "status": "Cached",
+            "taskId": cached["taskId"],
+            "parameters": cached["parameters"],
+        }
+
     # set status for each operator
     for node in workflow_manifest["status"].get("nodes", {}).values():
         if node["displayName"] in operators:
             operator_id = node["displayName"]
             operators[operator_id]["status"] = get_status(node)
 
+    # values of pipeline params (eg. swept parameters)
+    arguments = {
+        param["name"]: param.get("value")
+        for param in workflow_manifest["spec"].get("arguments", {}).get("parameters", [])
+    }
+
     # sets taskId and parameters for each operator
     for template in workflow_manifest["spec"]["templates"]:
         operator_id = template["name"]
+        if operator_id not in operators:
+            continue
         if "inputs" in template and "parameters" in template["inputs"]:
             operators[operator_id]["taskId"] = get_task_id(template)
         if "container" in template and "env" in template["container"]:
-            operators[operator_id]["parameters"] = get_parameters(template)
+            operators[operator_id]["parameters"] = get_parameters(template, arguments)
 
     return {
         "uuid": kfp_run.run.id,
@@ -276,13 +419,15 @@ def get_task_id(template):
             return name[len(prefix):len(name)-len(suffix)]
 
 
-def get_parameters(template):
+def get_parameters(template, arguments=None):
     """
     Builds a dict of parameters from a workflow manifest.
 
     Parameters
     ----------
     template : dict
+    arguments : dict or None
+        Values of the pipeline params, by name.
 
     Returns
     -------
@@ -298,6 +443,11 @@ def get_parameters(template):
         if name.startswith(prefix):
             name = name[len(prefix):]
 
+            # value of a pipeline param, set when the run was submitted
+            match = PIPELINE_PARAM_REGEX.fullmatch(value or "")
+            if match is not None and arguments is not None:
+                value = arguments.get(match.group(1))
+
             if value is not None:
                 value = json.loads(value)
 
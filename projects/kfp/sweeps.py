@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Kubeflow Pipelines parameter sweeps.
+
+A sweep runs the pipeline of an experiment once per parameter set. The
+pipeline is compiled once, with the swept parameters as pipeline params,
+and each run sets their values when it is submitted. The runs are queued
+by the experiment runs scheduler, and those it dispatches together are
+submitted concurrently, up to SWEEP_MAX_WORKERS at a time.
+"""
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from json import dumps
+from os import getenv
+
+from projects.kfp import kfp_client
+from projects.kfp.pipeline import compile_pipeline, format_parameter, \
+    list_sweep_parameters
+
+SWEEP_MAX_WORKERS = int(getenv("SWEEP_MAX_WORKERS", "4"))
+
+
+def start_sweep(operators, project_id, experiment_id, parameter_sets):
+    """
+    Starts a run in Kubeflow Pipelines for each parameter set.
+
+    Parameters
+    ----------
+    operators : list
+    project_id : str
+    experiment_id : str
+    parameter_sets : list
+        Parameter values by operator id, for each run. Each parameter set
+        must have the same operators and parameter names.
+
+    Returns
+    -------
+    list
+        For each parameter set, in the same order, the run id, or the
+        exception raised when its run was submitted.
+    """
+    sweep_parameters = {
+        operator_id: sorted(parameters)
+        for operator_id, parameters in parameter_sets[0].items()
+    }
+
+    name = f"experiment-{experiment_id}"
+    package = compile_pipeline(name=name,
+                               operators=operators,
+                               project_id=project_id,
+                               experiment_id=experiment_id,
+                               deployment_id=None,
+                               deployment_name=None,
+                               sweep_parameters=sweep_parameters)
+
+    # a single client is shared by all submissions
+    client = kfp_client()
+    kfp_experiment = client.create_experiment(name=experiment_id)
+
+    tasks = {operator.uuid: operator.task for operator in operators}
+    pipeline_parameters = list_sweep_parameters(sweep_parameters)
+    tag = datetime.utcnow().strftime("%Y-%m-%d %H-%M-%S")
+
+    # kfp client reads the package from a file
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pipeline_package_path = os.path.join(tmpdir, f"{name}.yaml")
+        with open(pipeline_package_path, "w") as f:
+            f.write(package)
+
+        def submit(index):
+            parameter_set = parameter_sets[index]
+            params = {}
+            for operator_id, parameter_name, pipeline_parameter in pipeline_parameters:
+                value = format_parameter(tasks[operator_id].parameters,
+                                         parameter_name,
+                                         parameter_set[operator_id][parameter_name])
+                # pipeline params must have a value, so None is sent as JSON
+                params[pipeline_parameter] = value if value is not None else dumps(None)
+
+            run = client.run_pipeline(
+                experiment_id=kfp_experiment.id,
+                job_name=f"{name}-sweep-{tag}-{index}",
+                pipeline_package_path=pipeline_package_path,
+                params=params,
+            )
+            return run.id
+
+        with ThreadPoolExecutor(max_workers=SWEEP_MAX_WORKERS) as executor:
+            futures = [executor.submit(submit, index) for index in range(len(parameter_sets))]
+
+        return [future.exception() or future.result() for future in futures]
+
+
+def get_run_statuses(run_ids):
+    """
+    Gets the status of runs in Kubeflow Pipelines.
+
+    Parameters
+    ----------
+    run_ids : list
+
+    Returns
+    -------
+    list
+        The status of each run, in the same order as run_ids.
+    """
+    client = kfp_client()
+
+    def get_status(run_id):
+        return client.get_run(run_id=run_id).run.status
+
+    with ThreadPoolExecutor(max_workers=SWEEP_MAX_WORKERS) as executor:
+        return list(executor.map(get_status, run_ids))
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 """Utility functions."""
+import codecs
 from ast import literal_eval
 from kubernetes import client
 from kubernetes.client.rest import ApiException
+from urllib3.exceptions import HTTPError
 
 from projects.exceptions import InternalServerError
 from projects.kfp import KF_PIPELINES_NAMESPACE
@@ -37,7 +39,7 @@ def search_for_pod_info(details, operator_id):
     return info
 
 
-def get_container_logs(pod, container):
+def get_container_logs(pod, container, since_seconds=None, timeout=None, tail_lines=512):
     """
     Returns latest logs of the specified container.
 
@@ -45,6 +47,12 @@ def get_container_logs(pod, container):
     ----------
     pod : str
     container : str
+    since_seconds : int or None
+        If set, returns all lines written in the last seconds instead of the latest lines.
+    timeout : int or None
+        Request timeout in seconds.
+    tail_lines : int or None
+        Number of lines from the end of the logs. If None, returns all lines.
 
     Returns
     -------
@@ -59,17 +67,27 @@ def get_container_logs(pod, container):
     load_kube_config()
     core_api = client.CoreV1Api()
 
+    if since_seconds is not None:
+        kwargs = {"since_seconds": since_seconds}
+    elif tail_lines is not None:
+        kwargs = {"tail_lines": tail_lines}
+    else:
+        kwargs = {}
+
     try:
         logs = core_api.read_namespaced_pod_log(
             name=pod.metadata.name,
             namespace=KF_PIPELINES_NAMESPACE,
             container=container.name,
             pretty="true",
-            tail_lines=512,
             timestamps=True,
+            _request_timeout=timeout,
+            **kwargs,
         )
 
         return logs
+    except HTTPError as e:
+        raise InternalServerError(f"Error while trying to retrive container's log: {e}")
     except ApiException as e:
         body = literal_eval(e.body)
         message = body["message"]
@@ -79,6 +97,103 @@ def get_container_logs(pod, container):
         raise InternalServerError(f"Error while trying to retrive container's log: {message}")
 
 
+def stream_container_logs(pod, container, tail_lines=512):
+    """
+    Opens a follow stream of the specified container's logs.
+
+    Parameters
+    ----------
+    pod : kubernetes.client.models.v1_pod.V1Pod
+    container : kubernetes.client.models.v1_container.V1Container
+    tail_lines : int
+        Number of lines from the end of the logs to replay before following.
+
+    Returns
+    -------
+    urllib3.response.HTTPResponse or None
+        An unread response. Returns None when the container is not started yet.
+
+    Raises
+    ------
+    InternalServerError
+        While trying to query Kubernetes API.
+    """
+    load_kube_config()
+    core_api = client.CoreV1Api()
+
+    try:
+        response = core_api.read_namespaced_pod_log(
+            name=pod.metadata.name,
+            namespace=KF_PIPELINES_NAMESPACE,
+            container=container.name,
+            follow=True,
+            tail_lines=tail_lines,
+            timestamps=True,
+            _preload_content=False,
+        )
+
+        return response
+    except ApiException as e:
+        body = literal_eval(e.body)
+        message = body["message"]
+
+        if "ContainerCreating" in message or "is waiting to start" in message:
+            return None
+        raise InternalServerError(f"Error while trying to retrive container's log: {message}")
+
+
+def iter_log_lines(response):
+    """
+    Iterates over the lines of a streamed log response.
+
+    Parameters
+    ----------
+    response : urllib3.response.HTTPResponse
+
+    Returns
+    -------
+    generator
+        Yields each line as str, without the trailing line break.
+    """
+    # chunks may split multi-byte characters, so decoding must be incremental
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    remainder = ""
+    for chunk in response.stream(decode_content=True):
+        lines = (remainder + decoder.decode(chunk)).split("\n")
+        remainder = lines.pop()
+        yield from lines
+
+    if remainder:
+        yield remainder
+
+
+def get_pod(name):
+    """
+    Returns the details of a pod.
+
+    Parameters
+    ----------
+    name : str
+
+    Returns
+    -------
+    kubernetes.client.models.v1_pod.V1Pod or None
+        None if the pod does not exist.
+    """
+    load_kube_config()
+    core_api = client.CoreV1Api()
+
+    try:
+        return core_api.read_namespaced_pod(
+            name=name,
+            namespace=KF_PIPELINES_NAMESPACE,
+        )
+    except ApiException as e:
+        if e.status == 404:
+            return None
+        raise
+
+
 def volume_exists(name, namespace):
     """
     Returns whether a persistent volume exists.
@@ -4,6 +4,11 @@ from .experiment import Experiment
 from .monitoring import Monitoring
 from .operator import Operator
 from .project import Project
+from .queued_run import QueuedRun
 from .response import Response
+from .scheduler_lock import SchedulerLock
+from .status_change import StatusChange
+from .sweep import Sweep
 from .task import Task
 from .template import Template
+from .watch_state import WatchState
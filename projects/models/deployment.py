@@ -4,7 +4,7 @@ from datetime import datetime
 from warnings import warn
 
 from sqlalchemy import Boolean, Column, DateTime, event, \
-    Integer, String, Text, ForeignKey
+    Index, Integer, String, Text, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import expression
 
@@ -26,7 +26,7 @@ class Deployment(Base):
     name = Column(Text, nullable=False)
     operators = relationship("Operator",
                              primaryjoin=uuid == Operator.deployment_id,
-                             lazy="joined",
+                             lazy="selectin",
                              cascade=CASCADE)
     monitorings = relationship("Monitoring",
                                primaryjoin=uuid == Monitoring.deployment_id,
@@ -35,9 +35,14 @@ class Deployment(Base):
     status = Column(String(255), nullable=False, default="Pending")
     url = Column(String(255), nullable=True)
     deployed_at = Column(DateTime, nullable=True)
-    project_id = Column(String(255), ForeignKey("projects.uuid"), nullable=False, index=True)
+    project_id = Column(String(255), ForeignKey("projects.uuid"), nullable=False)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
+    # backs the listing of deployments updated since a time (updatedSince)
+    __table_args__ = (
+        Index("ix_deployments_project_id_updated_at", "project_id", "updated_at"),
+    )
+
 
 @event.listens_for(Deployment, "after_delete")
 def undeploy(_mapper, connection, target):
@@ -9,6 +9,8 @@ from sqlalchemy.sql import expression
 from projects.models.comparison import Comparison
 from projects.models.deployment import Deployment
 from projects.models.operator import Operator
+from projects.models.queued_run import QueuedRun
+from projects.models.sweep import Sweep
 from projects.database import Base
 
 
@@ -24,12 +26,17 @@ class Experiment(Base):
     operators = relationship("Operator",
                              backref="experiment",
                              primaryjoin=uuid == Operator.experiment_id,
-                             lazy="joined",
+                             lazy="selectin",
                              cascade="all, delete-orphan")
     deployments = relationship("Deployment",
                                backref="experiment",
-                               primaryjoin=uuid == Deployment.experiment_id,
-                               lazy="joined")
+                               primaryjoin=uuid == Deployment.experiment_id)
     comparisons = relationship("Comparison",
                                primaryjoin=uuid == Comparison.experiment_id,
                                cascade="all, delete-orphan")
+    sweeps = relationship("Sweep",
+                          primaryjoin=uuid == Sweep.experiment_id,
+                          cascade="all, delete-orphan")
+    queued_runs = relationship("QueuedRun",
+                               primaryjoin=uuid == QueuedRun.experiment_id,
+                               cascade="all, delete-orphan")
@@ -2,7 +2,7 @@
 """Operator model."""
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, JSON, String, Text
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, JSON, String, Text
 from sqlalchemy.orm import backref, relationship
 
 from projects.database import Base
@@ -12,8 +12,8 @@ class Operator(Base):
     __tablename__ = "operators"
     uuid = Column(String(255), primary_key=True)
     name = Column(Text, nullable=True)
-    deployment_id = Column(String(255), ForeignKey("deployments.uuid"), nullable=True, index=True)
-    experiment_id = Column(String(255), ForeignKey("experiments.uuid"), nullable=True, index=True)
+    deployment_id = Column(String(255), ForeignKey("deployments.uuid"), nullable=True)
+    experiment_id = Column(String(255), ForeignKey("experiments.uuid"), nullable=True)
     task_id = Column(String(255), ForeignKey("tasks.uuid"), nullable=False, index=True)
     dependencies = Column(JSON, nullable=True, default=[])
     parameters = Column(JSON, nullable=False, default={})
@@ -24,3 +24,9 @@ class Operator(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     task = relationship("Task", backref=backref("operator", uselist=False))
+
+    # back the listing of operators, and of those updated since a time (updatedSince)
+    __table_args__ = (
+        Index("ix_operators_experiment_id_updated_at", "experiment_id", "updated_at"),
+        Index("ix_operators_deployment_id_updated_at", "deployment_id", "updated_at"),
+    )
@@ -2,7 +2,7 @@
 """Project model."""
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, String, Text
+from sqlalchemy import Column, DateTime, Index, String, Text
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
@@ -21,11 +21,11 @@ class Project(Base):
     description = Column(Text)
     experiments = relationship("Experiment",
                                primaryjoin=uuid == Experiment.project_id,
-                               lazy="joined",
+                               lazy="selectin",
                                cascade="all, delete-orphan")
     deployments = relationship("Deployment",
                                primaryjoin=uuid == Deployment.project_id,
-                               lazy="joined",
+                               lazy="selectin",
                                cascade="all, delete-orphan")
 
     @hybrid_property
@@ -40,3 +40,9 @@ class Project(Base):
     def has_deployment(self):
         seldon_deployments = list_project_seldon_deployments(self.uuid)
         return len(seldon_deployments) > 0
+
+    __table_args__ = (
+        # searched by the q argument of listings
+        Index("ft_projects_name_description", "name", "description",
+              mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+    )
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Queued run model."""
+from datetime import datetime
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, JSON, String, Text
+from sqlalchemy.dialects.mysql import DATETIME
+
+from projects.database import Base
+
+
+class QueuedRun(Base):
+    __tablename__ = "queued_runs"
+    uuid = Column(String(255), primary_key=True)
+    project_id = Column(String(255), nullable=False, index=True)
+    experiment_id = Column(String(255), ForeignKey("experiments.uuid"), nullable=False, index=True)
+    # Queued, Running (submitted to KFP), Finished, Failed or Cancelled
+    status = Column(String(255), nullable=False, default="Queued")
+    status_message = Column(Text)
+    priority = Column(Integer, nullable=False, default=0)
+    start_from = Column(String(255))
+    only = Column(JSON)
+    run_id = Column(String(255), index=True)
+    # runs of a sweep have the sweep id, and their parameter set
+    sweep_id = Column(String(255), index=True)
+    parameters = Column(JSON)
+    # microseconds keep the FIFO order of runs queued in the same second
+    created_at = Column(DATETIME(fsp=6), nullable=False, default=datetime.utcnow)
+    updated_at = Column(DATETIME(fsp=6), nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_queued_runs_status_priority", "status", "priority", "created_at"),
+    )
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""Scheduler lock model."""
+from sqlalchemy import Column, String
+
+from projects.database import Base
+
+
+class SchedulerLock(Base):
+    __tablename__ = "scheduler_locks"
+    # eg. "runs", whose row is locked while a run is claimed
+    name = Column(String(255), primary_key=True)
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Status change model."""
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy.dialects.mysql import DATETIME
+
+from projects.database import Base
+
+
+# Status changes of operators and deployments are written by the persistence
+# agent, in the same transaction as the change, and pushed to clients by the API
+class StatusChange(Base):
+    __tablename__ = "status_changes"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    experiment_id = Column(String(255), index=True)
+    deployment_id = Column(String(255), index=True)
+    # None for a change of the deployment status
+    operator_id = Column(String(255))
+    status = Column(String(255))
+    status_message = Column(Text)
+    created_at = Column(DATETIME(fsp=6), nullable=False, default=datetime.utcnow, index=True)
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""Sweep model."""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, JSON, String
+
+from projects.database import Base
+
+
+class Sweep(Base):
+    __tablename__ = "sweeps"
+    uuid = Column(String(255), primary_key=True)
+    experiment_id = Column(String(255), ForeignKey("experiments.uuid"), nullable=False, index=True)
+    runs = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -3,7 +3,7 @@
 import os
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, JSON, String, Text
+from sqlalchemy import Boolean, Column, Computed, DateTime, Index, Integer, JSON, String, Text
 from sqlalchemy.sql import expression
 
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -35,6 +35,8 @@ class Task(Base):
     arguments = Column(JSON, nullable=True)
     category = Column(String(255), nullable=False)
     tags = Column(JSON, nullable=True)
+    # FULLTEXT indexes do not include JSON columns, so tags are indexed as text
+    tags_text = Column(Text, Computed("CAST(tags AS CHAR)", persisted=True))
     data_in = Column(Text, nullable=True)
     data_out = Column(Text, nullable=True)
     docs = Column(Text, nullable=True)
@@ -55,3 +57,9 @@ class Task(Base):
     @hybrid_property
     def has_notebook(self):
         return bool(self.experiment_notebook_path or self.deployment_notebook_path)
+
+    __table_args__ = (
+        # searched by the q argument of listings
+        Index("ft_tasks_name_description_tags_text", "name", "description", "tags_text",
+              mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+    )
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""Watch state model."""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String
+
+from projects.database import Base
+
+
+class WatchState(Base):
+    __tablename__ = "watch_states"
+    # the plural of the watched resource, eg. "workflows"
+    resource = Column(String(255), primary_key=True)
+    # the resourceVersion of the latest event saved by the persistence agent
+    resource_version = Column(String(255), nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """Functions that access MinIO object storage."""
+from io import BytesIO
 from os import getenv
 
 from minio import Minio
@@ -114,3 +115,72 @@ def remove_objects(prefix):
 
     for obj in MINIO_CLIENT.list_objects(BUCKET_NAME, prefix=prefix, recursive=True):
         MINIO_CLIENT.remove_object(BUCKET_NAME, obj.object_name)
+
+
+def put_object(object_name, data, content_type="application/octet-stream"):
+    """
+    Puts data into an object in MinIO.
+
+    Parameters
+    ----------
+    object_name : str
+    data : bytes
+    content_type : str
+    """
+    # ensures MinIO bucket exists
+    make_bucket(BUCKET_NAME)
+
+    MINIO_CLIENT.put_object(
+        bucket_name=BUCKET_NAME,
+        object_name=object_name,
+        data=BytesIO(data),
+        length=len(data),
+        content_type=content_type,
+    )
+
+
+def get_partial_object(object_name, offset, length):
+    """
+    Get a range of bytes from an object in MinIO.
+
+    Parameters
+    ----------
+    object_name : str
+    offset : int
+    length : int
+
+    Returns
+    -------
+    bytes
+    """
+    # ensures MinIO bucket exists
+    make_bucket(BUCKET_NAME)
+
+    object_data = MINIO_CLIENT.get_partial_object(
+        bucket_name=BUCKET_NAME,
+        object_name=object_name,
+        offset=offset,
+        length=length,
+    ).data
+
+    return object_data
+
+
+def copy_objects(source_prefix, destination_prefix):
+    """
+    Copies all objects that starts with a prefix to another prefix.
+
+    Parameters
+    ----------
+    source_prefix : str
+    destination_prefix : str
+    """
+    # ensures MinIO bucket exists
+    make_bucket(BUCKET_NAME)
+
+    for obj in MINIO_CLIENT.list_objects(BUCKET_NAME, prefix=source_prefix, recursive=True):
+        MINIO_CLIENT.copy_object(
+            bucket_name=BUCKET_NAME,
+            object_name=f"{destination_prefix}{obj.object_name[len(source_prefix):]}",
+            object_source=f"/{BUCKET_NAME}/{obj.object_name}",
+        )
@@ -1,15 +1,18 @@
 from .comparison import Comparison, ComparisonList, ComparisonUpdate
 from .deployment import Deployment, DeploymentCreate, DeploymentList, \
-    DeploymentUpdate
+    DeploymentSummary, DeploymentSummaryList, DeploymentUpdate
 from .experiment import Experiment, ExperimentCreate, ExperimentList, \
-    ExperimentUpdate
+    ExperimentSummary, ExperimentSummaryList, ExperimentUpdate
 from .log import Log, LogList
 from .message import Message
 from .monitoring import Monitoring, MonitoringCreate, MonitoringList, \
     MonitoringUpdate
 from .operator import Operator, OperatorCreate, OperatorList, OperatorUpdate, Parameter
-from .project import Project, ProjectCreate, ProjectList, ProjectUpdate
-from .run import Run, RunList
-from .task import Task, TaskCreate, TaskList, TaskUpdate
+from .project import Project, ProjectCreate, ProjectList, ProjectSummary, \
+    ProjectSummaryList, ProjectUpdate
+from .run import Run, RunCreate, RunList
+from .sweep import Sweep, SweepCreate, SweepRun
+from .task import Task, TaskCreate, TaskList, TaskSummary, TaskSummaryList, \
+    TaskUpdate
 from .template import Template, TemplateCreate, TemplateList, \
     TemplateUpdate
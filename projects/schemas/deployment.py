@@ -65,10 +65,48 @@ class Deployment(DeploymentBase):
 class DeploymentList(BaseModel):
     deployments: List[Deployment]
     total: int
+    server_time: Optional[datetime]
+
+    class Config:
+        alias_generator = to_camel_case
+        allow_population_by_field_name = True
 
     @classmethod
-    def from_orm(cls, models, total):
+    def from_orm(cls, models, total, server_time=None):
         return DeploymentList(
             deployments=[Deployment.from_orm(model) for model in models],
             total=total,
+            server_time=server_time,
+        )
+
+
+class DeploymentSummary(DeploymentBase):
+    uuid: str
+    name: str
+    position: int
+    is_active: bool
+    experiment_id: Optional[str]
+    project_id: str
+    created_at: datetime
+    updated_at: datetime
+    status: str
+    url: Optional[str]
+    deployed_at: Optional[datetime]
+
+
+class DeploymentSummaryList(BaseModel):
+    deployments: List[DeploymentSummary]
+    total: int
+    server_time: Optional[datetime]
+
+    class Config:
+        alias_generator = to_camel_case
+        allow_population_by_field_name = True
+
+    @classmethod
+    def from_orm(cls, models, total, server_time=None):
+        return DeploymentSummaryList(
+            deployments=[DeploymentSummary.from_orm(model) for model in models],
+            total=total,
+            server_time=server_time,
         )
@@ -62,3 +62,25 @@ class ExperimentList(BaseModel):
             experiments=[Experiment.from_orm(model) for model in models],
             total=total,
         )
+
+
+class ExperimentSummary(ExperimentBase):
+    uuid: str
+    name: str
+    position: int
+    is_active: bool
+    project_id: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class ExperimentSummaryList(BaseModel):
+    experiments: List[ExperimentSummary]
+    total: int
+
+    @classmethod
+    def from_orm(cls, models, total):
+        return ExperimentSummaryList(
+            experiments=[ExperimentSummary.from_orm(model) for model in models],
+            total=total,
+        )
@@ -26,3 +26,4 @@ class Log(LogBase):
 class LogList(BaseModel):
     logs: List[Log]
     total: int
+    cursor: Optional[str]
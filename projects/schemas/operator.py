@@ -98,10 +98,16 @@ class Parameter(BaseModel):
 class OperatorList(BaseModel):
     operators: List[Operator]
     total: int
+    server_time: Optional[datetime]
+
+    class Config:
+        alias_generator = to_camel_case
+        allow_population_by_field_name = True
 
     @classmethod
-    def from_orm(cls, models, total):
+    def from_orm(cls, models, total, server_time=None):
         return OperatorList(
             operators=[Operator.from_orm(model) for model in models],
             total=total,
+            server_time=server_time,
         )
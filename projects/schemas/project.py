@@ -58,11 +58,45 @@ class Project(ProjectBase):
 
 class ProjectList(BaseModel):
     projects: List[Project]
-    total: int
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+    class Config:
+        alias_generator = to_camel_case
+        allow_population_by_field_name = True
 
     @classmethod
-    def from_orm(cls, models, total):
+    def from_orm(cls, models, total, next_cursor=None):
         return ProjectList(
             projects=[Project.from_orm(model) for model in models],
             total=total,
+            next_cursor=next_cursor,
+        )
+
+
+class ProjectSummary(ProjectBase):
+    uuid: str
+    name: str
+    description: Optional[str]
+    has_experiment: bool
+    has_pre_deployment: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class ProjectSummaryList(BaseModel):
+    projects: List[ProjectSummary]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+    class Config:
+        alias_generator = to_camel_case
+        allow_population_by_field_name = True
+
+    @classmethod
+    def from_orm(cls, models, total, next_cursor=None):
+        return ProjectSummaryList(
+            projects=[ProjectSummary.from_orm(model) for model in models],
+            total=total,
+            next_cursor=next_cursor,
         )
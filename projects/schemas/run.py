@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """Run schema."""
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -16,10 +16,18 @@ class RunBase(BaseModel):
         orm_mode = True
 
 
+class RunCreate(RunBase):
+    start_from: Optional[str]
+    only: Optional[List[str]]
+    priority: Optional[int]
+
+
 class Run(RunBase):
     uuid: str
     operators: Dict
     created_at: datetime
+    queue_position: Optional[int]
+    status_message: Optional[str]
 
     @classmethod
     def from_orm(cls, model):
@@ -27,6 +35,8 @@ class Run(RunBase):
             uuid=model["uuid"],
             operators=model["operators"],
             created_at=model["createdAt"],
+            queue_position=model.get("queuePosition"),
+            status_message=model.get("statusMessage"),
         )
 
 
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Sweep schema."""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from projects.utils import to_camel_case
+
+
+class SweepBase(BaseModel):
+
+    class Config:
+        alias_generator = to_camel_case
+        allow_population_by_field_name = True
+        orm_mode = True
+
+
+class SweepCreate(SweepBase):
+    parameters: Optional[Dict[str, Dict[str, List]]]
+    parameter_sets: Optional[List[Dict[str, Dict]]]
+
+
+class SweepRun(SweepBase):
+    uuid: str
+    parameters: Dict
+    status: Optional[str]
+    metrics: Dict
+
+
+class Sweep(SweepBase):
+    uuid: str
+    experiment_id: str
+    status: str
+    runs: List[SweepRun]
+    created_at: datetime
+
+    @classmethod
+    def from_orm(cls, model, status, runs):
+        return Sweep(
+            uuid=model.uuid,
+            experiment_id=model.experiment_id,
+            status=status,
+            runs=runs,
+            created_at=model.created_at,
+        )
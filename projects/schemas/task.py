@@ -112,11 +112,48 @@ class Task(TaskBase):
 
 class TaskList(BaseModel):
     tasks: List[Task]
-    total: int
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+    class Config:
+        alias_generator = to_camel_case
+        allow_population_by_field_name = True
 
     @classmethod
-    def from_orm(cls, models, total):
+    def from_orm(cls, models, total, next_cursor=None):
         return TaskList(
             tasks=[Task.from_orm(model) for model in models],
             total=total,
+            next_cursor=next_cursor,
+        )
+
+
+class TaskSummary(TaskBase):
+    uuid: str
+    name: str
+    description: Optional[str]
+    category: Optional[str]
+    tags: Optional[List[str]]
+    data_in: Optional[str]
+    data_out: Optional[str]
+    has_notebook: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class TaskSummaryList(BaseModel):
+    tasks: List[TaskSummary]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+    class Config:
+        alias_generator = to_camel_case
+        allow_population_by_field_name = True
+
+    @classmethod
+    def from_orm(cls, models, total, next_cursor=None):
+        return TaskSummaryList(
+            tasks=[TaskSummary.from_orm(model) for model in models],
+            total=total,
+            next_cursor=next_cursor,
         )
@@ -2,8 +2,18 @@
 """Utility functions."""
 import re
 from itertools import chain
+from os import getenv
 from urllib.parse import parse_qsl
 
+from starlette.responses import Response
+
+# Cache-Control of resources that are revalidated with their ETag on every use
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+# Cache-Control of the task and template catalogues, which rarely change: clients
+# may reuse them for this many seconds, then revalidate them with their ETag
+CATALOGUE_MAX_AGE = int(getenv("CATALOGUE_MAX_AGE", "0"))
+CATALOGUE_CACHE_CONTROL = f"private, max-age={CATALOGUE_MAX_AGE}"
+
 
 def to_camel_case(snake_str):
     """
@@ -71,3 +81,58 @@ def format_query_params(query_params):
     dict
     """
     return dict(parse_qsl(query_params))
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Compares the entity tags of an If-None-Match header with an ETag, with the
+    weak comparison of RFC 7232.
+
+    Parameters
+    ----------
+    if_none_match : str or None
+    etag : str
+
+    Returns
+    -------
+    bool
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque_tag(tag):
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return any(opaque_tag(tag) == opaque_tag(etag) for tag in if_none_match.split(","))
+
+
+def not_modified_response(request, response, etag, cache_control):
+    """
+    Sets the ETag and Cache-Control headers of a response, and answers
+    304 Not Modified when the client already has this version.
+
+    Parameters
+    ----------
+    request : fastapi.Request
+    response : fastapi.Response
+        The response whose body the handler returns.
+    etag : str or None
+    cache_control : str
+
+    Returns
+    -------
+    starlette.responses.Response or None
+        A 304 response, or None when the handler must return the body.
+    """
+    headers = {"Cache-Control": cache_control}
+    if etag is not None:
+        headers["ETag"] = etag
+    for name, value in headers.items():
+        response.headers[name] = value
+
+    if etag is not None and etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+    return None
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timezone
+from json import load
+from unittest import TestCase
+
+from projects.agent.metrics import DB_FLUSH_LATENCY, generate_latest, \
+    get_last_change_time, observe_event
+
+RESOURCE = "test-workflows"
+
+
+class TestAgentMetrics(TestCase):
+    def test_get_last_change_time(self):
+        manifest_file_ref = open('tests/resources/mock_manifest.json')
+        manifest_as_dict = load(manifest_file_ref)
+
+        # the latest timestamp of the workflow and its nodes
+        result = get_last_change_time(manifest_as_dict["object"])
+        self.assertEqual(result, datetime(2021, 6, 23, 17, 52, 22, tzinfo=timezone.utc))
+
+        self.assertIsNone(get_last_change_time({"metadata": {}}))
+
+    def test_generate_latest(self):
+        observe_event(RESOURCE, "MODIFIED", "123")
+        DB_FLUSH_LATENCY.observe(0.02, RESOURCE)
+        DB_FLUSH_LATENCY.observe(20, RESOURCE)
+
+        result = generate_latest()
+        self.assertIn(f'agent_events_total{{resource="{RESOURCE}",type="MODIFIED"}} 1\n', result)
+        self.assertIn(f'agent_resource_version{{resource="{RESOURCE}"}} 123\n', result)
+        self.assertIn(f'agent_db_flush_seconds_bucket{{resource="{RESOURCE}",le="0.01"}} 0\n', result)
+        self.assertIn(f'agent_db_flush_seconds_bucket{{resource="{RESOURCE}",le="0.025"}} 1\n', result)
+        self.assertIn(f'agent_db_flush_seconds_bucket{{resource="{RESOURCE}",le="+Inf"}} 2\n', result)
+        self.assertIn(f'agent_db_flush_seconds_count{{resource="{RESOURCE}"}} 2\n', result)
@@ -1,10 +1,45 @@
 # -*- coding: utf-8 -*-
+import time
 from unittest import TestCase
 
-from projects.database import init_db
+from sqlalchemy import create_engine
+
+from projects.database import DB_URL, ReplicaSet, Session, engine, init_db
 
 
 class TestDatabase(TestCase):
 
     def test_init_db(self):
         init_db()
+
+    def test_read_only_session(self):
+        replica = create_engine(DB_URL)
+        replicas = ReplicaSet([replica])
+
+        # the database of the tests is not replicating, so its lag is unknown
+        session = Session(read_only=True, replicas=replicas)
+        self.assertIs(session.get_bind(), engine)
+        session.close()
+
+        # the lags are measured in background, by the thread started by the first pick
+        self.assertTrue(replicas.measured.wait(timeout=10))
+        self.assertIsNone(replicas.lags[replica][0])
+
+        replicas.lags[replica] = (0, time.monotonic())
+        session = Session(read_only=True, replicas=replicas)
+        self.assertIs(session.get_bind(), replica)
+        session.use_primary()
+        self.assertIs(session.get_bind(), engine)
+        session.close()
+
+        session = Session(read_only=False, replicas=replicas)
+        self.assertIs(session.get_bind(), engine)
+        session.commit()
+        session.close()
+
+        # reads after a write are on the primary
+        session = Session(read_only=True, replicas=replicas)
+        self.assertIs(session.get_bind(), engine)
+        session.close()
+
+        replica.dispose()
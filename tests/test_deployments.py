@@ -7,6 +7,7 @@ from fastapi.testclient import TestClient
 from projects.api.main import app
 from projects.controllers.utils import uuid_alpha
 from projects.database import engine
+from tests.utils import count_queries
 
 TEST_CLIENT = TestClient(app)
 
@@ -195,11 +196,29 @@ class TestDeployments(TestCase):
         expected = {"message": "The specified project does not exist"}
         self.assertEqual(rv.status_code, 404)
 
-        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/deployments")
+        with count_queries() as statements:
+            rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/deployments")
         result = rv.json()
         self.assertIsInstance(result["deployments"], list)
         self.assertIsInstance(result["total"], int)
         self.assertEqual(rv.status_code, 200)
+        # the project, the deployments, their operators and tasks
+        self.assertLessEqual(len(statements), 4)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/deployments?view=summary")
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(result["total"], 2)
+        for deployment in result["deployments"]:
+            self.assertNotIn("operators", deployment)
+            self.assertEqual(deployment["status"], STATUS)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/deployments", params={"updatedSince": "2020-01-01T00:00:00Z"})
+        result = rv.json()
+        self.assertEqual(result["deployments"], [])
+        self.assertEqual(result["total"], 0)
+        self.assertIn("serverTime", result)
+        self.assertEqual(rv.status_code, 200)
 
     def test_create_deployment(self):
         rv = TEST_CLIENT.post(f"/projects/foo/deployments", json={})
@@ -7,6 +7,7 @@ from fastapi.testclient import TestClient
 from projects.api.main import app
 from projects.controllers.utils import uuid_alpha
 from projects.database import engine
+from tests.utils import count_queries
 
 TEST_CLIENT = TestClient(app)
 
@@ -247,11 +248,21 @@ class TestExperiments(TestCase):
         self.assertDictEqual(expected, result)
         self.assertEqual(rv.status_code, 404)
 
-        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments")
+        with count_queries() as statements:
+            rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments")
         result = rv.json()
         self.assertIsInstance(result["experiments"], list)
         self.assertIsInstance(result["total"], int)
         self.assertEqual(rv.status_code, 200)
+        # the project, the experiments, their operators and tasks
+        self.assertLessEqual(len(statements), 4)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments?view=summary")
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        for experiment in result["experiments"]:
+            self.assertNotIn("operators", experiment)
+            self.assertEqual(experiment["projectId"], PROJECT_ID)
 
     def test_create_experiment(self):
         rv = TEST_CLIENT.post("/projects/unk/experiments", json={
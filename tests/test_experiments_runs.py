@@ -2,13 +2,21 @@
 import time
 from json import dumps
 from unittest import TestCase
+from unittest.mock import patch
 
 from fastapi.testclient import TestClient
+from yaml import safe_load
 
+from projects import models
 from projects.api.main import app
+from projects.controllers.experiments.runs import scheduler
 from projects.controllers.utils import uuid_alpha
-from projects.database import engine
-from projects.kfp import kfp_client
+from projects.database import Session, engine
+from projects.exceptions import BadRequest
+from projects.kfp import artifacts, kfp_client
+from projects.kfp.cache import FINGERPRINT_ANNOTATION, find_reused_operators, \
+    get_cached_operators, list_partial_run_operators
+from projects.kfp.pipeline import compile_pipeline
 
 TEST_CLIENT = TestClient(app)
 
@@ -118,6 +126,9 @@ class TestExperimentsRuns(TestCase):
 
         conn = engine.connect()
 
+        text = f"DELETE FROM queued_runs WHERE project_id = '{PROJECT_ID}'"
+        conn.execute(text)
+
         text = f"DELETE FROM operators WHERE experiment_id in" \
                f"(SELECT uuid  FROM experiments where project_id = '{PROJECT_ID}')"
         conn.execute(text)
@@ -152,6 +163,266 @@ class TestExperimentsRuns(TestCase):
         operator = result["operators"][0]
         self.assertEqual("Pending", operator["status"])
 
+    def test_create_run_partial(self):
+        rv = TEST_CLIENT.post(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs",
+                              json={"startFrom": "unk"})
+        result = rv.json()
+        expected = {"message": "The specified operator does not exist"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+        rv = TEST_CLIENT.post(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs",
+                              json={"startFrom": OPERATOR_ID, "only": [OPERATOR_ID]})
+        result = rv.json()
+        expected = {"message": "Only one of startFrom and only can be set"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+    @patch("projects.kfp.runs.get_workflow_manifest")
+    @patch("projects.kfp.runs.get_latest_run_id", return_value=RUN_ID)
+    def test_create_run_partial_upstream_failed(self, mock_get_latest_run_id, mock_get_workflow_manifest):
+        operator_id_2 = str(uuid_alpha())
+        conn = engine.connect()
+        text = (
+            f"INSERT INTO operators (uuid, name, status, status_message, experiment_id, task_id, parameters, "
+            f"position_x, position_y, dependencies, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (operator_id_2, None, "Succeeded", None, EXPERIMENT_ID, TASK_ID, PARAMETERS_JSON, POSITION_X,
+                            POSITION_Y, dumps([OPERATOR_ID]), CREATED_AT, UPDATED_AT,))
+        conn.close()
+
+        # the operator upstream of startFrom failed in the latest run
+        mock_get_workflow_manifest.return_value = {
+            "metadata": {"annotations": {}},
+            "spec": {"templates": [{"name": OPERATOR_ID}]},
+            "status": {
+                "nodes": {
+                    "node": {"type": "Pod", "phase": "Failed", "templateName": OPERATOR_ID, "displayName": OPERATOR_ID},
+                },
+            },
+        }
+
+        rv = TEST_CLIENT.post(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs",
+                              json={"startFrom": operator_id_2})
+        result = rv.json()
+        expected = {"message": f"The operator {OPERATOR_ID} did not succeed in the latest run"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+        # the run was not queued, and the operators are unchanged
+        conn = engine.connect()
+        text = f"SELECT COUNT(*) FROM queued_runs WHERE experiment_id = '{EXPERIMENT_ID}'"
+        self.assertEqual(conn.execute(text).scalar(), 0)
+        text = f"SELECT uuid, status FROM operators WHERE experiment_id = '{EXPERIMENT_ID}'"
+        result = dict(tuple(row) for row in conn.execute(text))
+        conn.close()
+        self.assertDictEqual(result, {OPERATOR_ID: "Unset", operator_id_2: "Succeeded"})
+
+    def test_fail_run_bad_request(self):
+        queued_run_id = str(uuid_alpha())
+        conn = engine.connect()
+        text = (
+            f"INSERT INTO queued_runs (uuid, project_id, experiment_id, status, priority, run_id, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (queued_run_id, PROJECT_ID, EXPERIMENT_ID, "Running", 0, None, CREATED_AT, UPDATED_AT,))
+        text = f"UPDATE operators SET status = 'Queued' WHERE experiment_id = '{EXPERIMENT_ID}'"
+        conn.execute(text)
+        conn.close()
+
+        # a queued run that is invalid when it starts did not run its operators
+        session = Session()
+        queued_run = session.query(models.QueuedRun).get(queued_run_id)
+        scheduler.SchedulerController(session).fail_run(queued_run, BadRequest("The operator foo did not succeed in the latest run"))
+        session.close()
+
+        conn = engine.connect()
+        text = f"SELECT status, status_message FROM queued_runs WHERE uuid = '{queued_run_id}'"
+        self.assertEqual(tuple(conn.execute(text).first()), ("Failed", "The operator foo did not succeed in the latest run"))
+        text = f"SELECT status, status_message FROM operators WHERE uuid = '{OPERATOR_ID}'"
+        self.assertEqual(tuple(conn.execute(text).first()), ("Unset", None))
+        conn.close()
+
+    def test_create_run_queued(self):
+        # a run of this project holds the only slot
+        conn = engine.connect()
+        text = (
+            f"INSERT INTO queued_runs (uuid, project_id, experiment_id, status, priority, run_id, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (str(uuid_alpha()), PROJECT_ID, EXPERIMENT_ID, "Running", 0, RUN_ID, CREATED_AT, UPDATED_AT,))
+        conn.close()
+
+        scheduler.RUN_MAX_CONCURRENT_PER_PROJECT = 1
+        try:
+            rv = TEST_CLIENT.post(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs", json={})
+        finally:
+            scheduler.RUN_MAX_CONCURRENT_PER_PROJECT = 0
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(result["queuePosition"], 1)
+        self.assertEqual(result["operators"][OPERATOR_ID]["status"], "Queued")
+        queued_run_id = result["uuid"]
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/{queued_run_id}")
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(result["queuePosition"], 1)
+
+        rv = TEST_CLIENT.delete(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/{queued_run_id}")
+        result = rv.json()
+        expected = {"message": "Run terminated"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 200)
+
+    def test_claim_run(self):
+        # a run of this project holds a slot
+        conn = engine.connect()
+        text = (
+            f"INSERT INTO queued_runs (uuid, project_id, experiment_id, status, priority, run_id, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (str(uuid_alpha()), PROJECT_ID, EXPERIMENT_ID, "Running", 0, RUN_ID, CREATED_AT, UPDATED_AT,))
+        queued_run_id = str(uuid_alpha())
+        conn.execute(text, (queued_run_id, PROJECT_ID, EXPERIMENT_ID, "Queued", 0, None, CREATED_AT, UPDATED_AT,))
+        conn.close()
+
+        session = Session()
+        scheduler_controller = scheduler.SchedulerController(session)
+        queued_run = session.query(models.QueuedRun).get(queued_run_id)
+
+        # the runs are counted when the run is claimed
+        scheduler.RUN_MAX_CONCURRENT_PER_PROJECT = 1
+        try:
+            self.assertFalse(scheduler_controller.claim_run(queued_run))
+        finally:
+            scheduler.RUN_MAX_CONCURRENT_PER_PROJECT = 0
+
+        scheduler.RUN_MAX_CONCURRENT = 1
+        try:
+            self.assertIsNone(scheduler_controller.claim_run(queued_run))
+        finally:
+            scheduler.RUN_MAX_CONCURRENT = 0
+
+        scheduler.RUN_MAX_CONCURRENT_PER_PROJECT = 2
+        try:
+            self.assertTrue(scheduler_controller.claim_run(queued_run))
+        finally:
+            scheduler.RUN_MAX_CONCURRENT_PER_PROJECT = 0
+
+        session.refresh(queued_run)
+        self.assertEqual(queued_run.status, "Running")
+        session.close()
+
+    def test_compile_pipeline(self):
+        session = Session()
+        operators = session.query(models.Operator) \
+            .filter_by(experiment_id=EXPERIMENT_ID) \
+            .all()
+
+        kwargs = {
+            "name": f"experiment-{EXPERIMENT_ID}",
+            "operators": operators,
+            "project_id": PROJECT_ID,
+            "experiment_id": EXPERIMENT_ID,
+            "deployment_id": None,
+            "deployment_name": None,
+        }
+        result = compile_pipeline(**kwargs)
+        self.assertIn(OPERATOR_ID, result)
+
+        # an unchanged pipeline is not compiled again
+        self.assertIs(compile_pipeline(**kwargs), result)
+
+        operators[0].parameters = {"coef": 0.2}
+        self.assertIsNot(compile_pipeline(**kwargs), result)
+        session.close()
+
+    def test_compile_pipeline_cached_operators(self):
+        session = Session()
+        operators = session.query(models.Operator) \
+            .filter_by(experiment_id=EXPERIMENT_ID) \
+            .all()
+
+        cached_operators = {
+            OPERATOR_ID: {"runId": RUN_ID, "fingerprint": "foo", "taskId": TASK_ID, "parameters": PARAMETERS},
+        }
+        result = compile_pipeline(name=f"experiment-{EXPERIMENT_ID}",
+                                  operators=operators,
+                                  project_id=PROJECT_ID,
+                                  experiment_id=EXPERIMENT_ID,
+                                  deployment_id=None,
+                                  deployment_name=None,
+                                  cached_operators=cached_operators)
+        workflow = safe_load(result)
+
+        # cached operators are not scheduled
+        templates = [template["name"] for template in workflow["spec"]["templates"]]
+        self.assertNotIn(OPERATOR_ID, templates)
+        self.assertDictEqual(get_cached_operators(workflow), cached_operators)
+        session.close()
+
+    def test_partial_run_operators(self):
+        # a -> b and a -> c, where the sibling branch c failed in the latest run, and d never ran
+        operator_a = models.Operator(uuid="a", task_id=TASK_ID, parameters={}, dependencies=[])
+        operator_b = models.Operator(uuid="b", task_id=TASK_ID, parameters={}, dependencies=["a"])
+        operator_c = models.Operator(uuid="c", task_id=TASK_ID, parameters={}, dependencies=["a"])
+        operator_d = models.Operator(uuid="d", task_id=TASK_ID, parameters={}, dependencies=["c"])
+        operators = [operator_a, operator_b, operator_c, operator_d]
+
+        workflow_manifest = {
+            "metadata": {"annotations": {}},
+            "spec": {
+                "templates": [
+                    {"name": name, "metadata": {"annotations": {FINGERPRINT_ANNOTATION: f"fingerprint-{name}"}}}
+                    for name in ["a", "b", "c"]
+                ],
+            },
+            "status": {
+                "nodes": {
+                    f"node-{name}": {"type": "Pod", "phase": phase, "templateName": name, "displayName": name}
+                    for name, phase in [("a", "Succeeded"), ("b", "Succeeded"), ("c", "Failed")]
+                },
+            },
+        }
+
+        reused_operators = find_reused_operators(operators=operators,
+                                                 scheduled_ids={"b"},
+                                                 run_id=RUN_ID,
+                                                 workflow_manifest=workflow_manifest)
+        self.assertDictEqual(reused_operators, {
+            "a": {"runId": RUN_ID, "fingerprint": "fingerprint-a", "taskId": TASK_ID, "parameters": {}},
+        })
+
+        # only b runs, and c and d are not part of the pipeline
+        result = list_partial_run_operators(operators, {"b"}, reused_operators)
+        self.assertListEqual(result, [operator_a, operator_b])
+
+    def test_compile_pipeline_object_storage(self):
+        session = Session()
+        operators = session.query(models.Operator) \
+            .filter_by(experiment_id=EXPERIMENT_ID) \
+            .all()
+
+        artifacts.DATA_PASSING_MODE = "object-storage"
+        try:
+            result = compile_pipeline(name=f"experiment-{EXPERIMENT_ID}",
+                                      operators=operators,
+                                      project_id=PROJECT_ID,
+                                      experiment_id=EXPERIMENT_ID,
+                                      deployment_id=None,
+                                      deployment_name=None)
+        finally:
+            artifacts.DATA_PASSING_MODE = "volume"
+        workflow = safe_load(result)
+
+        # /tmp/data is an artifact, copied to the experiment volume at the end
+        templates = {template["name"]: template for template in workflow["spec"]["templates"]}
+        self.assertListEqual(templates[OPERATOR_ID]["outputs"]["artifacts"][-1:], [{"name": "data", "path": "/tmp/data"}])
+        self.assertListEqual(templates["data-sync"]["inputs"]["artifacts"], [{"name": "data-0", "path": "/tmp/inputs/0"}])
+        session.close()
+
     def test_get_run(self):
         rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/notRealRun")
         result = rv.json()
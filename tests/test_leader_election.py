@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import copy
+import time
+from unittest import TestCase
+
+from kubernetes.client.rest import ApiException
+
+from projects.agent import leader_election
+from projects.agent.leader_election import LeaderElector
+
+
+class InMemoryLeases:
+    """Stores a single Lease, with the optimistic concurrency of the kubernetes API."""
+
+    def __init__(self):
+        self.lease = None
+        self.resource_version = 0
+
+    def read_namespaced_lease(self, name, namespace):
+        if self.lease is None:
+            raise ApiException(status=404)
+        return copy.deepcopy(self.lease)
+
+    def create_namespaced_lease(self, namespace, body):
+        if self.lease is not None:
+            raise ApiException(status=409)
+        self.save(body)
+
+    def replace_namespaced_lease(self, name, namespace, body):
+        if body.metadata.resource_version != self.lease.metadata.resource_version:
+            raise ApiException(status=409)
+        self.save(body)
+
+    def save(self, body):
+        self.resource_version += 1
+        body.metadata.resource_version = str(self.resource_version)
+        self.lease = copy.deepcopy(body)
+
+
+class TestLeaderElection(TestCase):
+    def setUp(self):
+        self.lease_duration = leader_election.AGENT_LEASE_DURATION
+        leader_election.AGENT_LEASE_DURATION = 1
+
+    def tearDown(self):
+        leader_election.AGENT_LEASE_DURATION = self.lease_duration
+
+    def test_try_acquire_or_renew(self):
+        api = InMemoryLeases()
+        leader = LeaderElector(api, identity="leader")
+        standby = LeaderElector(api, identity="standby")
+
+        # the first replica creates the lease, the other waits
+        self.assertTrue(leader.try_acquire_or_renew())
+        self.assertFalse(standby.try_acquire_or_renew())
+        self.assertTrue(leader.try_acquire_or_renew())
+        self.assertFalse(standby.try_acquire_or_renew())
+
+        # the standby takes over once the lease was not renewed for its duration
+        time.sleep(1.2)
+        self.assertTrue(standby.try_acquire_or_renew())
+        self.assertEqual(api.lease.spec.holder_identity, "standby")
+        self.assertEqual(api.lease.spec.lease_transitions, 1)
+        self.assertFalse(leader.try_acquire_or_renew())
@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
+import datetime
 import time
-from json import dumps
+from json import dumps, loads
 from unittest import TestCase
+from unittest.mock import patch
 
 from fastapi.testclient import TestClient
+from kubernetes.client import V1Container, V1EnvVar, V1ObjectMeta, V1Pod, V1PodSpec
 
 from projects.api.main import app
+from projects.controllers.logs import LogController
 from projects.controllers.utils import uuid_alpha
 from projects.database import engine
+from projects.exceptions import InternalServerError
 from projects.kfp import kfp_client
 
 TEST_CLIENT = TestClient(app)
@@ -168,3 +173,134 @@ class TestLogs(TestCase):
 
         rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/deployments/{DEPLOYMENT_ID}/runs/latest/logs")
         self.assertEqual(rv.status_code, 200)
+
+    def test_list_logs_follow(self):
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/latest/logs?follow=true")
+        self.assertEqual(rv.status_code, 200)
+        self.assertTrue(rv.headers["content-type"].startswith("text/event-stream"))
+
+        # the run is completed, so the stream ends after its logs are sent
+        events = [line for line in rv.text.split("\n\n") if line.startswith("data: ")]
+        self.assertGreater(len(events), 0)
+        result = loads(events[0][len("data: "):])
+        self.assertEqual(result["title"], NAME)
+        self.assertIn("createdAt", result)
+
+    def test_list_logs_since(self):
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/latest/logs")
+        result = rv.json()
+        self.assertIn("cursor", result)
+
+        # the run is completed, so there are no logs newer than the cursor
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/latest/logs",
+                             params={"since": result["cursor"]})
+        result = rv.json()
+        self.assertEqual(result["logs"], [])
+        self.assertEqual(result["total"], 0)
+        self.assertEqual(rv.status_code, 200)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/latest/logs?since=foo")
+        result = rv.json()
+        expected = {"message": "Invalid since cursor"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+    def test_list_logs_level(self):
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/latest/logs?level=ERROR")
+        result = rv.json()
+        self.assertEqual(result["logs"], [])
+        self.assertEqual(result["total"], 0)
+        self.assertEqual(rv.status_code, 200)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/latest/logs?level=info")
+        result = rv.json()
+        self.assertEqual(result["logs"][0]["level"], "INFO")
+        self.assertEqual(rv.status_code, 200)
+
+    def test_list_logs_search(self):
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/latest/logs",
+                             params={"title": NAME, "q": "HELLO", "limit": 1})
+        result = rv.json()
+        self.assertEqual(len(result["logs"]), 1)
+        self.assertEqual(result["logs"][0]["message"], "hello\nhello")
+        self.assertEqual(rv.status_code, 200)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/latest/logs",
+                             params={"q": "^bye", "regex": True})
+        result = rv.json()
+        self.assertEqual(result["logs"], [])
+        self.assertEqual(rv.status_code, 200)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/latest/logs",
+                             params={"q": "(", "regex": True})
+        result = rv.json()
+        expected = {"message": "Invalid regex"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/runs/latest/logs?limit=0")
+        result = rv.json()
+        expected = {"message": "Invalid limit argument"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+
+class TestPodsToLogs(TestCase):
+
+    def make_pod(self, name, task_names):
+        return V1Pod(
+            metadata=V1ObjectMeta(
+                name=name,
+                creation_timestamp=datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc),
+            ),
+            spec=V1PodSpec(containers=[
+                V1Container(name=task_name, env=[V1EnvVar(name="TASK_NAME", value=task_name)])
+                for task_name in task_names
+            ]),
+        )
+
+    @patch("projects.controllers.logs.logs.get_container_logs")
+    def test_pods_to_logs_error(self, mock_get_container_logs):
+        def get_container_logs(pod, container, since_seconds=None, timeout=None):
+            if container.name == "bar":
+                raise InternalServerError("Failed to retrieve logs")
+            return "2000-01-01T00:00:01Z INFO hello\n"
+
+        mock_get_container_logs.side_effect = get_container_logs
+
+        pods = [self.make_pod("pod-1", ["foo", "bar"]), self.make_pod("pod-2", ["baz"])]
+        logs = LogController().pods_to_logs(pods)
+
+        errors = [log for log in logs if log.level == "ERROR"]
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].title, "bar")
+        self.assertEqual(errors[0].message, "Failed to retrieve logs")
+
+        infos = [log for log in logs if log.level == "INFO"]
+        self.assertEqual(sorted(log.title for log in infos), ["baz", "foo"])
+        self.assertTrue(all(log.message == "hello" for log in infos))
+
+    @patch("projects.controllers.logs.logs.get_container_logs")
+    def test_pods_to_logs_order(self, mock_get_container_logs):
+        raw_logs = {
+            "foo": (
+                "2000-01-01T00:00:01Z INFO foo 1\n"
+                "2000-01-01T00:00:04Z INFO foo 4\n"
+            ),
+            "bar": (
+                "2000-01-01T00:00:02Z INFO bar 2\n"
+                "2000-01-01T00:00:03Z INFO bar 3\n"
+                "2000-01-01T00:00:05Z INFO bar 5\n"
+            ),
+        }
+
+        def get_container_logs(pod, container, since_seconds=None, timeout=None):
+            return raw_logs[container.name]
+
+        mock_get_container_logs.side_effect = get_container_logs
+
+        pods = [self.make_pod("pod-1", ["foo"]), self.make_pod("pod-2", ["bar"])]
+        logs = LogController().pods_to_logs(pods)
+
+        self.assertEqual([log.message for log in logs], ["bar 5", "foo 4", "bar 3", "bar 2", "foo 1"])
+        self.assertEqual([log.title for log in logs], ["bar", "foo", "bar", "bar", "foo"])
@@ -7,6 +7,7 @@ from fastapi.testclient import TestClient
 from projects.api.main import app
 from projects.controllers.utils import uuid_alpha
 from projects.database import engine
+from tests.utils import count_queries
 
 TEST_CLIENT = TestClient(app)
 
@@ -187,10 +188,36 @@ class TestOperators(TestCase):
         self.assertDictEqual(expected, result)
         self.assertEqual(rv.status_code, 404)
 
-        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/operators")
+        with count_queries() as statements:
+            rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/operators")
         result = rv.json()
         self.assertIsInstance(result["operators"], list)
         self.assertIsInstance(result["total"], int)
+        self.assertIn("serverTime", result)
+        self.assertEqual(rv.status_code, 200)
+        # the path is checked in one query, then operators and their tasks are listed
+        self.assertLessEqual(len(statements), 3)
+
+    def test_list_operators_updated_since(self):
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/operators",
+                             params={"updatedSince": "2020-01-01T00:00:00Z"})
+        result = rv.json()
+        self.assertEqual(result["operators"], [])
+        self.assertEqual(result["total"], 0)
+        self.assertEqual(rv.status_code, 200)
+
+        server_time = result["serverTime"]
+        rv = TEST_CLIENT.patch(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/operators/{OPERATOR_ID}", json={
+            "positionX": 100,
+        })
+        self.assertEqual(rv.status_code, 200)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/operators",
+                             params={"updatedSince": server_time})
+        result = rv.json()
+        self.assertEqual([operator["uuid"] for operator in result["operators"]], [OPERATOR_ID])
+        self.assertEqual(result["total"], 1)
+        self.assertGreaterEqual(result["serverTime"], server_time)
         self.assertEqual(rv.status_code, 200)
 
     def test_create_operator(self):
@@ -437,6 +464,13 @@ class TestOperators(TestCase):
         self.assertDictEqual(expected, result)
         self.assertEqual(rv.status_code, 404)
 
+        # an operator of another experiment
+        rv = TEST_CLIENT.patch(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/operators/{OPERATOR_ID_5}", json={})
+        result = rv.json()
+        expected = {"message": "The specified operator does not exist"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 404)
+
         rv = TEST_CLIENT.patch(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/operators/{OPERATOR_ID}", json={
             "dependencies": [OPERATOR_ID],
         })
@@ -7,6 +7,7 @@ from fastapi.testclient import TestClient
 from projects.api.main import app
 from projects.controllers.utils import uuid_alpha
 from projects.database import engine
+from tests.utils import count_queries
 
 TEST_CLIENT = TestClient(app)
 
@@ -96,6 +97,13 @@ class TestProjects(TestCase):
         self.assertIsInstance(result['projects'], list)
         self.assertEqual(rv.status_code, 200)
 
+        with count_queries() as statements:
+            rv = TEST_CLIENT.get("/projects?page_size=100")
+        self.assertEqual(rv.status_code, 200)
+        # the total, the projects, then one query per relationship: experiments,
+        # deployments, and the operators and tasks of each, whatever the number of rows
+        self.assertLessEqual(len(statements), 8)
+
         rv = TEST_CLIENT.get("/projects?order=uuid asc")
         result = rv.json()
         self.assertIsInstance(result["projects"], list)
@@ -138,6 +146,72 @@ class TestProjects(TestCase):
         self.assertDictEqual(expected, result)
         self.assertEqual(rv.status_code, 400)
 
+        rv = TEST_CLIENT.get("/projects?view=unk")
+        result = rv.json()
+        expected = {"message": "Invalid view argument. Must be one of: full, summary"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+    def test_list_projects_search(self):
+        rv = TEST_CLIENT.get("/projects", params={"q": "foo", "page_size": 100, "withTotal": "false"})
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        project_ids = [project["uuid"] for project in result["projects"]]
+        self.assertIn(PROJECT_ID, project_ids)
+        self.assertIn(PROJECT_ID_2, project_ids)
+
+        rv = TEST_CLIENT.get("/projects", params={"q": "foo unk", "page_size": 100, "withTotal": "false"})
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        project_ids = [project["uuid"] for project in result["projects"]]
+        self.assertNotIn(PROJECT_ID, project_ids)
+        self.assertNotIn(PROJECT_ID_2, project_ids)
+
+        rv = TEST_CLIENT.get("/projects", params={"order": "relevance desc"})
+        result = rv.json()
+        expected = {"message": "Invalid order argument"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+    def test_list_projects_cursor(self):
+        project_ids = []
+        cursor = None
+        while True:
+            params = {"name": NAME, "page_size": 1, "order": "uuid asc", "withTotal": "false"}
+            if cursor:
+                params["cursor"] = cursor
+            rv = TEST_CLIENT.get("/projects", params=params)
+            result = rv.json()
+            self.assertEqual(rv.status_code, 200)
+            self.assertIsNone(result["total"])
+            self.assertLessEqual(len(result["projects"]), 1)
+            project_ids.extend(project["uuid"] for project in result["projects"])
+            cursor = result["nextCursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(project_ids, sorted(set(project_ids)))
+        self.assertIn(PROJECT_ID, project_ids)
+        self.assertIn(PROJECT_ID_2, project_ids)
+
+        rv = TEST_CLIENT.get("/projects", params={"cursor": "unk"})
+        result = rv.json()
+        expected = {"message": "Invalid cursor argument"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+    def test_list_projects_summary(self):
+        with count_queries() as statements:
+            rv = TEST_CLIENT.get(f"/projects?view=summary&name={NAME}&page_size=100")
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        # the total and the projects, with their flags as subqueries
+        self.assertEqual(len(statements), 2)
+
+        project = next(p for p in result["projects"] if p["uuid"] == PROJECT_ID)
+        expected = {"uuid", "name", "description", "hasExperiment", "hasPreDeployment", "createdAt", "updatedAt"}
+        self.assertEqual(set(project), expected)
+
     def test_create_project(self):
         rv = TEST_CLIENT.post("/projects", json={})
         self.assertEqual(rv.status_code, 422)
@@ -241,6 +315,15 @@ class TestProjects(TestCase):
             del result_deployments[0][attr]
         self.assertDictEqual(expected, result_deployments[0])
 
+        etag = rv.headers["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID_2}", headers={"If-None-Match": etag})
+        self.assertEqual(rv.status_code, 304)
+        self.assertEqual(rv.headers["ETag"], etag)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID_2}", headers={"If-None-Match": 'W/"unk"'})
+        self.assertEqual(rv.status_code, 200)
+
     def test_update_project(self):
         rv = TEST_CLIENT.patch("/projects/foo", json={})
         result = rv.json()
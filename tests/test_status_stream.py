@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from json import dumps
+from unittest import TestCase
+
+from fastapi.testclient import TestClient
+
+from projects.api.main import app
+from projects.controllers.status_stream import BROKER, StatusChangeBroker, StatusStreamController
+from projects.controllers.utils import uuid_alpha
+from projects.database import Session, engine
+
+TEST_CLIENT = TestClient(app)
+
+PROJECT_ID = str(uuid_alpha())
+EXPERIMENT_ID = str(uuid_alpha())
+OPERATOR_ID = str(uuid_alpha())
+TASK_ID = str(uuid_alpha())
+NAME = "foo"
+CREATED_AT = "2000-01-01 00:00:00"
+UPDATED_AT = "2000-01-01 00:00:00"
+
+
+class TestStatusStream(TestCase):
+    def setUp(self):
+        self.maxDiff = None
+
+        conn = engine.connect()
+        text = (
+            f"INSERT INTO projects (uuid, name, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s)"
+        )
+        conn.execute(text, (PROJECT_ID, NAME, CREATED_AT, UPDATED_AT,))
+
+        text = (
+            f"INSERT INTO experiments (uuid, name, project_id, position, is_active, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (EXPERIMENT_ID, NAME, PROJECT_ID, 0, 1, CREATED_AT, UPDATED_AT,))
+
+        text = (
+            f"INSERT INTO tasks (uuid, name, description, image, commands, arguments, category, tags, data_in, data_out, docs, parameters, "
+            f"experiment_notebook_path, deployment_notebook_path, cpu_limit, cpu_request, memory_limit, memory_request, "
+            f"readiness_probe_initial_delay_seconds, is_default, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (TASK_ID, NAME, NAME, "busybox", None, dumps(["sleep", "1"]), "DEFAULT", dumps([]), "", "", "", dumps([]),
+                            "Experiment.ipynb", "Deployment.ipynb", "100m", "100m", "1Gi", "1Gi", 300, 0, CREATED_AT, UPDATED_AT,))
+
+        text = (
+            f"INSERT INTO operators (uuid, name, status, status_message, experiment_id, task_id, parameters, "
+            f"position_x, position_y, dependencies, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (OPERATOR_ID, None, "Running", None, EXPERIMENT_ID, TASK_ID, dumps({}), 0, 0,
+                            dumps([]), CREATED_AT, UPDATED_AT,))
+        conn.close()
+
+    def tearDown(self):
+        conn = engine.connect()
+
+        text = f"DELETE FROM status_changes WHERE experiment_id = '{EXPERIMENT_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM operators WHERE experiment_id = '{EXPERIMENT_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM tasks WHERE uuid = '{TASK_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM experiments WHERE uuid = '{EXPERIMENT_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM projects WHERE uuid = '{PROJECT_ID}'"
+        conn.execute(text)
+        conn.close()
+
+    def test_stream_events(self):
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/unk/events")
+        result = rv.json()
+        expected = {"message": "The specified experiment does not exist"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 404)
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/deployments/unk/events")
+        result = rv.json()
+        expected = {"message": "The specified deployment does not exist"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 404)
+
+    def test_stream_status_changes(self):
+        session = Session()
+        status_stream_controller = StatusStreamController(session)
+        events = status_stream_controller.stream_status_changes(experiment_id=EXPERIMENT_ID)
+        loop = asyncio.new_event_loop()
+
+        # the current statuses are sent first
+        result = loop.run_until_complete(events.__anext__())
+        expected = f'event: operator\ndata: {{"operatorId": "{OPERATOR_ID}", "status": "Running", "statusMessage": null}}\n\n'
+        self.assertEqual(result, expected)
+
+        # then the changes saved by the persistence agent
+        conn = engine.connect()
+        text = (
+            f"INSERT INTO status_changes (experiment_id, operator_id, status, status_message, created_at) "
+            f"VALUES (%s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (EXPERIMENT_ID, OPERATOR_ID, "Succeeded", None, CREATED_AT,))
+        conn.close()
+        BROKER.poll()
+
+        result = loop.run_until_complete(events.__anext__())
+        self.assertIn('event: operator\ndata: {"operatorId": ', result)
+        self.assertIn('"status": "Succeeded"', result)
+
+        loop.run_until_complete(events.aclose())
+        self.assertNotIn((EXPERIMENT_ID, None), BROKER.subscribers)
+        loop.close()
+        session.close()
+
+    def test_subscribe_overlap(self):
+        conn = engine.connect()
+        text = (
+            f"INSERT INTO status_changes (experiment_id, operator_id, status, status_message, created_at) "
+            f"VALUES (%s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (EXPERIMENT_ID, OPERATOR_ID, "Running", None, CREATED_AT,))
+
+        broker = StatusChangeBroker()
+        key = (EXPERIMENT_ID, None)
+        loop = asyncio.new_event_loop()
+        changes = loop.run_until_complete(self.subscribe(broker, key))
+
+        # changes committed before the subscription are not sent again
+        broker.poll()
+        loop.run_until_complete(asyncio.sleep(0))
+        self.assertTrue(changes.empty())
+
+        conn.execute(text, (EXPERIMENT_ID, OPERATOR_ID, "Succeeded", None, CREATED_AT,))
+        conn.close()
+        broker.poll()
+        loop.run_until_complete(asyncio.sleep(0))
+        self.assertEqual(changes.get_nowait().status, "Succeeded")
+        self.assertTrue(changes.empty())
+
+        broker.unsubscribe(key, self.subscriber)
+        loop.close()
+
+    async def subscribe(self, broker, key):
+        changes = asyncio.Queue()
+        self.subscriber = (asyncio.get_running_loop(), changes)
+        broker.subscribe(key, self.subscriber)
+        return changes
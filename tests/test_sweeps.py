@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+from json import dumps
+from unittest import TestCase
+
+from fastapi.testclient import TestClient
+from yaml import safe_load
+
+from projects import models
+from projects.api.main import app
+from projects.controllers.utils import uuid_alpha
+from projects.database import Session, engine
+from projects.kfp import kfp_client
+from projects.kfp.pipeline import compile_pipeline
+from projects.kfp.runs import get_parameters
+
+TEST_CLIENT = TestClient(app)
+
+OPERATOR_ID = str(uuid_alpha())
+NAME = "foo"
+DESCRIPTION = "long foo"
+PROJECT_ID = str(uuid_alpha())
+EXPERIMENT_ID = str(uuid_alpha())
+TASK_ID = str(uuid_alpha())
+PARAMETERS = {"coef": 0.1}
+PARAMETERS_JSON = dumps(PARAMETERS)
+IMAGE = "busybox"
+COMMANDS = None
+ARGUMENTS_JSON = dumps(["sleep", "1"])
+TAGS_JSON = dumps(["PREDICTOR"])
+EXPERIMENT_NOTEBOOK_PATH = "Experiment.ipynb"
+DEPLOYMENT_NOTEBOOK_PATH = "Deployment.ipynb"
+CREATED_AT = "2000-01-01 00:00:00"
+UPDATED_AT = "2000-01-01 00:00:00"
+
+
+class TestSweeps(TestCase):
+    def setUp(self):
+        self.maxDiff = None
+
+        conn = engine.connect()
+        text = (
+            f"INSERT INTO projects (uuid, name, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s)"
+        )
+        conn.execute(text, (PROJECT_ID, NAME, CREATED_AT, UPDATED_AT,))
+
+        text = (
+            f"INSERT INTO experiments (uuid, name, project_id, position, is_active, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (EXPERIMENT_ID, NAME, PROJECT_ID, 0, 1, CREATED_AT, UPDATED_AT,))
+
+        text = (
+            f"INSERT INTO tasks (uuid, name, description, image, commands, arguments, category, tags, data_in, data_out, docs, parameters, "
+            f"experiment_notebook_path, deployment_notebook_path, cpu_limit, cpu_request, memory_limit, memory_request, "
+            f"readiness_probe_initial_delay_seconds, is_default, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (TASK_ID, NAME, DESCRIPTION, IMAGE, COMMANDS, ARGUMENTS_JSON, "DEFAULT", TAGS_JSON, "", "", "", dumps([]),
+                            EXPERIMENT_NOTEBOOK_PATH, DEPLOYMENT_NOTEBOOK_PATH, "100m", "100m", "1Gi", "1Gi", 300, 0, CREATED_AT, UPDATED_AT,))
+
+        text = (
+            f"INSERT INTO operators (uuid, name, status, status_message, experiment_id, task_id, parameters, "
+            f"position_x, position_y, dependencies, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (OPERATOR_ID, None, "Unset", None, EXPERIMENT_ID, TASK_ID, PARAMETERS_JSON, 0.3,
+                            0.5, dumps([]), CREATED_AT, UPDATED_AT,))
+        conn.close()
+
+    def tearDown(self):
+        try:
+            kfp_experiment = kfp_client().get_experiment(experiment_name=EXPERIMENT_ID)
+            kfp_client().experiments.delete_experiment(id=kfp_experiment.id)
+        except ValueError:
+            pass
+
+        conn = engine.connect()
+
+        text = f"DELETE FROM sweeps WHERE experiment_id = '{EXPERIMENT_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM operators WHERE experiment_id = '{EXPERIMENT_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM tasks WHERE uuid = '{TASK_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM experiments WHERE project_id = '{PROJECT_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM projects WHERE uuid = '{PROJECT_ID}'"
+        conn.execute(text)
+        conn.close()
+
+    def test_create_sweep(self):
+        rv = TEST_CLIENT.post(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/sweeps", json={})
+        result = rv.json()
+        expected = {"message": "Exactly one of parameters and parameterSets must be set"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+        rv = TEST_CLIENT.post(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/sweeps", json={
+            "parameters": {"unk": {"coef": [0.1, 0.2]}},
+        })
+        result = rv.json()
+        expected = {"message": "The specified operator does not exist"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+        rv = TEST_CLIENT.post(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/sweeps", json={
+            "parameters": {OPERATOR_ID: {"coef": []}},
+        })
+        result = rv.json()
+        expected = {"message": "The parameter coef must have at least one value"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+        rv = TEST_CLIENT.post(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/sweeps", json={
+            "parameters": {OPERATOR_ID: {"dataset": ["iris.csv"]}},
+        })
+        result = rv.json()
+        expected = {"message": "The dataset parameter can not be swept"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+        rv = TEST_CLIENT.post(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/sweeps", json={
+            "parameterSets": [{OPERATOR_ID: {"coef": 0.1}}, {OPERATOR_ID: {"alpha": 0.1}}],
+        })
+        result = rv.json()
+        expected = {"message": "All parameter sets must set the same parameters"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+        rv = TEST_CLIENT.post(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/sweeps", json={
+            "parameters": {OPERATOR_ID: {"coef": [0.1, 0.2]}},
+        })
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(result["experimentId"], EXPERIMENT_ID)
+        self.assertEqual(len(result["runs"]), 2)
+        self.assertListEqual(
+            [run["parameters"] for run in result["runs"]],
+            [{OPERATOR_ID: {"coef": 0.1}}, {OPERATOR_ID: {"coef": 0.2}}],
+        )
+
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/sweeps/{result['uuid']}")
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        self.assertIn(result["status"], {"Running", "Succeeded", "Failed"})
+
+    def test_get_sweep(self):
+        rv = TEST_CLIENT.get(f"/projects/{PROJECT_ID}/experiments/{EXPERIMENT_ID}/sweeps/unk")
+        result = rv.json()
+        expected = {"message": "The specified sweep does not exist"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 404)
+
+    def test_compile_pipeline_sweep_parameters(self):
+        session = Session()
+        operators = session.query(models.Operator) \
+            .filter_by(experiment_id=EXPERIMENT_ID) \
+            .all()
+
+        result = compile_pipeline(name=f"experiment-{EXPERIMENT_ID}",
+                                  operators=operators,
+                                  project_id=PROJECT_ID,
+                                  experiment_id=EXPERIMENT_ID,
+                                  deployment_id=None,
+                                  deployment_name=None,
+                                  sweep_parameters={OPERATOR_ID: ["coef"]})
+        workflow = safe_load(result)
+
+        # swept parameters are pipeline params, set when each run is submitted
+        self.assertListEqual(workflow["spec"]["arguments"]["parameters"], [{"name": "parameter_0"}])
+        template = next(t for t in workflow["spec"]["templates"] if t["name"] == OPERATOR_ID)
+        parameters = get_parameters(template, {"parameter_0": "0.2"})
+        self.assertEqual(parameters["coef"], 0.2)
+        session.close()
@@ -126,6 +126,21 @@ class TestTasks(TestCase):
 
         conn.close()
 
+    def test_list_tasks_search(self):
+        rv = TEST_CLIENT.get("/tasks", params={"q": "predictor", "withTotal": "false"})
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        task_ids = [task["uuid"] for task in result["tasks"]]
+        self.assertIn(TASK_ID, task_ids)
+        self.assertIn(TASK_ID_2, task_ids)
+
+        rv = TEST_CLIENT.get("/tasks", params={"q": "name foo", "withTotal": "false"})
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        task_ids = [task["uuid"] for task in result["tasks"]]
+        self.assertIn(TASK_ID, task_ids)
+        self.assertNotIn(TASK_ID_2, task_ids)
+
     def test_list_tasks(self):
         rv = TEST_CLIENT.get("/tasks")
         result = rv.json()
@@ -133,6 +148,27 @@ class TestTasks(TestCase):
         self.assertIsInstance(result["total"], int)
         self.assertEqual(rv.status_code, 200)
 
+        rv = TEST_CLIENT.get("/tasks?view=summary")
+        result = rv.json()
+        self.assertIsInstance(result["total"], int)
+        self.assertEqual(rv.status_code, 200)
+        for task in result["tasks"]:
+            self.assertNotIn("parameters", task)
+            self.assertNotIn("docs", task)
+            self.assertIn("hasNotebook", task)
+
+        rv = TEST_CLIENT.get("/tasks?page_size=1&withTotal=false")
+        result = rv.json()
+        self.assertIsNone(result["total"])
+        self.assertEqual(len(result["tasks"]), 1)
+        self.assertIsNotNone(result["nextCursor"])
+        self.assertEqual(rv.status_code, 200)
+
+        rv = TEST_CLIENT.get("/tasks", params={"page_size": 1, "cursor": result["nextCursor"]})
+        result_2 = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        self.assertNotEqual(result_2["tasks"][0]["uuid"], result["tasks"][0]["uuid"])
+
         rv = TEST_CLIENT.get("/tasks?order=uuid asc")
         result = rv.json()
         self.assertIsInstance(result["tasks"], list)
@@ -513,6 +549,10 @@ class TestTasks(TestCase):
         }
         self.assertDictEqual(expected, result)
         self.assertEqual(rv.status_code, 200)
+        self.assertIn("max-age", rv.headers["Cache-Control"])
+
+        rv = TEST_CLIENT.get(f"/tasks/{TASK_ID}", headers={"If-None-Match": rv.headers["ETag"]})
+        self.assertEqual(rv.status_code, 304)
 
     def test_update_task(self):
         # task none
@@ -275,6 +275,9 @@ class TestTemplates(TestCase):
         }
         self.assertDictEqual(expected, result)
 
+        rv = TEST_CLIENT.get(f"/templates/{TEMPLATE_ID}", headers={"If-None-Match": rv.headers["ETag"]})
+        self.assertEqual(rv.status_code, 304)
+
     def test_update_template(self):
         rv = TEST_CLIENT.patch("/templates/foo", json={})
         result = rv.json()
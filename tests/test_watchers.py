@@ -1,20 +1,93 @@
 # -*- coding: utf-8 -*-
-from json import load
+import threading
+from copy import deepcopy
+from datetime import datetime
+from json import dumps, load
 from unittest import TestCase
+from unittest.mock import patch
 
+from projects.agent.utils import load_resource_version, save_resource_version
 from projects.agent.watchers.deployment import update_seldon_deployment
-from projects.agent.watchers.workflow import update_status
-from projects.database import Session
+from projects.agent.watchers.workflow import archive_logs, flush_events, \
+    release_deleted_runs, update_status, update_statuses
+from projects.controllers.logs.archive import load_run_index
+from projects.controllers.utils import uuid_alpha
+from projects.database import Session, engine
+from projects.object_storage import remove_objects
 
 session = Session()
 
+PROJECT_ID = str(uuid_alpha())
+EXPERIMENT_ID = "e59d2a86-7933-4e3f-9aed-42f65cb1a92e"
+TASK_ID = "a8bfced7-cb32-4c0d-8382-ea1cd252d8af"
+OPERATOR_ID = "f2b0326f-1502-451a-a007-d66fb3508af8"
+OPERATOR_ID_2 = "af0f520c-7fac-48fe-9555-1bd05345334b"
+RESOURCE = "test-workflows"
+NAME = "foo"
+CREATED_AT = "2000-01-01 00:00:00"
+UPDATED_AT = "2000-01-01 00:00:00"
+
 
 class TestWatchers(TestCase):
     def setUp(self):
         self.maxDiff = None
 
+        conn = engine.connect()
+        text = (
+            f"INSERT INTO projects (uuid, name, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s)"
+        )
+        conn.execute(text, (PROJECT_ID, NAME, CREATED_AT, UPDATED_AT,))
+
+        text = (
+            f"INSERT INTO experiments (uuid, name, project_id, position, is_active, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (EXPERIMENT_ID, NAME, PROJECT_ID, 0, 1, CREATED_AT, UPDATED_AT,))
+
+        text = (
+            f"INSERT INTO tasks (uuid, name, description, image, commands, arguments, category, tags, data_in, data_out, docs, parameters, "
+            f"experiment_notebook_path, deployment_notebook_path, cpu_limit, cpu_request, memory_limit, memory_request, "
+            f"readiness_probe_initial_delay_seconds, is_default, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (TASK_ID, NAME, NAME, "busybox", None, dumps(["sleep", "1"]), "DEFAULT", dumps([]), "", "", "", dumps([]),
+                            "Experiment.ipynb", "Deployment.ipynb", "100m", "100m", "1Gi", "1Gi", 300, 0, CREATED_AT, UPDATED_AT,))
+
+        text = (
+            f"INSERT INTO operators (uuid, name, status, status_message, experiment_id, task_id, parameters, "
+            f"position_x, position_y, dependencies, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, (OPERATOR_ID, None, "Queued", None, EXPERIMENT_ID, TASK_ID, dumps({}), 0, 0,
+                            dumps([]), CREATED_AT, UPDATED_AT,))
+        conn.execute(text, (OPERATOR_ID_2, None, "Queued", "foo", EXPERIMENT_ID, TASK_ID, dumps({}), 0, 0,
+                            dumps([OPERATOR_ID]), CREATED_AT, UPDATED_AT,))
+        conn.close()
+
     def tearDown(self):
-        pass
+        remove_objects(prefix="logs/4b62b23c-1188-4277-9595-fc82f74043bf")
+
+        conn = engine.connect()
+
+        text = f"DELETE FROM watch_states WHERE resource = '{RESOURCE}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM queued_runs WHERE project_id = '{PROJECT_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM operators WHERE experiment_id = '{EXPERIMENT_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM tasks WHERE uuid = '{TASK_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM experiments WHERE uuid = '{EXPERIMENT_ID}'"
+        conn.execute(text)
+
+        text = f"DELETE FROM projects WHERE uuid = '{PROJECT_ID}'"
+        conn.execute(text)
+        conn.close()
 
     def test_workflow_watcher_update(self):
 
@@ -32,6 +105,109 @@ class TestWatchers(TestCase):
         with self.assertRaises(KeyError):
             update_status(manifest_as_dict, session)
 
+    def test_workflow_watcher_update_statuses(self):
+
+        manifest_file_ref = open('tests/resources/mock_manifest.json')
+        manifest_as_dict = load(manifest_file_ref)
+        running_manifest = deepcopy(manifest_as_dict)
+        running_manifest["object"]["status"]["phase"] = "Running"
+        running_manifest["object"]["status"]["nodes"] = {}
+
+        # coalesced events are applied in order, so the latest status is kept
+        update_statuses([running_manifest, manifest_as_dict], session)
+
+        conn = engine.connect()
+        text = f"SELECT uuid, status, status_message FROM operators WHERE experiment_id = '{EXPERIMENT_ID}' ORDER BY uuid"
+        result = [tuple(row) for row in conn.execute(text)]
+        conn.close()
+        expected = [
+            (OPERATOR_ID_2, "Omitted", "omitted: depends condition not met"),
+            (OPERATOR_ID, "Failed", "failed with exit code 1"),
+        ]
+        self.assertListEqual(result, expected)
+
+        # unlisted operators keep their status message
+        update_statuses([running_manifest], session)
+
+        conn = engine.connect()
+        result = [tuple(row) for row in conn.execute(text)]
+        conn.close()
+        expected = [
+            (OPERATOR_ID_2, "Pending", "omitted: depends condition not met"),
+            (OPERATOR_ID, "Pending", "failed with exit code 1"),
+        ]
+        self.assertListEqual(result, expected)
+
+    def test_workflow_watcher_release_deleted_runs(self):
+        conn = engine.connect()
+        text = (
+            f"INSERT INTO queued_runs (uuid, project_id, experiment_id, status, priority, run_id, created_at, updated_at) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        conn.execute(text, ("deleted", PROJECT_ID, EXPERIMENT_ID, "Running", 0, "run-deleted", CREATED_AT, UPDATED_AT,))
+        conn.execute(text, ("running", PROJECT_ID, EXPERIMENT_ID, "Running", 0, "run-running", CREATED_AT, UPDATED_AT,))
+        conn.close()
+
+        # only runs whose workflows are not listed are released
+        release_deleted_runs({"run-running"}, datetime.utcnow(), session)
+
+        conn = engine.connect()
+        text = f"SELECT uuid, status FROM queued_runs WHERE project_id = '{PROJECT_ID}' ORDER BY uuid"
+        result = [tuple(row) for row in conn.execute(text)]
+        conn.close()
+        self.assertListEqual(result, [("deleted", "Finished"), ("running", "Running")])
+
+    def test_resource_version(self):
+        self.assertIsNone(load_resource_version(RESOURCE, session))
+
+        save_resource_version(RESOURCE, "1", session)
+        save_resource_version(RESOURCE, "2", session)
+        self.assertEqual(load_resource_version(RESOURCE, session), "2")
+
+    @patch("projects.agent.watchers.workflow.PLURAL", RESOURCE)
+    @patch("projects.agent.watchers.workflow.ARCHIVER")
+    @patch("projects.agent.watchers.workflow.dispatch_queued_runs")
+    @patch("projects.agent.watchers.workflow.update_statuses", side_effect=Exception("database is down"))
+    def test_workflow_watcher_flush_events_failed(self, mock_update_statuses, mock_dispatch_queued_runs, mock_archiver):
+        manifest_file_ref = open('tests/resources/mock_manifest.json')
+        manifest_as_dict = load(manifest_file_ref)
+        workflow_name = manifest_as_dict["object"]["metadata"]["name"]
+
+        pending = {"events": {workflow_name: manifest_as_dict}, "resource_version": "1"}
+        stop = threading.Event()
+        stop.set()
+        flush_events(pending, threading.Lock(), stop, session)
+
+        # the events are queued again, and the watch position does not move past them
+        mock_update_statuses.assert_called_once()
+        self.assertDictEqual(pending["events"], {workflow_name: manifest_as_dict})
+        self.assertIsNone(load_resource_version(RESOURCE, session))
+
+        # runs are not released, nor their logs archived, while their status is not saved
+        mock_dispatch_queued_runs.assert_not_called()
+        mock_archiver.submit.assert_not_called()
+
+    def test_workflow_watcher_archive_logs(self):
+
+        manifest_file_ref = open('tests/resources/mock_manifest.json')
+        manifest_as_dict = load(manifest_file_ref)
+        run_id = manifest_as_dict["object"]["metadata"]["labels"]["pipeline/runid"]
+
+        # the workflow failed, so the run index is saved
+        archived_runs = {}
+        archive_logs(manifest_as_dict, archived_runs)
+        self.assertTrue(archived_runs[manifest_as_dict["object"]["metadata"]["name"]]["finished"])
+
+        result = load_run_index(run_id)
+        self.assertEqual(result["runId"], run_id)
+        # the pod of the operator does not exist, so it is recorded as missing
+        self.assertListEqual(result["missingPods"], ["experiment-e59d2a86-7933-4e3f-9aed-42f65cb1a92e-gmf8f-2879113482"])
+
+        # deleted workflows are forgotten
+        manifest_as_dict["type"] = "DELETED"
+        archive_logs(manifest_as_dict, archived_runs)
+        self.assertDictEqual(archived_runs, {})
+
     def test_deployment_watcher_update(self):
 
         manifest_file_ref = open('tests/resources/deployment_mock_manifest.json')
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Shared test functions."""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from projects.database import engine
+
+
+@contextmanager
+def count_queries():
+    """
+    Records the SQL statements executed in a with block.
+
+    Yields
+    ------
+    list
+        The statements, in order of execution.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)